@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import fs from 'fs';
 import path from 'path';
+import { loadDetailRecords } from '@/lib/detailJson';
 
 // 간단한 CSV 파서
 function parseCSV(content: string): any[] {
@@ -45,13 +46,7 @@ function loadCommissionJson(): { [year: string]: { month: string; account: strin
     path.join(process.cwd(), '..', 'myvenv', 'out', 'commission_details.json'),
   ];
   
-  for (const p of basePaths) {
-    if (fs.existsSync(p)) {
-      const content = fs.readFileSync(p, 'utf-8');
-      return JSON.parse(content);
-    }
-  }
-  return null;
+  return loadDetailRecords(basePaths);
 }
 
 export async function GET(request: Request) {
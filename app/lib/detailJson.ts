@@ -0,0 +1,85 @@
+import fs from 'fs';
+
+// myvenv/columnar_json.py 가 저장하는 컬럼형 상세 JSON (format: columnar-v1)
+export type ColumnarDetails = {
+  format: string;
+  string_fields: string[];
+  strings: string[];
+  years: { [year: string]: { rows: number; fields: string[] } & { [field: string]: number[] | number | string[] } };
+};
+
+type DetailData<T> = { [year: string]: T[] };
+
+const COLUMNAR_FORMAT = 'columnar-v1';
+
+// 파일 경로별 마지막 로드 결과 (파일 수정 시각이 같으면 다시 파싱하지 않음)
+const loadCache = new Map<string, { mtimeMs: number; data: unknown }>();
+
+/**
+ * out/it_usage_details.json → out/it_usage_details.columnar.json
+ */
+export function columnarPath(jsonPath: string): string {
+  return jsonPath.replace(/\.json$/, '.columnar.json');
+}
+
+/**
+ * 컬럼형 상세 JSON → 연도별 레코드 배열 (원본 상세 JSON과 같은 구조)
+ */
+export function decodeColumnar<T>(doc: ColumnarDetails): DetailData<T> {
+  const stringFields = new Set(doc.string_fields);
+  const data: DetailData<T> = {};
+
+  for (const [year, columns] of Object.entries(doc.years)) {
+    const rows = columns.rows;
+    const records: T[] = new Array(rows);
+    for (let i = 0; i < rows; i++) {
+      const record: { [field: string]: string | number } = {};
+      for (const field of columns.fields) {
+        const value = (columns[field] as number[])[i];
+        if (field === 'month') {
+          record[field] = String(value).padStart(2, '0');
+        } else if (stringFields.has(field)) {
+          record[field] = doc.strings[value];
+        } else {
+          record[field] = value;
+        }
+      }
+      records[i] = record as T;
+    }
+    data[year] = records;
+  }
+  return data;
+}
+
+function readCached<R>(filePath: string, parse: (content: string) => R): R {
+  const mtimeMs = fs.statSync(filePath).mtimeMs;
+  const cached = loadCache.get(filePath);
+  if (cached && cached.mtimeMs === mtimeMs) {
+    return cached.data as R;
+  }
+  const data = parse(fs.readFileSync(filePath, 'utf-8'));
+  loadCache.set(filePath, { mtimeMs, data });
+  return data;
+}
+
+/**
+ * 상세 JSON 로드 (경로 후보 중 처음 존재하는 파일)
+ * - 같은 위치에 더 최신(또는 같은 시각)의 컬럼형 파일이 있으면 그 파일을 읽어 레코드로 복원
+ * - 파일이 바뀌지 않았으면 이전 요청에서 파싱한 결과를 재사용 (반환 값은 수정하지 말 것)
+ */
+export function loadDetailRecords<T>(basePaths: string[]): DetailData<T> | null {
+  for (const p of basePaths) {
+    if (!fs.existsSync(p)) continue;
+
+    const columnar = columnarPath(p);
+    if (fs.existsSync(columnar) && fs.statSync(columnar).mtimeMs >= fs.statSync(p).mtimeMs) {
+      const data = readCached(columnar, content => {
+        const doc = JSON.parse(content) as ColumnarDetails;
+        return doc.format === COLUMNAR_FORMAT ? decodeColumnar<T>(doc) : null;
+      });
+      if (data) return data;
+    }
+    return readCached(p, content => JSON.parse(content) as DetailData<T>);
+  }
+  return null;
+}
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+계정 변동 분석 공통 모듈
+목적: create_account_analysis.py / create_account_analysis_with_ai.py 는 유의미한 변동 계정마다
+      전체 상세 데이터를 계정명으로 다시 필터링하고 적요별 groupby 를 따로 실행함 (계정 수 × 행 수).
+      대상 계정의 적요별 당년 / 전년 / 차이 표를 (계정, 적요) 두 키 groupby 한 번으로 만들고,
+      계정별 상위 N개 적요는 기준값 이상인 소수 행만 계정별로 정렬해 선택.
+
+다기간 비교 (compare_periods):
+  분석 스크립트는 월 쌍 하나(202510 vs 202410 등)만 비교하고 실행할 때마다 상세 데이터를 다시 읽음.
+  상세 저장소(out/detail_store)에서 필요한 월을 한 번씩만 읽고, (계정, 적요) × 월 합계 행렬 1개에
+  월 → 기간 가중치 행렬을 곱해 모든 기간 합계를 한 번에 구한 뒤 MoM / YoY / YTD / 임의 월 묶음 비교표를 만듦.
+
+  기간 표기: 202601 (한 달), 202501-202503 (범위), 202501+202503 (월 묶음)
+  비교 표기: mom / yoy / ytd (--month 기준) 또는 당기:전기 (예: 202601-202603:202501-202503)
+  저장소에 없는 월이 포함된 비교는 건너뜀 (python create_detail.py --months 202501-202601 로 먼저 생성)
+
+사용 예시:
+  from account_variance import description_changes, top_changes
+
+  changes = description_changes(current_df, previous_df, accounts=significant['GL계정'])
+  top = top_changes(changes, '차이_백만원', threshold=0.5, top=5)
+  top.get('복리후생비_식대', [])   # [(적요, 행), ...] 변동 큰 순
+
+  from account_variance import standard_pairs, compare_periods
+  gl_table, desc_table = compare_periods(standard_pairs('202601'))
+
+  python account_variance.py --month 202601
+  python account_variance.py --month 202601 --compare yoy ytd --pair 202601-202603:202501-202503
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from detail_store import DEFAULT_STORE_DIR, has_month, read_month
+from periods import parse_period, period_label, shift_month
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_DESC_COL = 'G/L 계정 설명'
+DEFAULT_TEXT_COL = '텍스트'
+DEFAULT_AMOUNT_COL = '금액_정제'
+
+
+def description_changes(current_df, previous_df, accounts=None, desc_col=DEFAULT_DESC_COL,
+                        text_col=DEFAULT_TEXT_COL, amount_col=DEFAULT_AMOUNT_COL):
+    """
+    계정 × 적요별 당년 / 전년 금액과 차이
+
+    Parameters:
+    -----------
+    current_df, previous_df : pd.DataFrame
+        상세 데이터 (계정명 / 적요 / 금액 컬럼)
+    accounts : iterable, optional
+        대상 계정명 (기본값: 전체). 대상 계정 행만 골라 groupby
+    desc_col, text_col, amount_col : str
+        계정명 / 적요 / 금액 컬럼
+
+    Returns:
+    --------
+    pd.DataFrame : 인덱스 (계정명, 적요) - 계정 안에서는 적요 순 정렬,
+                   컬럼 당년, 전년, 차이, 차이_백만원, 당년_백만원, 전년_백만원 (한쪽에만 있는 적요는 0)
+                   적요가 결측인 행은 계정별 groupby 와 같이 제외
+    """
+    def by_description(df):
+        if accounts is not None:
+            df = df[df[desc_col].isin(list(accounts))]
+        return df.groupby([desc_col, text_col])[amount_col].sum()
+
+    table = pd.concat({'당년': by_description(current_df), '전년': by_description(previous_df)},
+                      axis=1).fillna(0).sort_index()
+    table['차이'] = table['당년'] - table['전년']
+    table['차이_백만원'] = table['차이'] / 1_000_000
+    table['당년_백만원'] = table['당년'] / 1_000_000
+    table['전년_백만원'] = table['전년'] / 1_000_000
+    return table
+
+
+def top_changes(changes, column='차이_백만원', threshold=0.5, top=5):
+    """
+    계정별 변동 큰 적요 상위 N개
+
+    Parameters:
+    -----------
+    changes : pd.DataFrame
+        description_changes 결과 (필요하면 column 을 반올림 등으로 바꾼 뒤 전달)
+    column : str
+        변동 크기 기준 컬럼
+    threshold : float
+        |column| 이 이 값 이상인 적요만
+    top : int
+        계정별 적요 수
+
+    Returns:
+    --------
+    dict : {계정명: [(적요, 행 Series), ...]} - |column| 큰 순
+    """
+    selected = changes[changes[column].abs() >= threshold]
+
+    # 정렬은 계정별로 (기존 계정별 sort_values 와 같은 방식이라 동률 순서도 동일), 대상은 이미 걸러진 소수 행
+    result = {}
+    for account, group in selected.groupby(level=0, sort=False):
+        ranked = group.droplevel(0).sort_values(column, key=abs, ascending=False).head(top)
+        result[account] = list(ranked.iterrows())
+    return result
+
+
+# ----------------------------------------------------------------------------
+# 다기간 비교
+# ----------------------------------------------------------------------------
+
+STANDARD_COMPARISONS = ('mom', 'yoy', 'ytd')
+DEFAULT_OUTPUT_DIR = './out/variance'
+GL_VARIANCE_COLUMNS = ['비교', '당기', '전기', 'GL계정', '당년금액', '전년금액', '차이', 'YOY',
+                       '당년금액_백만원', '전년금액_백만원', '차이_백만원']
+DESC_VARIANCE_COLUMNS = ['비교', '당기', '전기', 'GL계정', '적요', '당년', '전년', '차이',
+                         '차이_백만원', '당년_백만원', '전년_백만원']
+
+
+def standard_pairs(month, comparisons=STANDARD_COMPARISONS):
+    """
+    기준 월의 표준 비교 쌍
+
+    Parameters:
+    -----------
+    month : str
+        기준 월 (YYYYMM)
+    comparisons : iterable
+        'mom' (전월), 'yoy' (전년 동월), 'ytd' (당해 1월~기준 월 vs 전년 같은 기간)
+
+    Returns:
+    --------
+    list : [(비교명, 당기 월 목록, 전기 월 목록), ...]
+    """
+    pairs = []
+    for kind in comparisons:
+        if kind == 'mom':
+            pairs.append(('MoM', [month], [shift_month(month, -1)]))
+        elif kind == 'yoy':
+            pairs.append(('YoY', [month], [shift_month(month, -12)]))
+        elif kind == 'ytd':
+            current = parse_period(f"{month[:4]}01-{month}")
+            pairs.append(('YTD', current, [shift_month(m, -12) for m in current]))
+        else:
+            raise ValueError(f"알 수 없는 비교: {kind} (mom / yoy / ytd)")
+    return pairs
+
+
+def parse_pair(spec):
+    """'당기:전기' 표기 → (비교명, 당기 월 목록, 전기 월 목록)"""
+    if ':' not in spec:
+        raise ValueError(f"비교 표기는 당기:전기 형식이어야 합니다: {spec}")
+    current, previous = spec.split(':', 1)
+    return spec, parse_period(current), parse_period(previous)
+
+
+def load_details(months, columns=None, store_dir=DEFAULT_STORE_DIR):
+    """
+    상세 저장소에서 월별 상세 데이터 로드 (월마다 한 번, 필요한 컬럼만)
+
+    Returns:
+    --------
+    dict : {YYYYMM: DataFrame} - 저장소에 없는 월은 제외
+    """
+    columns = columns or [DEFAULT_DESC_COL, DEFAULT_TEXT_COL, DEFAULT_AMOUNT_COL]
+    return {month: read_month(month, columns=columns, store_dir=store_dir)
+            for month in sorted(set(months)) if has_month(month, store_dir)}
+
+
+def _month_matrix(details, keys, amount_col):
+    """월별 상세 → (키 × 월 합계 행렬, 키 × 월 행 수 행렬) - groupby 한 번"""
+    frames = [df[keys + [amount_col]].assign(_month=month) for month, df in details.items()]
+    grouped = pd.concat(frames, ignore_index=True).groupby(keys + ['_month'])[amount_col].agg(['sum', 'size'])
+    sums = grouped['sum'].unstack('_month', fill_value=0).reindex(columns=list(details), fill_value=0)
+    counts = grouped['size'].unstack('_month', fill_value=0).reindex(columns=list(details), fill_value=0)
+    return sums, counts
+
+
+def _compare(sums, counts, pairs, months):
+    """키 × 월 행렬 → 비교 쌍별 (당기, 전기) 합계 (long 형식, 두 기간 모두 거래가 없는 키는 제외)"""
+    periods = list(dict.fromkeys(tuple(m) for _, current, previous in pairs for m in (current, previous)))
+    column = {month: i for i, month in enumerate(months)}
+    weights = np.zeros((len(months), len(periods)))
+    for j, period in enumerate(periods):
+        weights[[column[m] for m in period], j] = 1
+    # 모든 기간 합계 / 행 수를 행렬곱 한 번으로
+    totals = sums.to_numpy(dtype=float) @ weights
+    present = counts.to_numpy(dtype=float) @ weights > 0
+
+    position = {period: j for j, period in enumerate(periods)}
+    current_pos = [position[tuple(current)] for _, current, _ in pairs]
+    previous_pos = [position[tuple(previous)] for _, _, previous in pairs]
+    keep = (present[:, current_pos] | present[:, previous_pos]).T.ravel()
+
+    n_keys = len(sums)
+    table = pd.DataFrame({
+        '비교': np.repeat([name for name, _, _ in pairs], n_keys),
+        '당기': np.repeat([period_label(current) for _, current, _ in pairs], n_keys),
+        '전기': np.repeat([period_label(previous) for _, _, previous in pairs], n_keys),
+    })
+    keys = sums.index.to_frame(index=False)
+    table = pd.concat([table, pd.concat([keys] * len(pairs), ignore_index=True)], axis=1)
+    table['당년'] = totals[:, current_pos].T.ravel()
+    table['전년'] = totals[:, previous_pos].T.ravel()
+    return table[keep].reset_index(drop=True)
+
+
+def compare_periods(pairs, details=None, desc_col=DEFAULT_DESC_COL, text_col=DEFAULT_TEXT_COL,
+                    amount_col=DEFAULT_AMOUNT_COL, store_dir=DEFAULT_STORE_DIR):
+    """
+    여러 비교 쌍의 GL 계정별 / 적요별 차이를 한 번에 계산
+
+    Parameters:
+    -----------
+    pairs : list
+        [(비교명, 당기 월 목록, 전기 월 목록), ...] (standard_pairs / parse_pair)
+    details : dict, optional
+        {YYYYMM: 상세 DataFrame} (없으면 상세 저장소에서 필요한 월만 로드)
+    desc_col, text_col, amount_col : str
+        계정명 / 적요 / 금액 컬럼
+
+    Returns:
+    --------
+    tuple : (GL 계정별 표, 적요별 표) - 비교 쌍이 '비교' 컬럼으로 구분된 long 형식
+        GL 계정별: GL_VARIANCE_COLUMNS (create_account_analysis 의 계정별 집계와 같은 값, 백만원은 반올림)
+        적요별: DESC_VARIANCE_COLUMNS (description_changes 와 같은 값, 적요가 결측인 행은 제외)
+        상세 데이터가 없는 월이 포함된 비교 쌍은 제외
+    """
+    needed = sorted({m for _, current, previous in pairs for m in current + previous})
+    if details is None:
+        details = load_details(needed, columns=[desc_col, text_col, amount_col], store_dir=store_dir)
+    details = {m: details[m] for m in needed if details.get(m) is not None}
+
+    runnable = []
+    for name, current, previous in pairs:
+        missing = [m for m in current + previous if m not in details]
+        if missing:
+            print(f"   ⚠ {name}: 상세 데이터 없는 월 {', '.join(missing)} - 건너뜀")
+        else:
+            runnable.append((name, current, previous))
+
+    if not runnable:
+        return pd.DataFrame(columns=GL_VARIANCE_COLUMNS), pd.DataFrame(columns=DESC_VARIANCE_COLUMNS)
+
+    months = list(details)
+    gl_sums, gl_counts = _month_matrix(details, [desc_col], amount_col)
+    desc_sums, desc_counts = _month_matrix(details, [desc_col, text_col], amount_col)
+
+    gl_table = _compare(gl_sums, gl_counts, runnable, months).rename(
+        columns={desc_col: 'GL계정', '당년': '당년금액', '전년': '전년금액'})
+    gl_table['차이'] = gl_table['당년금액'] - gl_table['전년금액']
+    gl_table['YOY'] = (gl_table['당년금액'] / gl_table['전년금액'].replace(0, np.nan) * 100).fillna(0)
+    gl_table['당년금액_백만원'] = (gl_table['당년금액'] / 1_000_000).round(0)
+    gl_table['전년금액_백만원'] = (gl_table['전년금액'] / 1_000_000).round(0)
+    gl_table['차이_백만원'] = (gl_table['차이'] / 1_000_000).round(0)
+
+    desc_table = _compare(desc_sums, desc_counts, runnable, months).rename(
+        columns={desc_col: 'GL계정', text_col: '적요'})
+    desc_table['차이'] = desc_table['당년'] - desc_table['전년']
+    desc_table['차이_백만원'] = desc_table['차이'] / 1_000_000
+    desc_table['당년_백만원'] = desc_table['당년'] / 1_000_000
+    desc_table['전년_백만원'] = desc_table['전년'] / 1_000_000
+    return gl_table, desc_table
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='상세 저장소 기준 다기간(MoM / YoY / YTD / 임의 월 묶음) GL 계정별 · 적요별 차이 분석',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python account_variance.py --month 202601
+  python account_variance.py --month 202601 --compare yoy ytd
+  python account_variance.py --pair 202601-202603:202501-202503 202601+202603:202501+202503
+  python account_variance.py --month 202601 --pair 202601:202412 --outdir ./out/variance
+        """
+    )
+    parser.add_argument('--month', '-m', help='기준 월 (YYYYMM) - --compare 비교 쌍 생성')
+    parser.add_argument('--compare', nargs='+', choices=STANDARD_COMPARISONS, default=list(STANDARD_COMPARISONS),
+                        help='기준 월 비교 종류 (기본값: mom yoy ytd)')
+    parser.add_argument('--pair', nargs='+', default=[],
+                        help='추가 비교 쌍 당기:전기 (기간은 YYYYMM, YYYYMM-YYYYMM, YYYYMM+YYYYMM)')
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help=f'상세 저장소 디렉토리 (기본값: {DEFAULT_STORE_DIR})')
+    parser.add_argument('--outdir', '-o', default=DEFAULT_OUTPUT_DIR, help=f'출력 디렉토리 (기본값: {DEFAULT_OUTPUT_DIR})')
+    args = parser.parse_args()
+
+    try:
+        pairs = standard_pairs(args.month, args.compare) if args.month else []
+        pairs += [parse_pair(spec) for spec in args.pair]
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not pairs:
+        print("❌ --month 또는 --pair 를 지정하세요.")
+        sys.exit(1)
+
+    print(f"📊 비교 {len(pairs)}개: " + ', '.join(f"{name}({period_label(c)} vs {period_label(p)})"
+                                             for name, c, p in pairs))
+    gl_table, desc_table = compare_periods(pairs, store_dir=args.store)
+    if gl_table.empty:
+        print("❌ 비교할 수 있는 상세 데이터가 없습니다.")
+        sys.exit(1)
+
+    Path(args.outdir).mkdir(parents=True, exist_ok=True)
+    gl_path = os.path.join(args.outdir, 'gl_variance.csv')
+    desc_path = os.path.join(args.outdir, 'description_variance.csv')
+    gl_table.to_csv(gl_path, index=False, encoding='utf-8-sig')
+    desc_table.to_csv(desc_path, index=False, encoding='utf-8-sig')
+
+    print(f"\n  {'비교':<36}{'계정':>6}{'변동 계정':>10}{'적요':>10}{'차이(백만원)':>14}")
+    for name, group in gl_table.groupby('비교', sort=False):
+        significant = (group['차이_백만원'].abs() >= 1).sum()
+        descriptions = (desc_table['비교'] == name).sum()
+        print(f"  {name:<36}{len(group):>6}{significant:>10}{descriptions:>10}{group['차이'].sum() / 1_000_000:>14,.0f}")
+    print(f"\n✅ 저장: {gl_path}, {desc_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+AI 분석 응답 캐시 모듈
+목적: create_account_analysis_with_ai.py 를 다시 실행하면 금액/적요가 그대로인 계정도 매번 OpenAI를 호출함.
+      요청 내용(모델, 시스템/사용자 프롬프트, 생성 옵션)의 SHA-256 해시를 키로 응답을 out/.ai_cache/ 에 저장하고,
+      같은 요청이면 저장된 응답을 재사용 → 숫자가 바뀐 계정만 새로 호출.
+      프롬프트에는 계정명 / 당년·전년·차이 금액 / 상위 적요 목록이 모두 들어가므로 그중 하나라도 바뀌면 키가 달라짐.
+
+캐시는 오래된 항목(기본 90일 미사용)과 전체 용량(기본 20MB, 오래 안 쓴 항목부터) 기준으로 정리.
+
+사용 예시:
+  python ai_cache.py --status
+  python ai_cache.py --evict --max-age-days 30
+  python ai_cache.py --clear
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = './out/.ai_cache'
+CACHE_VERSION = 1
+DEFAULT_MAX_AGE_DAYS = 90
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+
+
+def request_key(model, messages, **params):
+    """요청 내용 기준 캐시 키 (같은 모델/메시지/옵션이면 같은 키)"""
+    payload = json.dumps(
+        {'version': CACHE_VERSION, 'model': model, 'messages': messages, 'params': params},
+        ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _entry_path(cache_dir, key):
+    return Path(cache_dir) / f"{key}.json"
+
+
+class ResponseCache:
+    """
+    디스크 응답 캐시 (스레드 안전, 적중/미적중 통계)
+
+    Parameters:
+    -----------
+    cache_dir : str
+        캐시 디렉토리 (기본값: ./out/.ai_cache)
+    max_age_days : float
+        마지막 사용 후 이 기간이 지난 항목은 사용하지 않고 정리 대상 (기본값: 90)
+    enabled : bool
+        False면 항상 미적중 (저장도 하지 않음)
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_age_days=DEFAULT_MAX_AGE_DAYS, enabled=True):
+        self.cache_dir = cache_dir
+        self.max_age_days = max_age_days
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """저장된 응답 (없거나 만료되었으면 None). 적중 시 마지막 사용 시각 갱신"""
+        if not self.enabled:
+            self._count(False)
+            return None
+        path = _entry_path(self.cache_dir, key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age_days * 86400:
+                self._count(False)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self._count(False)
+            return None
+        self._count(True)
+        return entry['response']
+
+    def put(self, key, response, **info):
+        """응답 저장 (info: 확인용 부가 정보, 예: gl_account, model)"""
+        if not self.enabled:
+            return
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        entry = {
+            'version': CACHE_VERSION,
+            'key': key,
+            'response': response,
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            **info,
+        }
+        path = _entry_path(self.cache_dir, key)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def summary(self):
+        """적중/미적중 통계 문자열"""
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        return f"캐시 적중 {self.hits}/{total}건 ({rate:.0f}%), 새 요청 {self.misses}건"
+
+
+def cache_status(cache_dir=DEFAULT_CACHE_DIR):
+    """
+    캐시 현황
+
+    Returns:
+    --------
+    dict : {'entries': 항목 수, 'bytes': 전체 크기, 'oldest': 가장 오래 안 쓴 항목 사용 시각, 'newest': 최근 사용 시각}
+    """
+    stats = [p.stat() for p in Path(cache_dir).glob('*.json')]
+    mtimes = [s.st_mtime for s in stats]
+    fmt = lambda t: datetime.datetime.fromtimestamp(t).isoformat(timespec='seconds')
+    return {
+        'entries': len(stats),
+        'bytes': sum(s.st_size for s in stats),
+        'oldest': fmt(min(mtimes)) if mtimes else None,
+        'newest': fmt(max(mtimes)) if mtimes else None,
+    }
+
+
+def evict(cache_dir=DEFAULT_CACHE_DIR, max_age_days=DEFAULT_MAX_AGE_DAYS, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    캐시 정리: 만료 항목 삭제 후, 전체 크기가 max_bytes 를 넘으면 오래 안 쓴 항목부터 삭제
+
+    Returns:
+    --------
+    int : 삭제한 항목 수
+    """
+    now = time.time()
+    entries = []
+    for path in Path(cache_dir).glob('*.json'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+
+    removed = 0
+    total_bytes = sum(size for _, size, _ in entries)
+    for mtime, size, path in entries:
+        if now - mtime <= max_age_days * 86400 and total_bytes <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total_bytes -= size
+        removed += 1
+    return removed
+
+
+def clear_ai_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """캐시 항목 전체 삭제. Returns: 삭제한 파일 수"""
+    removed = 0
+    for pattern in ('*.json', '*.tmp'):
+        for path in Path(cache_dir).glob(pattern):
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def main():
+    """
+    메인 함수: CLI 인터페이스
+    """
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description='AI 분석 응답 캐시 관리')
+    parser.add_argument('--status', action='store_true', help='캐시 상태 출력')
+    parser.add_argument('--evict', action='store_true', help='만료/용량 초과 항목 정리')
+    parser.add_argument('--clear', action='store_true', help='캐시 전체 삭제')
+    parser.add_argument('--max-age-days', type=float, default=DEFAULT_MAX_AGE_DAYS,
+                        help=f'미사용 보관 기간 (기본값: {DEFAULT_MAX_AGE_DAYS}일)')
+    parser.add_argument('--max-mb', type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024,
+                        help=f'최대 캐시 크기 MB (기본값: {DEFAULT_MAX_BYTES // 1024 // 1024})')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f'캐시 디렉토리 (기본값: {DEFAULT_CACHE_DIR})')
+    args = parser.parse_args()
+
+    if args.clear:
+        print(f"✓ 캐시 파일 {clear_ai_cache(args.cache_dir)}개 삭제")
+
+    if args.evict:
+        removed = evict(args.cache_dir, args.max_age_days, int(args.max_mb * 1024 * 1024))
+        print(f"✓ 캐시 항목 {removed}개 정리")
+
+    if args.status or not (args.clear or args.evict):
+        status = cache_status(args.cache_dir)
+        print(f"캐시 디렉토리: {args.cache_dir}")
+        print(f"  - 항목: {status['entries']:,}개 ({status['bytes'] / 1024:.1f}KB)")
+        if status['entries']:
+            print(f"  - 사용 시각: {status['oldest']} ~ {status['newest']}")
+
+
+if __name__ == '__main__':
+    main()
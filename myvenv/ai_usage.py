@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+AI 분석 요청 사용량 집계 모듈
+목적: create_account_analysis_with_ai.py 는 계정마다 "✅" 만 출력해서 월마감 실행 한 번에 토큰이 얼마나 들고
+      시간이 어디에 쓰이는지 알 수 없음. 요청(call)마다 입력/출력 토큰, 지연 시간, 재시도, 결과(성공/실패)를,
+      계정마다 설명 출처(AI 응답 / 캐시 / 기본 설명)를 기록하고, 실행 요약 출력과 JSON 보고서
+      (out/gl_account_analysis_ai_usage.json)로 저장 → max_tokens, 동시 요청 수, 유의 변동 기준(1백만원) 조정 근거.
+
+  - 지연 시간은 재시도 대기를 포함한 요청 1건 전체 시간
+  - 배치 요청의 토큰은 요청에 든 계정 수로 나눠 계정별로 배분
+  - finish_reason 이 'length' 인 요청은 max_tokens 에서 잘린 응답
+
+사용 예시:
+  from ai_usage import UsageLog
+  usage = UsageLog(backend='openai', model='gpt-4o-mini', max_tokens=300)
+  usage.record_call(['복리후생비_식대'], latency=0.8, attempts=1, status='ok', prompt_tokens=420, completion_tokens=95)
+  usage.record_account('복리후생비_식대', change=-12.0, source='ai')
+  usage.print_summary()
+  usage.write('out/gl_account_analysis_ai_usage.json')
+"""
+import datetime
+import json
+import threading
+from pathlib import Path
+
+REPORT_VERSION = 2
+
+# 계정 |차이|(백만원) 구간 - 유의 변동 기준 조정용
+CHANGE_BUCKETS = [1, 5, 20, 100]
+
+
+def _percentile(values, q):
+    """최근접 순위 백분위 (값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def _bucket(change):
+    """|차이| → 구간 이름 (예: '5~20', '100~', '~1')"""
+    size = abs(change)
+    if size < CHANGE_BUCKETS[0]:
+        return f"~{CHANGE_BUCKETS[0]}"
+    for low, high in zip(CHANGE_BUCKETS, CHANGE_BUCKETS[1:]):
+        if size < high:
+            return f"{low}~{high}"
+    return f"{CHANGE_BUCKETS[-1]}~"
+
+
+class UsageLog:
+    """
+    AI 요청 / 계정별 사용량 기록 (스레드 안전)
+
+    Parameters:
+    -----------
+    info :
+        보고서에 함께 남길 실행 정보 (예: backend, model, concurrency, batch_size, max_tokens)
+    """
+
+    def __init__(self, **info):
+        self.info = info
+        self.calls = []
+        self.accounts = []
+        self._lock = threading.Lock()
+
+    def record_call(self, accounts, latency, attempts, status, prompt_tokens=None, completion_tokens=None,
+                    finish_reason=None, error=None):
+        """
+        요청 1건 기록
+
+        Parameters:
+        -----------
+        accounts : list
+            요청에 든 계정명
+        latency : float
+            재시도 대기를 포함한 소요 초
+        attempts : int
+            시도 횟수 (재시도 = attempts - 1)
+        status : str
+            'ok' 또는 'error'
+        """
+        with self._lock:
+            self.calls.append({
+                'accounts': [str(a) for a in accounts],
+                'latency': latency,
+                'attempts': attempts,
+                'retries': attempts - 1,
+                'status': status,
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'finish_reason': finish_reason,
+                'error': error,
+            })
+
+    def record_account(self, account, change, source):
+        """
+        계정 설명 출처 기록
+
+        source : str
+            'ai' (이번 실행 응답), 'cache' (응답 캐시), 'fallback' (실패로 기본 설명 사용)
+        """
+        with self._lock:
+            self.accounts.append({'account': str(account), 'change': change, 'source': source})
+
+    def _account_costs(self):
+        """계정명 → {'prompt_tokens', 'completion_tokens', 'latency', 'requests'} (배치 요청은 계정 수로 나눔)"""
+        costs = {}
+        for call in self.calls:
+            share = len(call['accounts']) or 1
+            for account in call['accounts']:
+                cost = costs.setdefault(account, {'prompt_tokens': 0, 'completion_tokens': 0,
+                                                  'latency': 0.0, 'requests': 0})
+                cost['prompt_tokens'] += (call['prompt_tokens'] or 0) / share
+                cost['completion_tokens'] += (call['completion_tokens'] or 0) / share
+                cost['latency'] += call['latency']
+                cost['requests'] += 1
+        return costs
+
+    def summary(self):
+        """
+        실행 요약
+
+        Returns:
+        --------
+        dict : 요청 수 / 재시도 / 실패 / 토큰 합계 / 지연 백분위 / 잘린 응답 수 / 설명 출처별 계정 수 / |차이| 구간별 집계
+               (구간별 requests 는 구간 계정이 하나라도 든 요청 수 - 배치 요청은 한 번만 셈)
+        """
+        with self._lock:
+            calls = list(self.calls)
+            accounts = list(self.accounts)
+        latencies = [c['latency'] for c in calls]
+        prompt_tokens = sum(c['prompt_tokens'] or 0 for c in calls)
+        completion_tokens = sum(c['completion_tokens'] or 0 for c in calls)
+
+        costs = self._account_costs()
+        account_calls = {}
+        for i, call in enumerate(calls):
+            for account in call['accounts']:
+                account_calls.setdefault(account, set()).add(i)
+        buckets = {}
+        for row in accounts:
+            bucket = buckets.setdefault(_bucket(row['change']), {'accounts': 0, 'calls': set(), 'tokens': 0.0})
+            bucket['accounts'] += 1
+            bucket['calls'] |= account_calls.get(row['account'], set())
+            cost = costs.get(row['account'])
+            if cost:
+                bucket['tokens'] += cost['prompt_tokens'] + cost['completion_tokens']
+        order = [_bucket(CHANGE_BUCKETS[0] - 1)] + [_bucket(b) for b in CHANGE_BUCKETS]
+
+        return {
+            'requests': len(calls),
+            'failed_requests': sum(c['status'] != 'ok' for c in calls),
+            'retries': sum(c['retries'] for c in calls),
+            'truncated': sum(c['finish_reason'] == 'length' for c in calls),
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+            'token_usage_reported': all(c['prompt_tokens'] is not None for c in calls if c['status'] == 'ok'),
+            'latency': {
+                'total': sum(latencies),
+                'mean': sum(latencies) / len(latencies) if latencies else None,
+                'p50': _percentile(latencies, 50),
+                'p95': _percentile(latencies, 95),
+                'max': max(latencies) if latencies else None,
+            },
+            'accounts': len(accounts),
+            'sources': {source: sum(r['source'] == source for r in accounts) for source in ('ai', 'cache', 'fallback')},
+            'change_buckets': [{'change_mm': name, 'accounts': buckets[name]['accounts'],
+                                'requests': len(buckets[name]['calls']), 'tokens': buckets[name]['tokens']}
+                               for name in order if name in buckets],
+        }
+
+    def report(self, wall_seconds=None):
+        """JSON 보고서 내용 (실행 정보 + 요약 + 요청별 / 계정별 기록)"""
+        costs = self._account_costs()
+        with self._lock:
+            calls = list(self.calls)
+            accounts = list(self.accounts)
+        return {
+            'version': REPORT_VERSION,
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            **self.info,
+            'wall_seconds': wall_seconds,
+            'summary': self.summary(),
+            'calls': calls,
+            'accounts': [{**row, **costs.get(row['account'], {'prompt_tokens': 0, 'completion_tokens': 0,
+                                                               'latency': 0.0, 'requests': 0})}
+                         for row in accounts],
+        }
+
+    def write(self, path, wall_seconds=None):
+        """JSON 보고서 저장"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(wall_seconds), f, ensure_ascii=False, indent=2)
+        return path
+
+    def print_summary(self):
+        """실행 요약 출력"""
+        s = self.summary()
+        latency = s['latency']
+        print(f"\n📈 AI 요청 통계 ({self.info.get('backend', '-')}, {self.info.get('model', '-')})")
+        print(f"   요청 {s['requests']}회 (재시도 {s['retries']}회, 실패 {s['failed_requests']}회) · "
+              f"계정 {s['accounts']}개: AI {s['sources']['ai']} / 캐시 {s['sources']['cache']} / "
+              f"기본 설명 {s['sources']['fallback']}")
+        if s['requests']:
+            note = '' if s['token_usage_reported'] else ' (일부 요청은 서버가 토큰 수를 주지 않음)'
+            print(f"   토큰: 입력 {s['prompt_tokens']:,} / 출력 {s['completion_tokens']:,} "
+                  f"(합계 {s['total_tokens']:,}){note}")
+            print(f"   지연: 평균 {latency['mean']:.2f}초, p50 {latency['p50']:.2f}초, p95 {latency['p95']:.2f}초, "
+                  f"최대 {latency['max']:.2f}초")
+        if s['truncated']:
+            print(f"   ⚠ max_tokens({self.info.get('max_tokens')})에서 잘린 응답 {s['truncated']}건 → --max-tokens 조정 고려")
+        for bucket in s['change_buckets']:
+            print(f"   |차이| {bucket['change_mm']}백만원: 계정 {bucket['accounts']}개, "
+                  f"요청 {bucket['requests']}회, 토큰 {bucket['tokens']:,.0f}")
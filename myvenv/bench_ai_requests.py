@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+AI 분석 요청 동시 처리 / 배치 벤치마크
+목적: OpenAI 키/네트워크 없이 스텁 백엔드(llm_backend.StubBackend)로 create_account_analysis_with_ai 의
+      계정별 요청 흐름(describe_accounts)을 배치 크기 × 동시 요청 수 조합별로 실행하고
+      요청 수 / 소요 시간 / 계정 처리량을 비교.
+
+  - 계정 작업은 합성 (계정명, 금액, 상위 적요 5개) - 프롬프트 길이는 실제와 비슷
+  - 지연 = 요청당 지연 + 계정당 지연 × 요청에 든 계정 수 (배치 요청은 응답이 길어지는 것을 흉내)
+  - 응답 캐시는 사용하지 않음
+  - 토큰 수는 스텁의 글자 수 기준 추정값 (배치는 지시문이 한 번만 들어가 입력 토큰이 줄어듦)
+
+사용 예시:
+  python bench_ai_requests.py
+  python bench_ai_requests.py --accounts 120 --batch-sizes 1 5 10 20 --concurrency 1 4 8
+  python bench_ai_requests.py --latency 1.0 --per-account-latency 0.2
+"""
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+
+import create_account_analysis_with_ai as ai
+from ai_usage import UsageLog
+from synthetic_ledger import ACCOUNTS, OTHER_TEXTS
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+
+def synthetic_jobs(count, seed=0):
+    """합성 계정 작업 [(계정명, 당년, 전년, 차이, 상위 적요), ...]"""
+    rng = random.Random(seed)
+    names = [name for _, _, _, name, _ in ACCOUNTS]
+    jobs = []
+    for i in range(count):
+        current, previous = rng.uniform(10, 500), rng.uniform(10, 500)
+        descriptions = [{
+            '적요': rng.choice(OTHER_TEXTS)[0],
+            '차이_백만원': rng.uniform(-50, 50),
+            '당년_백만원': rng.uniform(0, 100),
+            '전년_백만원': rng.uniform(0, 100),
+        } for _ in range(5)]
+        jobs.append((f"{names[i % len(names)]}_{i:03d}", current, previous, current - previous, descriptions))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='스텁 백엔드로 AI 분석 요청 수 / 소요 시간 비교 (배치 크기 × 동시 요청 수)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python bench_ai_requests.py
+  python bench_ai_requests.py --accounts 120 --batch-sizes 1 5 10 20 --concurrency 1 4 8
+  python bench_ai_requests.py --latency 1.0 --per-account-latency 0.2
+        """
+    )
+    parser.add_argument('--accounts', type=int, default=40, help='계정 수 (기본값: 40)')
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 5, 10], help='배치 크기 목록 (기본값: 1 5 10)')
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4], help='동시 요청 수 목록 (기본값: 1 4)')
+    parser.add_argument('--latency', type=float, default=0.2, help='요청당 지연 초 (기본값: 0.2)')
+    parser.add_argument('--per-account-latency', type=float, default=0.05, help='계정당 추가 지연 초 (기본값: 0.05)')
+    args = parser.parse_args()
+
+    jobs = synthetic_jobs(args.accounts)
+    ai.configure_backend('stub', stub_latency=args.latency, stub_per_account_latency=args.per_account_latency)
+    print(f"계정 {len(jobs)}개, 지연 {args.latency}초 + 계정당 {args.per_account_latency}초")
+    print(f"\n  {'배치':>4}{'동시':>6}{'요청 수':>8}{'소요 시간':>11}{'계정/초':>10}{'토큰':>10}   확인")
+
+    baseline = None
+    for batch_size in args.batch_sizes:
+        for concurrency in args.concurrency:
+            usage = UsageLog()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                descriptions = ai.describe_accounts(jobs, concurrency=concurrency, batch_size=batch_size,
+                                                    use_cache=False, usage=usage)
+            elapsed = time.perf_counter() - start
+            summary = usage.summary()
+            complete = all(descriptions) and all(job[0] in d for job, d in zip(jobs, descriptions))
+            baseline = baseline or elapsed
+            print(f"  {batch_size:>4}{concurrency:>6}{summary['requests']:>8}{elapsed:>10.2f}초{len(jobs) / elapsed:>10.1f}"
+                  f"{summary['total_tokens']:>10,}   "
+                  f"{'✓' if complete else '❌ 누락'} ({baseline / elapsed:.1f}배)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+금액/연월 정규화 벤치마크
+목적: 행 단위 apply(clean_amount / normalize_yyyymm) 와 벡터화 버전의 처리 속도(rows/s) 비교 및 결과 동일성 검증
+
+사용 예시:
+  python bench_normalize.py              # 합성 원장 1,000,000행
+  python bench_normalize.py --rows 200000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from normalize import clean_amount, normalize_yyyymm, clean_amount_series, normalize_yyyymm_series
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+
+def make_synthetic_columns(rows, seed=0):
+    """
+    실제 원장과 비슷한 분포의 금액/연월 컬럼 생성
+    - 금액: float 75%, int 10%, 서식 문자열 10% ('1,234,567', '-12,000', ' 3 500 ', '1.2.3' 등), 결측 5%
+    - 연월: '2024/01' 형식 위주, '2024-01' / 결측 일부
+    """
+    rng = np.random.default_rng(seed)
+
+    amounts = np.round(rng.normal(300_000, 2_000_000, rows), 0)
+    kind = rng.random(rows)
+    amount_col = amounts.astype(object)
+
+    int_mask = (kind >= 0.75) & (kind < 0.85)
+    amount_col[int_mask] = [int(v) for v in amounts[int_mask]]
+
+    str_mask = (kind >= 0.85) & (kind < 0.95)
+    formats = ['{:,.0f}', '{:.0f}', ' {:,.0f} ', '₩{:,.0f}', '{:,.0f}원', '{:.1f}.5']
+    picks = rng.integers(0, len(formats), str_mask.sum())
+    amount_col[str_mask] = [formats[p].format(v) for p, v in zip(picks, amounts[str_mask])]
+
+    amount_col[kind >= 0.95] = None
+
+    months = rng.integers(1, 13, rows)
+    period_col = np.array([f"2024/{m:02d}" for m in range(1, 13)], dtype=object)[months - 1]
+    period_kind = rng.random(rows)
+    period_col[period_kind > 0.97] = [f"2024-{m:02d}" for m in months[period_kind > 0.97]]
+    period_col[period_kind < 0.01] = None
+
+    return pd.Series(amount_col, dtype=object, name='금액(현지 통화)'), pd.Series(period_col, dtype=object, name='연도/월')
+
+
+def _time(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(rows=1_000_000, seed=0):
+    """apply vs 벡터화 비교 결과 출력. Returns: 검증 통과 여부"""
+    print(f"\n{'='*80}")
+    print(f"정규화 벤치마크 (합성 원장 {rows:,}행)")
+    print(f"{'='*80}\n")
+
+    amount_col, period_col = make_synthetic_columns(rows, seed)
+    ok = True
+
+    # 엑셀에서 금액 컬럼이 모두 숫자면 read_excel 결과가 float64 컬럼이 됨
+    numeric_col = pd.to_numeric(amount_col.where(amount_col.map(type) != str), errors='coerce')
+
+    for label, column, scalar_func, vector_func in [
+        ('금액 정제 (문자 혼합 컬럼)', amount_col, clean_amount, clean_amount_series),
+        ('금액 정제 (숫자 컬럼)', numeric_col, clean_amount, clean_amount_series),
+        ('연월 정규화', period_col, normalize_yyyymm, normalize_yyyymm_series),
+    ]:
+        before, before_sec = _time(column.apply, scalar_func)
+        after, after_sec = _time(vector_func, column)
+
+        if label.startswith('금액'):
+            # float 비트 단위 비교 (-0.0 / 반올림 차이까지 검출)
+            same = np.array_equal(before.to_numpy(dtype=float).view(np.int64), after.to_numpy().view(np.int64))
+        else:
+            same = before.astype(object).equals(after.astype(object))
+        ok = ok and same
+
+        print(f"{label}:")
+        print(f"  - apply   : {before_sec:8.3f}초  ({rows / before_sec:>14,.0f} rows/s)")
+        print(f"  - 벡터화  : {after_sec:8.3f}초  ({rows / after_sec:>14,.0f} rows/s)")
+        print(f"  - 속도 향상: {before_sec / after_sec:.1f}배, 결과 동일: {'✓' if same else '✗'}\n")
+
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='금액/연월 정규화 apply vs 벡터화 벤치마크')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='합성 원장 행 수 (기본값: 1,000,000)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    args = parser.parse_args()
+
+    if not run_benchmark(args.rows, args.seed):
+        print("❌ 벡터화 결과가 기존 결과와 다릅니다!")
+        sys.exit(1)
+    print("✅ 벡터화 결과가 기존 결과와 동일합니다.")
+
+
+if __name__ == '__main__':
+    main()
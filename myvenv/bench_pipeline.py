@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+월마감 파이프라인 단계별 벤치마크
+목적: 실제(대외비) 원장 없이 합성 원장(synthetic_ledger.py)으로 run_monthly_update 의 단계
+      (pivot / detail / categories / it-2026)를 원장 크기별로 실행하고, 단계별 소요 시간 / 처리량(행/초) /
+      최대 추가 메모리를 결과 CSV에 누적 기록. 같은 크기·단계의 직전 기록과 비교해 느려진 단계를 표시.
+
+  - 원장 크기는 전체 행 수 (24/25/26공통비 세 원장에 나눠 생성, 엑셀 파싱은 측정하지 않음)
+  - 처리량 = 전체 원장 행 수 / 단계 소요 시간
+  - 메모리는 tracemalloc 으로 별도 실행에서 측정 (단계 시작 시점 대비 최대 증가량, 추적 중에는 느려지므로 시간은 따로 측정)
+  - 출력 파일은 임시 디렉토리에 쓰고 삭제 (./out 은 건드리지 않음)
+  - ai-analysis 단계(OpenAI 호출)는 제외
+  - 합성 원장 메모리는 100만 행에 약 1.4GB (500만 행은 7GB 이상 필요)
+
+사용 예시:
+  python bench_pipeline.py                                  # 1만, 10만 행
+  python bench_pipeline.py --sizes 10000 100000 1000000 5000000
+  python bench_pipeline.py --sizes 100000 --repeat 3 --no-memory
+  python bench_pipeline.py --fail-on-regression             # 직전 기록보다 20% 이상 느려지면 종료 코드 1
+"""
+import argparse
+import contextlib
+import csv
+import datetime
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from run_monthly_update import build_stages, run_pipeline
+from synthetic_ledger import ledger_filename, synthetic_ledger
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_SIZES = [10_000, 100_000]
+DEFAULT_RESULTS = './out/bench/pipeline_bench.csv'
+DEFAULT_THRESHOLD = 0.2
+
+YEARS = [2024, 2025, 2026]
+MONTH = '202601'
+DETAIL_MONTHS = ['202601', '202501']
+SKIP_STAGES = {'ai-analysis'}
+
+RESULT_FIELDS = ['timestamp', 'commit', 'rows', 'stage', 'status', 'seconds', 'rows_per_sec', 'peak_mb']
+
+
+def git_commit():
+    """현재 커밋 (git 저장소가 아니면 빈 문자열)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def make_ledgers(total_rows):
+    """전체 행 수 → {원장 파일명: 합성 원장} (세 원장에 나눠 생성)"""
+    rows = [total_rows // len(YEARS) + (1 if i < total_rows % len(YEARS) else 0) for i in range(len(YEARS))]
+    return {ledger_filename(year): synthetic_ledger(n, year=year) for year, n in zip(YEARS, rows)}
+
+
+def _stages(ledgers, peaks=None):
+    """
+    run_monthly_update 단계 정의에서 원장 로드를 합성 원장 주입으로 바꾼 단계
+
+    peaks : dict, optional
+        있으면 단계마다 tracemalloc 최대 증가량(bytes)을 {단계명: bytes} 로 기록
+    """
+    files = list(ledgers)
+    stages = build_stages(files, MONTH, DETAIL_MONTHS, output_dir='./out', use_cache=False)
+
+    def make_loader(file_path):
+        def load(ctx):
+            ctx['ledgers'][file_path] = ledgers[file_path]
+            return len(ledgers[file_path])
+        return load
+
+    for file_path in files:
+        stages[f"load:{file_path}"]['func'] = make_loader(file_path)
+
+    if peaks is not None:
+        def traced(name, func):
+            def run(ctx):
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                result = func(ctx)
+                peaks[name] = tracemalloc.get_traced_memory()[1] - base
+                return result
+            return run
+
+        for name, stage in stages.items():
+            stage['func'] = traced(name, stage['func'])
+    return stages
+
+
+def _run_in(workdir, stages):
+    """임시 디렉토리에서 단계 실행 (출력 숨김)"""
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run_pipeline(stages, skip=SKIP_STAGES)
+    finally:
+        os.chdir(cwd)
+
+
+def benchmark_size(total_rows, repeat=1, memory=True):
+    """
+    원장 크기 1개 벤치마크
+
+    Returns:
+    --------
+    list : [{'stage', 'status', 'seconds', 'rows_per_sec', 'peak_mb'}, ...] (load 단계 제외)
+    """
+    start = time.perf_counter()
+    ledgers = make_ledgers(total_rows)
+    ledger_mb = sum(df.memory_usage(deep=True).sum() for df in ledgers.values()) / 1024 / 1024
+    print(f"  합성 원장 생성: {time.perf_counter() - start:.2f}초 (메모리 {ledger_mb:,.0f}MB)")
+
+    seconds = {}
+    status = {}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as workdir:
+            for r in _run_in(workdir, _stages(ledgers)):
+                seconds[r['stage']] = min(seconds.get(r['stage'], float('inf')), r['seconds'])
+                if status.get(r['stage'], 'ok') == 'ok':
+                    status[r['stage']] = r['status']
+
+    peaks = {}
+    if memory:
+        tracemalloc.start()
+        try:
+            with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as workdir:
+                _run_in(workdir, _stages(ledgers, peaks))
+        finally:
+            tracemalloc.stop()
+
+    results = []
+    for stage, elapsed in seconds.items():
+        if stage.startswith('load:') or stage in SKIP_STAGES:
+            continue
+        results.append({
+            'stage': stage,
+            'status': status[stage],
+            'seconds': elapsed,
+            'rows_per_sec': total_rows / elapsed if elapsed > 0 else 0.0,
+            'peak_mb': peaks[stage] / 1024 / 1024 if stage in peaks else None,
+        })
+    return results
+
+
+def load_previous(results_path):
+    """결과 CSV → {(행 수, 단계): 마지막 기록}"""
+    previous = {}
+    if os.path.exists(results_path):
+        with open(results_path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                if row['status'] == 'ok':
+                    previous[(int(row['rows']), row['stage'])] = row
+    return previous
+
+
+def append_results(results_path, rows):
+    """결과 CSV에 기록 추가 (없으면 헤더 포함 생성)"""
+    Path(results_path).parent.mkdir(parents=True, exist_ok=True)
+    new_file = not os.path.exists(results_path)
+    with open(results_path, 'a', encoding='utf-8-sig' if new_file else 'utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='합성 원장으로 월마감 파이프라인 단계별 소요 시간 / 처리량 / 메모리 측정',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python bench_pipeline.py
+  python bench_pipeline.py --sizes 10000 100000 1000000 5000000
+  python bench_pipeline.py --sizes 100000 --repeat 3 --no-memory
+  python bench_pipeline.py --results out/bench/pipeline_bench.csv --fail-on-regression
+        """
+    )
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                        help='전체 원장 행 수 목록 (기본값: 10000 100000)')
+    parser.add_argument('--repeat', type=int, default=1, help='크기별 반복 횟수 - 단계별 최소 시간 기록 (기본값: 1)')
+    parser.add_argument('--no-memory', action='store_true', help='메모리 측정 실행 생략 (시간만 측정)')
+    parser.add_argument('--results', default=DEFAULT_RESULTS, help=f'결과 CSV (기본값: {DEFAULT_RESULTS})')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='직전 기록 대비 느려짐 경고 기준 비율 (기본값: 0.2 = 20%%)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='느려진 단계가 있으면 종료 코드 1')
+    args = parser.parse_args()
+
+    results_path = os.path.abspath(args.results)
+    previous = load_previous(results_path)
+    commit = git_commit()
+    timestamp = datetime.datetime.now().isoformat(timespec='seconds')
+
+    if not args.no_memory:
+        print("※ 메모리는 tracemalloc 추적 실행에서 따로 측정 (단계 시작 시점 대비 최대 증가량)")
+
+    regressions = []
+    failed = False
+    for total_rows in args.sizes:
+        print(f"\n{'='*80}")
+        print(f"원장 {total_rows:,}행")
+        print(f"{'='*80}")
+        results = benchmark_size(total_rows, repeat=args.repeat, memory=not args.no_memory)
+
+        print(f"  {'단계':<14}{'소요 시간':>10}{'처리량(행/초)':>16}{'최대 메모리':>12}   직전 대비")
+        for r in results:
+            before = previous.get((total_rows, r['stage']))
+            change = ''
+            if before and r['status'] == 'ok' and float(before['seconds']) > 0:
+                ratio = r['seconds'] / float(before['seconds']) - 1
+                change = f"{ratio:+.0%}"
+                if ratio > args.threshold:
+                    change += ' ⚠'
+                    regressions.append((total_rows, r['stage'], ratio))
+            if r['status'] != 'ok':
+                failed = True
+                change = f"❌ {r['status']}"
+            peak = f"{r['peak_mb']:,.1f}MB" if r['peak_mb'] is not None else '-'
+            print(f"  {r['stage']:<14}{r['seconds']:>9.2f}초{r['rows_per_sec']:>16,.0f}{peak:>12}   {change}")
+
+        append_results(results_path, [{
+            'timestamp': timestamp,
+            'commit': commit,
+            'rows': total_rows,
+            'stage': r['stage'],
+            'status': r['status'],
+            'seconds': f"{r['seconds']:.4f}",
+            'rows_per_sec': f"{r['rows_per_sec']:.0f}",
+            'peak_mb': f"{r['peak_mb']:.1f}" if r['peak_mb'] is not None else '',
+        } for r in results])
+
+    print(f"\n결과 기록: {results_path}")
+    if regressions:
+        print(f"⚠ 직전 기록보다 {args.threshold:.0%} 이상 느려진 단계:")
+        for total_rows, stage, ratio in regressions:
+            print(f"  - {total_rows:,}행 {stage}: {ratio:+.0%}")
+    if failed:
+        print("❌ 실패한 단계가 있습니다.")
+    if failed or (regressions and args.fail_on_regression):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
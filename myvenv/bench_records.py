@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+원장 → JSON 레코드 변환 벤치마크
+목적: 추출 스크립트가 쓰던 행 단위 루프(filtered.iterrows() + dict append)와
+      ledger_records 컬럼 단위 변환(build_records)의 처리 속도(rows/s) 비교 및 결과 동일성 검증
+
+입력은 합성 원장 (기간/월, 텍스트, 거래처명, 참조 키 3, 금액, 코스트센터명 - 결측/0원/음수/문자열 금액/
+'[CLSD]공통_' 접두어 포함)
+
+사용 예시:
+  python bench_records.py              # 200,000행
+  python bench_records.py --rows 1000000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from ledger_records import (
+    amount_column, build_records, clean_cctr_column, final_vendor_column,
+    month_column, str_column, to_million_won,
+)
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+
+def synthetic_ledger(rows, seed=0):
+    """합성 원장 DataFrame"""
+    rng = np.random.default_rng(seed)
+    periods = np.array(['2025/01', '2025/06', '2025/12', '2025/7', '12', None, 'X'], dtype=object)
+    texts = np.array(['AWS 사용료', 'Slack 구독', 'MS 365', 'Zoom', None, '법인카드 ChatGPT'], dtype=object)
+    vendors = np.array(['아마존웹서비스', '슬랙', None, 'nan', '한국마이크로소프트'], dtype=object)
+    cctrs = np.array(['공통_IT팀', '[CLSD]공통_경영지원', '[CLSD]재무팀', '개발팀', None], dtype=object)
+    amounts = rng.integers(-2_000_000, 50_000_000, rows).astype(object)
+    amounts[rng.random(rows) < 0.05] = 0
+    amounts[rng.random(rows) < 0.02] = None
+    amounts[rng.random(rows) < 0.01] = '1,000'
+    return pd.DataFrame({
+        '기간/월': periods[rng.integers(0, len(periods), rows)],
+        '텍스트': texts[rng.integers(0, len(texts), rows)],
+        '거래처명': vendors[rng.integers(0, len(vendors), rows)],
+        '참조 키 3': vendors[rng.integers(0, len(vendors), rows)],
+        '금액(문서 통화)': amounts,
+        '코스트센터명': cctrs[rng.integers(0, len(cctrs), rows)],
+    })
+
+
+def legacy_records(filtered):
+    """기존 행 단위 루프 (extract_commission / extract_it_maintenance 방식)"""
+    records = []
+    for _, row in filtered.iterrows():
+        period = str(row['기간/월']) if pd.notna(row['기간/월']) else ''
+        month = period.split('/')[-1] if '/' in period else period[-2:] if len(period) >= 2 else ''
+        try:
+            month = str(int(month)).zfill(2)
+        except:
+            month = ''
+
+        text = str(row['텍스트']) if pd.notna(row['텍스트']) else ''
+        vendor = str(row['거래처명']) if pd.notna(row['거래처명']) else ''
+        ref3 = str(row['참조 키 3']) if pd.notna(row['참조 키 3']) else ''
+        final_vendor = vendor if vendor and vendor != 'nan' else ref3
+        cctr = str(row['코스트센터명']) if pd.notna(row['코스트센터명']) else ''
+
+        try:
+            amount = float(row['금액(문서 통화)']) if pd.notna(row['금액(문서 통화)']) else 0
+        except:
+            amount = 0
+
+        if amount > 0 and month:
+            records.append({
+                'month': month,
+                'text': text,
+                'vendor': final_vendor,
+                'cctr': cctr.replace('공통_', '').replace('[CLSD]공통_', '').replace('[CLSD]', ''),
+                'amount': round(amount / 1_000_000)
+            })
+    return records
+
+
+def column_records(filtered):
+    """ledger_records 컬럼 단위 변환"""
+    month = month_column(filtered['기간/월'])
+    amount = amount_column(filtered['금액(문서 통화)'])
+    keep = (amount > 0) & (month != '')
+    return build_records({
+        'month': month[keep],
+        'text': str_column(filtered['텍스트'])[keep],
+        'vendor': final_vendor_column(filtered['거래처명'], filtered['참조 키 3'])[keep],
+        'cctr': clean_cctr_column(filtered['코스트센터명'])[keep],
+        'amount': to_million_won(amount[keep])
+    })
+
+
+def bench(label, rows, func):
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    print(f"  {label:<20}{seconds:>9.2f}초{rows / seconds:>14,.0f} rows/s")
+    return result, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='원장 → JSON 레코드 변환: 행 단위 vs 컬럼 단위')
+    parser.add_argument('--rows', type=int, default=200_000, help='행 수 (기본값: 200,000)')
+    args = parser.parse_args()
+
+    df = synthetic_ledger(args.rows)
+    print(f"{args.rows:,}행 합성 원장")
+
+    row_result, row_sec = bench('행 단위 (iterrows)', args.rows, lambda: legacy_records(df))
+    col_result, col_sec = bench('컬럼 단위', args.rows, lambda: column_records(df))
+
+    same = row_result == col_result and all(
+        type(a['amount']) is type(b['amount']) for a, b in zip(row_result, col_result)
+    )
+    print(f"  레코드 {len(col_result):,}건, 속도 향상 {row_sec / col_sec:.1f}배, 결과 동일: {'✓' if same else '✗'}")
+
+    if not same:
+        print("\n❌ 컬럼 단위 결과가 행 단위 결과와 다릅니다!")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+원장 읽기 방식별 메모리 사용량 비교
+목적: pd.read_excel(시트 전체 로드) 과 스트리밍 집계(ledger_stream.py)의 최대 메모리(tracemalloc 기준)와 소요 시간 비교,
+      두 방식의 피벗 결과 동일 여부 확인
+
+사용 예시:
+  python bench_stream.py 26공통비.XLSX
+  python bench_stream.py 24공통비.XLSX 25공통비.XLSX --chunk-size 20000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+from excel import process_excel_to_pivot
+from ledger_stream import DEFAULT_CHUNK_SIZE
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+
+def measure(func, *args, **kwargs):
+    """
+    함수 실행 시 최대 메모리 / 소요 시간 측정 (출력은 숨김)
+
+    Returns:
+    --------
+    (결과, 최대 메모리 bytes, 소요 시간 초)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, seconds
+
+
+def compare_file(input_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """원장 1개에 대해 두 방식 비교 결과 출력. Returns: 피벗 결과 동일 여부"""
+    print(f"\n{'='*80}")
+    print(f"{input_file} ({os.path.getsize(input_file) / 1024 / 1024:.1f}MB)")
+    print(f"{'='*80}")
+
+    full, full_peak, full_sec = measure(
+        process_excel_to_pivot, input_file, use_cache=False, save=False
+    )
+    stream, stream_peak, stream_sec = measure(
+        process_excel_to_pivot, input_file, save=False, streaming=True, chunk_size=chunk_size
+    )
+
+    same = full['gl'].equals(stream['gl']) and full['cctr'].equals(stream['cctr'])
+
+    print(f"  {'방식':<24}{'최대 메모리':>14}{'소요 시간':>12}")
+    print(f"  {'pd.read_excel (전체)':<24}{full_peak / 1024 / 1024:>12.1f}MB{full_sec:>11.2f}초")
+    print(f"  {f'스트리밍 ({chunk_size:,}행)':<24}{stream_peak / 1024 / 1024:>12.1f}MB{stream_sec:>11.2f}초")
+    print(f"  메모리 절감: {(1 - stream_peak / full_peak) * 100:.0f}%, 피벗 결과 동일: {'✓' if same else '✗'}")
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description='pd.read_excel vs 스트리밍 집계 메모리 사용량 비교')
+    parser.add_argument('files', nargs='+', help='원장 엑셀 파일')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'스트리밍 청크당 행 수 (기본값: {DEFAULT_CHUNK_SIZE:,})')
+    args = parser.parse_args()
+
+    print("※ tracemalloc 추적 중에는 처리 속도가 느려지므로 소요 시간은 상대 비교용")
+
+    ok = True
+    for input_file in args.files:
+        if not os.path.exists(input_file):
+            print(f"⚠ 파일을 찾을 수 없습니다: {input_file}")
+            continue
+        ok = compare_file(input_file, args.chunk_size) and ok
+
+    if not ok:
+        print("\n❌ 스트리밍 피벗 결과가 기존 결과와 다릅니다!")
+        sys.exit(1)
+    print("\n✅ 스트리밍 피벗 결과가 기존 결과와 동일합니다.")
+
+
+if __name__ == '__main__':
+    main()
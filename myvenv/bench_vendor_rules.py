@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+IT사용료 서비스명 정규화 벤치마크
+목적: 행 단위 정규화(행마다 normalize_* 호출, 기존 추출 루프 방식), 컬럼 단위 정규화(normalize_*_series),
+      고유 (텍스트, 거래처명) 조합 단위 정규화(NormalizeMemo, 메모 없음 / 이전 실행 메모 있음)의
+      처리 속도(rows/s) 비교 및 결과 동일성 검증
+
+입력은 out/it_usage_details.json 의 원본 적요/거래처명을 지정 행 수만큼 무작위 복원 추출하여 사용
+
+사용 예시:
+  python bench_vendor_rules.py              # 200,000행
+  python bench_vendor_rules.py --rows 1000000
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from normalize_memo import NormalizeMemo
+from vendor_rules import (
+    normalize_it_usage_text, normalize_it_usage_series,
+    normalize_usage_2026_text, normalize_usage_2026_series,
+)
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+
+def load_samples(rows, seed=0):
+    """it_usage_details.json 원본 적요/거래처명 → rows 행 (무작위 복원 추출)"""
+    with open('out/it_usage_details.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    records = [(r['original_text'], r['vendor']) for year in data.values() for r in year]
+    picks = np.random.default_rng(seed).integers(0, len(records), rows)
+    return pd.DataFrame([records[i] for i in picks], columns=['텍스트', '거래처명'])
+
+
+def bench(label, rows, func):
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    print(f"  {label:<28}{seconds:>9.2f}초{rows / seconds:>14,.0f} rows/s")
+    return result, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='IT사용료 서비스명 정규화: 행 단위 vs 컬럼 단위')
+    parser.add_argument('--rows', type=int, default=200_000, help='행 수 (기본값: 200,000)')
+    args = parser.parse_args()
+
+    df = load_samples(args.rows)
+    print(f"{args.rows:,}행 (고유 적요 {df['텍스트'].nunique():,}개)")
+
+    ok = True
+    for label, scalar_func, series_func in [
+        ('extract_it_usage_v2', normalize_it_usage_text, normalize_it_usage_series),
+        ('extract_2026_it_data', normalize_usage_2026_text, normalize_usage_2026_series),
+    ]:
+        print(f"\n[{label}]")
+        row_result, row_sec = bench('행 단위 (루프)', args.rows, lambda: pd.Series(
+            [scalar_func(t, v) for t, v in zip(df['텍스트'], df['거래처명'])]
+        ))
+        col_result, col_sec = bench('컬럼 단위', args.rows, lambda: series_func(df['텍스트'], df['거래처명']))
+        memo = NormalizeMemo(label, series_func, fingerprint='bench', persist=False)
+        memo_result, memo_sec = bench('고유 조합 (메모 없음)', args.rows, lambda: memo.apply(df['텍스트'], df['거래처명']))
+        warm_result, warm_sec = bench('고유 조합 (메모 있음)', args.rows, lambda: memo.apply(df['텍스트'], df['거래처명']))
+        same = all(row_result.equals(r) for r in (col_result, memo_result, warm_result))
+        ok = ok and same
+        print(f"  고유 조합 {memo.distinct // 2:,}개 (중복 제거 {(1 - memo.distinct / memo.rows) * 100:.1f}%)")
+        print(f"  속도 향상: 컬럼 {row_sec / col_sec:.1f}배, 고유 조합 {row_sec / memo_sec:.1f}배, "
+              f"메모 {row_sec / warm_sec:.1f}배, 결과 동일: {'✓' if same else '✗'}")
+
+    if not ok:
+        print("\n❌ 컬럼 단위 결과가 행 단위 결과와 다릅니다!")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@
 import pandas as pd
 import sys
 import io
+from ledger_cache import load_ledger
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -10,7 +11,7 @@ print("📊 202510 데이터 확인")
 print("=" * 80)
 
 # 25년 데이터 읽기
-df = pd.read_excel('25공통비.XLSX')
+df = load_ledger('25공통비.XLSX')
 
 print(f"\n총 행 수: {len(df):,}")
 
@@ -2,8 +2,8 @@
 """
 엑셀 파일 구조 확인 스크립트
 """
-import pandas as pd
 import sys
+from ledger_cache import load_ledger
 
 # 인코딩 설정
 sys.stdout.reconfigure(encoding='utf-8')
@@ -13,7 +13,7 @@ print("=" * 80)
 print("24공통비.XLSX 파일 구조 확인")
 print("=" * 80)
 
-df_24 = pd.read_excel('24공통비.XLSX', sheet_name=0)
+df_24 = load_ledger('24공통비.XLSX')
 print(f"\n총 행 수: {len(df_24)}")
 print(f"총 컬럼 수: {len(df_24.columns)}")
 print(f"\n컬럼 목록:")
@@ -31,7 +31,7 @@ print("\n" + "=" * 80)
 print("25공통비.XLSX 파일 구조 확인")
 print("=" * 80)
 
-df_25 = pd.read_excel('25공통비.XLSX', sheet_name=0)
+df_25 = load_ledger('25공통비.XLSX')
 print(f"\n총 행 수: {len(df_25)}")
 print(f"총 컬럼 수: {len(df_25.columns)}")
 print(f"\n컬럼 목록:")
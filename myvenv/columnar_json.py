@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+대시보드 상세 JSON 컬럼형(columnar) 저장 모듈
+목적: it_usage_details.json / it_maintenance_details.json / commission_details.json 은
+      거래 1건당 dict 하나씩 indent=2 로 저장되어 키 이름과 같은 문자열(서비스명, 거래처명, 코스트센터)이
+      행마다 반복되고, Next.js API(api/it-usage, api/it-maintenance, api/commission)는 요청마다 파일 전체를 다시 파싱함.
+      같은 데이터를 사전 인코딩 컬럼형으로 {이름}.columnar.json 에 함께 저장.
+
+형식 (format: columnar-v1):
+  {
+    "format": "columnar-v1",
+    "string_fields": ["text", "vendor", ...],         # strings 인덱스로 저장한 필드
+    "strings": ["AWS", "아마존웹서비스", ...],        # 문자열 필드 공용 문자열 표
+    "years": {
+      "2025": {"rows": 359,
+               "fields": ["month", "text", ..., "amount"],   # 원본 레코드 키 순서 (연도별로 다를 수 있음)
+               "month": [1, 1, ...],                  # 월은 정수 (1~12)
+               "text": [0, 5, ...], ...,              # 문자열 필드는 strings 인덱스
+               "amount": [1200000.0, ...]}            # 금액은 원본 숫자 그대로
+    }
+  }
+
+사용 예시:
+  from columnar_json import write_columnar
+  write_columnar('out/it_usage_details.json', output_data)   # → out/it_usage_details.columnar.json
+
+  # 기존 JSON 변환 + 크기/파싱 시간 비교 + 복원 검증
+  python columnar_json.py out/it_usage_details.json out/it_maintenance_details.json out/commission_details.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+FORMAT = 'columnar-v1'
+
+# 문자열 표로 인코딩하지 않는 필드
+_MONTH_FIELD = 'month'
+_NUMERIC_FIELDS = ('amount',)
+
+
+def columnar_path(json_path):
+    """out/it_usage_details.json → out/it_usage_details.columnar.json"""
+    path = Path(json_path)
+    return path.with_name(f"{path.stem}.columnar.json")
+
+
+def encode_columnar(data):
+    """
+    연도별 레코드 목록 → 컬럼형 dict
+
+    Parameters:
+    -----------
+    data : dict
+        {연도: [레코드 dict, ...]} (추출 스크립트 출력과 같은 구조, 같은 연도 레코드는 같은 키 집합)
+    """
+    string_fields = []
+    strings = {}
+
+    def codes(values):
+        return [strings.setdefault(value, len(strings)) for value in values]
+
+    years = {}
+    for year, records in data.items():
+        fields = list(records[0]) if records else []
+        string_fields += [f for f in fields
+                          if f != _MONTH_FIELD and f not in _NUMERIC_FIELDS and f not in string_fields]
+        frame = pd.DataFrame(records, columns=fields)
+        if len(frame):
+            invalid = ~frame[_MONTH_FIELD].str.fullmatch(r'\d{2}')
+            if invalid.any():
+                raise ValueError(f"{year}년 month 값이 2자리 숫자가 아닙니다: {frame[_MONTH_FIELD][invalid].unique()[:5]}")
+        year_columns = {'rows': len(frame), 'fields': fields}
+        for field in fields:
+            if field == _MONTH_FIELD:
+                year_columns[field] = frame[field].astype(int).tolist()
+            elif field in _NUMERIC_FIELDS:
+                year_columns[field] = frame[field].tolist()
+            else:
+                year_columns[field] = codes(frame[field].tolist())
+        years[year] = year_columns
+
+    return {
+        'format': FORMAT,
+        'string_fields': string_fields,
+        'strings': list(strings),
+        'years': years,
+    }
+
+
+def decode_columnar(doc):
+    """컬럼형 dict → {연도: [레코드 dict, ...]} (encode_columnar 의 역변환)"""
+    if doc.get('format') != FORMAT:
+        raise ValueError(f"지원하지 않는 형식: {doc.get('format')}")
+    strings = doc['strings']
+    string_fields = set(doc['string_fields'])
+
+    data = {}
+    for year, columns in doc['years'].items():
+        fields = columns['fields']
+        decoded = []
+        for field in fields:
+            values = columns[field]
+            if field == _MONTH_FIELD:
+                decoded.append([f"{m:02d}" for m in values])
+            elif field in string_fields:
+                decoded.append([strings[code] for code in values])
+            else:
+                decoded.append(values)
+        data[year] = [dict(zip(fields, row)) for row in zip(*decoded)]
+    return data
+
+
+def write_columnar(json_path, data):
+    """
+    레코드 JSON 경로 옆에 컬럼형 JSON 저장
+
+    Returns:
+    --------
+    Path : 저장 경로 ({이름}.columnar.json)
+    """
+    output_path = columnar_path(json_path)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(encode_columnar(data), f, ensure_ascii=False, separators=(',', ':'))
+    return output_path
+
+
+def _parse_seconds(path, repeat=5):
+    """json.loads 최소 소요 시간"""
+    text = Path(path).read_text(encoding='utf-8')
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.loads(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='상세 JSON → 컬럼형 JSON 변환 (크기/파싱 시간 비교, 복원 검증)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python columnar_json.py out/it_usage_details.json
+  python columnar_json.py out/it_usage_details.json out/it_maintenance_details.json out/commission_details.json
+        """
+    )
+    parser.add_argument('files', nargs='+', help='레코드 JSON 파일')
+    args = parser.parse_args()
+
+    failed = False
+    for json_path in args.files:
+        if not os.path.exists(json_path):
+            print(f"⚠ 파일을 찾을 수 없습니다: {json_path}")
+            failed = True
+            continue
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        output_path = write_columnar(json_path, data)
+        with open(output_path, 'r', encoding='utf-8') as f:
+            same = decode_columnar(json.load(f)) == data
+
+        before, after = os.path.getsize(json_path), os.path.getsize(output_path)
+        parse_before, parse_after = _parse_seconds(json_path), _parse_seconds(output_path)
+        print(f"{'✓' if same else '❌'} {output_path}")
+        print(f"   크기 {before / 1024:,.0f}KB → {after / 1024:,.0f}KB ({before / after:.1f}배), "
+              f"파싱 {parse_before * 1000:.1f}ms → {parse_after * 1000:.1f}ms ({parse_before / parse_after:.1f}배), "
+              f"복원 {'동일' if same else '불일치'}")
+        failed = failed or not same
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
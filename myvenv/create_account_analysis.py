@@ -2,50 +2,65 @@ import pandas as pd
 import os
 from pathlib import Path
 
+from account_variance import description_changes, top_changes
+from detail_store import has_month as has_detail_month, read_month as read_detail_month
+
+# 상세 저장소에서 읽을 컬럼 (계정명 / 적요 / 금액)
+ANALYSIS_COLUMNS = ['G/L 계정 설명', '텍스트', '금액_정제']
+
 def analyze_account_details(current_month='202510', previous_month='202410'):
     """
     GL 계정별 전년 대비 차이 분석 CSV 생성
+    
+    월별 상세 저장소(out/detail_store)를 읽고, 저장소에 없는 월이면 기존 계정별 CSV 폴더(out/details/YYYYMM/)를 읽음
     """
     
     base_path = Path('out/details')
     current_path = base_path / current_month
     previous_path = base_path / previous_month
+    from_store = has_detail_month(current_month) and has_detail_month(previous_month)
     
-    if not current_path.exists() or not previous_path.exists():
+    if not from_store and (not current_path.exists() or not previous_path.exists()):
         print(f"❌ 경로를 찾을 수 없습니다: {current_path} 또는 {previous_path}")
         return
     
     print(f"📊 분석 시작: {previous_month} vs {current_month}")
     
-    # 모든 CSV 파일 읽기
-    current_data = []
-    previous_data = []
-    
-    # 당년 데이터 읽기
-    print(f"📂 {current_month} 데이터 로드 중...")
-    for folder in current_path.iterdir():
-        if folder.is_dir():
-            for csv_file in folder.glob('*.csv'):
-                try:
-                    df = pd.read_csv(csv_file, encoding='utf-8-sig')
-                    current_data.append(df)
-                except Exception as e:
-                    print(f"⚠️  파일 읽기 실패: {csv_file.name} - {e}")
-    
-    # 전년 데이터 읽기
-    print(f"📂 {previous_month} 데이터 로드 중...")
-    for folder in previous_path.iterdir():
-        if folder.is_dir():
-            for csv_file in folder.glob('*.csv'):
-                try:
-                    df = pd.read_csv(csv_file, encoding='utf-8-sig')
-                    previous_data.append(df)
-                except Exception as e:
-                    print(f"⚠️  파일 읽기 실패: {csv_file.name} - {e}")
-    
-    # 데이터 합치기
-    current_df = pd.concat(current_data, ignore_index=True) if current_data else pd.DataFrame()
-    previous_df = pd.concat(previous_data, ignore_index=True) if previous_data else pd.DataFrame()
+    if from_store:
+        # 월별 상세 저장소에서 분석에 필요한 컬럼만 로드 (빈 적요는 저장소에서 CSV로 읽은 것과 같이 결측으로 반환)
+        print(f"📂 상세 저장소에서 로드: {current_month}, {previous_month}")
+        current_df = read_detail_month(current_month, columns=ANALYSIS_COLUMNS)
+        previous_df = read_detail_month(previous_month, columns=ANALYSIS_COLUMNS)
+    else:
+        # 모든 CSV 파일 읽기
+        current_data = []
+        previous_data = []
+        
+        # 당년 데이터 읽기
+        print(f"📂 {current_month} 데이터 로드 중...")
+        for folder in current_path.iterdir():
+            if folder.is_dir():
+                for csv_file in folder.glob('*.csv'):
+                    try:
+                        df = pd.read_csv(csv_file, encoding='utf-8-sig')
+                        current_data.append(df)
+                    except Exception as e:
+                        print(f"⚠️  파일 읽기 실패: {csv_file.name} - {e}")
+        
+        # 전년 데이터 읽기
+        print(f"📂 {previous_month} 데이터 로드 중...")
+        for folder in previous_path.iterdir():
+            if folder.is_dir():
+                for csv_file in folder.glob('*.csv'):
+                    try:
+                        df = pd.read_csv(csv_file, encoding='utf-8-sig')
+                        previous_data.append(df)
+                    except Exception as e:
+                        print(f"⚠️  파일 읽기 실패: {csv_file.name} - {e}")
+        
+        # 데이터 합치기
+        current_df = pd.concat(current_data, ignore_index=True) if current_data else pd.DataFrame()
+        previous_df = pd.concat(previous_data, ignore_index=True) if previous_data else pd.DataFrame()
     
     print(f"✅ 당년 데이터: {len(current_df):,}건")
     print(f"✅ 전년 데이터: {len(previous_df):,}건")
@@ -53,10 +68,14 @@ def analyze_account_details(current_month='202510', previous_month='202410'):
     # GL 계정별 집계
     print("\n📊 GL 계정별 집계 중...")
     
-    current_by_gl = current_df.groupby('G/L 계정 설명')['금액'].sum().reset_index()
+    # 컬럼명 확인 (상세 데이터는 금액_정제 / 텍스트, 이전 형식은 금액 / 적요)
+    amount_col = '금액_정제' if '금액_정제' in current_df.columns else '금액'
+    text_col = '텍스트' if '텍스트' in current_df.columns else '적요'
+    
+    current_by_gl = current_df.groupby('G/L 계정 설명')[amount_col].sum().reset_index()
     current_by_gl.columns = ['GL계정', '당년금액']
     
-    previous_by_gl = previous_df.groupby('G/L 계정 설명')['금액'].sum().reset_index()
+    previous_by_gl = previous_df.groupby('G/L 계정 설명')[amount_col].sum().reset_index()
     previous_by_gl.columns = ['GL계정', '전년금액']
     
     # 합치기
@@ -81,30 +100,20 @@ def analyze_account_details(current_month='202510', previous_month='202410'):
     # 적요별 상세 분석
     print("\n📝 적요별 상세 분석 중...")
     
+    # 대상 계정 전체의 적요별 집계를 한 번에 계산 (차이는 백만원 반올림 후 50만원 기준)
+    changes = description_changes(current_df, previous_df, accounts=significant['GL계정'],
+                                  text_col=text_col, amount_col=amount_col)
+    changes['차이_백만원'] = changes['차이_백만원'].round(0)
+    top_by_account = top_changes(changes, '차이_백만원', threshold=0.5, top=3)
+    
     gl_descriptions = []
     
     for _, row in significant.iterrows():
         gl_account = row['GL계정']
         
-        # 해당 GL 계정의 적요별 집계
-        current_detail = current_df[current_df['G/L 계정 설명'] == gl_account].groupby('적요')['금액'].sum()
-        previous_detail = previous_df[previous_df['G/L 계정 설명'] == gl_account].groupby('적요')['금액'].sum()
-        
-        # 적요별 차이 계산
-        detail_df = pd.DataFrame({
-            '당년': current_detail,
-            '전년': previous_detail
-        }).fillna(0)
-        detail_df['차이'] = detail_df['당년'] - detail_df['전년']
-        detail_df['차이_백만원'] = (detail_df['차이'] / 1_000_000).round(0)
-        
-        # 50만원 이상 차이나는 적요만
-        significant_desc = detail_df[detail_df['차이_백만원'].abs() >= 0.5].copy()
-        significant_desc = significant_desc.sort_values('차이_백만원', key=abs, ascending=False)
-        
         # 상위 3개 적요
         top_descriptions = []
-        for desc, desc_row in significant_desc.head(3).iterrows():
+        for desc, desc_row in top_by_account.get(gl_account, []):
             if desc and str(desc).strip():
                 sign = '+' if desc_row['차이_백만원'] > 0 else ''
                 top_descriptions.append(f"{desc}({sign}{desc_row['차이_백만원']:.0f}백만원)")
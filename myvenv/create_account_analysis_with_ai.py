@@ -1,11 +1,26 @@
 import pandas as pd
+import argparse
 import os
+import random
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from openai import OpenAI
-from dotenv import load_dotenv
+from openai import OpenAI, APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
 import json
 
+from account_variance import description_changes, top_changes
+from ai_cache import ResponseCache, evict as evict_ai_cache, request_key
+from ai_usage import UsageLog
+from llm_backend import BACKENDS, OpenAIBackend, StubBackend
+from profiling import add_profiling_arguments, profiling_session, span, traced
+
+from detail_store import has_month as has_detail_month, read_month as read_detail_month
+
+# 상세 저장소에서 읽을 컬럼 (계정명 / 적요 / 금액)
+ANALYSIS_COLUMNS = ['G/L 계정 설명', '텍스트', '금액_정제']
+
 # 한글 출력 설정
 if sys.platform == 'win32':
     import codecs
@@ -47,35 +62,163 @@ if not OPENAI_MODEL:
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 # ============================================
 
-if not OPENAI_API_KEY:
-    print("❌ OPENAI_API_KEY를 찾을 수 없습니다!")
-    print("   .env 파일에 OPENAI_API_KEY를 설정해주세요.")
-    print("   예: OPENAI_API_KEY=sk-...")
-    exit(1)
-
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=OPENAI_API_KEY)
+# LLM 백엔드: openai (기본) 또는 stub (네트워크 없는 결정적 응답, --backend stub 또는 LLM_BACKEND=stub)
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'openai')
+backend = None
 model = OPENAI_MODEL
 
-def analyze_with_ai(gl_account, current_amount, previous_amount, change, top_descriptions):
+# 동시 요청 수 / 재시도 설정
+DEFAULT_CONCURRENCY = 4
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# 배치 요청: 계정 여러 개를 한 요청에 묶고 {계정명: 설명} JSON 으로 받음 (1이면 계정별 요청)
+DEFAULT_BATCH_SIZE = 1
+
+# 유의 변동 기준 (|차이| 백만원 이상인 계정만 AI 분석)
+DEFAULT_MIN_CHANGE = 1
+
+SYSTEM_PROMPT = "당신은 재무 분석 전문가입니다. 비용 변동 내역을 간결하고 명확하게 설명합니다."
+REQUEST_PARAMS = {'temperature': 0.3, 'max_tokens': 300}
+
+_print_lock = threading.Lock()
+
+
+def configure_backend(name=None, stub_latency=0.0, stub_per_account_latency=0.0):
     """
-    OpenAI를 사용하여 GL 계정 변동 분석
+    LLM 백엔드 선택
+
+    Parameters:
+    -----------
+    name : str, optional
+        'openai' 또는 'stub' (기본값: 환경변수 LLM_BACKEND, 없으면 openai)
+    stub_latency, stub_per_account_latency : float
+        stub 백엔드의 요청당 / 계정당 지연 초
     """
+    global backend, model
+    name = name or LLM_BACKEND
+    if name == 'stub':
+        backend = StubBackend(latency=stub_latency, per_account_latency=stub_per_account_latency)
+    elif name == 'openai':
+        if not OPENAI_API_KEY:
+            print("❌ OPENAI_API_KEY를 찾을 수 없습니다!")
+            print("   .env 파일에 OPENAI_API_KEY를 설정해주세요.")
+            print("   예: OPENAI_API_KEY=sk-...")
+            print("   키 없이 테스트: --backend stub")
+            exit(1)
+        # OpenAI 클라이언트 초기화 (재시도는 _complete 에서 직접 처리)
+        # 로컬 서버 테스트: OPENAI_BASE_URL=http://127.0.0.1:8765/v1 (stub_llm_server.py)
+        backend = OpenAIBackend(OpenAI(api_key=OPENAI_API_KEY, max_retries=0), OPENAI_MODEL)
+    else:
+        raise ValueError(f"알 수 없는 LLM 백엔드: {name} ({' / '.join(BACKENDS)})")
+    model = backend.model
+    return backend
+
+
+def get_backend():
+    """현재 LLM 백엔드 (선택 전이면 기본값으로 생성)"""
+    return backend or configure_backend()
+
+
+def _is_retryable(error):
+    """재시도할 오류인지 (429 / 5xx / 타임아웃 / 연결 오류)"""
+    if isinstance(error, (RateLimitError, APITimeoutError, APIConnectionError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _retry_delay(error, attempt):
+    """
+    재시도 대기 시간: 서버가 Retry-After 를 주면 그 값, 아니면 지수 백오프 + 지터
+    """
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass
+    delay = min(BACKOFF_BASE_SECONDS * (2 ** attempt), BACKOFF_MAX_SECONDS)
+    return delay * (0.5 + random.random() / 2)
+
+
+def _label(accounts):
+    return str(accounts[0]) if len(accounts) == 1 else f"{accounts[0]} 외 {len(accounts) - 1}개"
+
+
+def _complete(messages, params, accounts, usage=None):
+    """
+    백엔드 요청 (재시도 가능한 오류는 재시도, 최종 실패 시 오류를 올림)
     
-    # 적요 정보 포맷팅
+    accounts : list
+        요청에 든 계정명 (진행 메시지 / 사용량 기록용)
+    usage : UsageLog, optional
+        요청 1건의 토큰 / 지연 시간(재시도 대기 포함) / 재시도 / 성공 여부 기록
+    """
+    label = _label(accounts)
+    attrs = {'accounts': len(accounts)} if len(accounts) > 1 else {}
+    start = time.perf_counter()
+    with span('ai.request', gl_account=label, **attrs) as request_span:
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                result = get_backend().request(messages, **params)
+                request_span.attrs.update(prompt_tokens=result.prompt_tokens, completion_tokens=result.completion_tokens)
+                if usage is not None:
+                    usage.record_call(accounts, time.perf_counter() - start, attempt + 1, 'ok',
+                                      result.prompt_tokens, result.completion_tokens, result.finish_reason)
+                return result.content
+            except Exception as e:
+                request_span.attrs['retries'] = attempt + 1
+                if attempt == MAX_RETRIES or not _is_retryable(e):
+                    if usage is not None:
+                        usage.record_call(accounts, time.perf_counter() - start, attempt + 1, 'error',
+                                          error=type(e).__name__)
+                    raise
+                delay = _retry_delay(e, attempt)
+                with _print_lock:
+                    print(f"   ↻ 재시도 {attempt + 1}/{MAX_RETRIES} ({label}, {delay:.1f}초 후): {type(e).__name__}")
+                time.sleep(delay)
+
+
+def _account_block(gl_account, current_amount, previous_amount, change, top_descriptions):
+    """프롬프트의 계정 정보 부분 (계정명 / 금액 / 주요 적요별 변동)"""
     desc_text = ""
     if top_descriptions:
         desc_text = "\n주요 적요별 변동:\n"
         for desc in top_descriptions:
             desc_text += f"- {desc['적요']}: {desc['차이_백만원']:+.0f}백만원 (당년 {desc['당년_백만원']:.0f}백만원, 전년 {desc['전년_백만원']:.0f}백만원)\n"
     
-    prompt = f"""다음 비용 계정의 전년 대비 변동 내역을 분석하여 간결하고 명확한 설명을 작성해주세요.
-
-**계정명**: {gl_account}
+    return f"""**계정명**: {gl_account}
 **전년 금액**: {previous_amount:.0f}백만원
 **당년 금액**: {current_amount:.0f}백만원
 **차이**: {change:+.0f}백만원
-{desc_text}
+{desc_text}"""
+
+
+def _fallback_description(change, top_descriptions):
+    """AI 분석 실패 시 기본 설명"""
+    direction = "증가" if change >= 0 else "감소"
+    desc_summary = ""
+    if top_descriptions and len(top_descriptions) > 0:
+        desc_list = [f"{d['적요']}({d['차이_백만원']:+.0f}백만원)" for d in top_descriptions[:3]]
+        desc_summary = f" 주요 변동: {', '.join(desc_list)}."
+    return f"전년 대비 {abs(change):.0f}백만원 {direction}.{desc_summary}"
+
+
+def analyze_with_ai(gl_account, current_amount, previous_amount, change, top_descriptions, cache=None, usage=None):
+    """
+    OpenAI를 사용하여 GL 계정 변동 분석
+    
+    cache : ResponseCache, optional
+        같은 요청(모델/프롬프트)의 이전 응답이 있으면 OpenAI를 호출하지 않고 재사용
+    usage : UsageLog, optional
+        요청별 토큰 / 지연 시간 / 재시도와 설명 출처(ai / cache / fallback) 기록
+    """
+    
+    prompt = f"""다음 비용 계정의 전년 대비 변동 내역을 분석하여 간결하고 명확한 설명을 작성해주세요.
+
+{_account_block(gl_account, current_amount, previous_amount, change, top_descriptions)}
 
 **작성 요구사항**:
 1. 구어체가 아닌 간결한 문체로 작성
@@ -92,169 +235,369 @@ def analyze_with_ai(gl_account, current_amount, previous_amount, change, top_des
 - 차이 금액은 반드시 제공된 차이_백만원 값({change:.0f}백만원)을 사용하세요. 절대 다른 숫자를 만들지 마세요.
 """
     
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    params = dict(REQUEST_PARAMS)
+    
+    key = request_key(get_backend().model, messages, **params)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            if usage is not None:
+                usage.record_account(gl_account, change, 'cache')
+            return cached
+    
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "당신은 재무 분석 전문가입니다. 비용 변동 내역을 간결하고 명확하게 설명합니다."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=300
-        )
-        
-        return response.choices[0].message.content.strip()
+        content = _complete(messages, params, [gl_account], usage=usage)
+        # 실패 시 기본 설명은 저장하지 않음 (다음 실행에서 다시 요청)
+        if cache is not None:
+            cache.put(key, content, gl_account=gl_account, model=get_backend().model)
+        if usage is not None:
+            usage.record_account(gl_account, change, 'ai')
+        return content
     
     except Exception as e:
         print(f"⚠️  AI 분석 실패 ({gl_account}): {e}")
-        # 기본 설명 생성
-        direction = "증가" if change >= 0 else "감소"
-        desc_summary = ""
-        if top_descriptions and len(top_descriptions) > 0:
-            desc_list = [f"{d['적요']}({d['차이_백만원']:+.0f}백만원)" for d in top_descriptions[:3]]
-            desc_summary = f" 주요 변동: {', '.join(desc_list)}."
-        return f"전년 대비 {abs(change):.0f}백만원 {direction}.{desc_summary}"
-
-def analyze_account_details(current_month='202512', previous_month='202412'):
+        if usage is not None:
+            usage.record_account(gl_account, change, 'fallback')
+        return _fallback_description(change, top_descriptions)
+
+
+def parse_batch_response(content, accounts):
+    """
+    배치 응답 → {계정명: 설명}
+
+    {계정명: 설명} JSON 객체 (```json 코드 블록 허용) 또는 [{"계정명", "설명"}, ...] 목록을 읽고,
+    요청한 계정 중 비어 있지 않은 설명만 반환 (형식이 틀리면 빈 dict)
+    """
+    text = content.strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1] if '\n' in text else ''
+        text = text.rsplit('```', 1)[0]
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+    if isinstance(data, list):
+        data = {item.get('계정명'): item.get('설명') for item in data if isinstance(item, dict)}
+    if not isinstance(data, dict):
+        return {}
+    wanted = {str(account) for account in accounts}
+    return {str(k): v.strip() for k, v in data.items()
+            if str(k) in wanted and isinstance(v, str) and v.strip()}
+
+
+def analyze_batch_with_ai(jobs, cache=None, usage=None):
+    """
+    여러 GL 계정 변동을 한 요청으로 분석
+    
+    jobs : list
+        [(gl_account, current_amount, previous_amount, change, top_descriptions), ...]
+    cache : ResponseCache, optional
+        계정별로 조회/저장 (배치 구성이 바뀌어도 금액/적요가 같은 계정은 재사용)
+    usage : UsageLog, optional
+        요청별 토큰 / 지연 시간 / 재시도와 계정별 설명 출처 기록
+    
+    Returns:
+    --------
+    list : jobs 순서의 설명. 응답에서 빠진 계정은 계정별 요청(analyze_with_ai)으로,
+           요청 자체가 실패하면 기본 설명으로 대체
+    """
+    params = dict(REQUEST_PARAMS)
+    results = [None] * len(jobs)
+    keys = []
+    pending = []
+    for i, job in enumerate(jobs):
+        key = request_key(get_backend().model, [{"role": "system", "content": SYSTEM_PROMPT},
+                                                {"role": "user", "content": _account_block(*job)}],
+                          mode='batch', **params)
+        keys.append(key)
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            results[i] = cached
+            if usage is not None:
+                usage.record_account(job[0], job[3], 'cache')
+        else:
+            pending.append(i)
+    if not pending:
+        return results
+    
+    blocks = "\n".join(f"### {n}\n{_account_block(*jobs[i])}" for n, i in enumerate(pending, 1))
+    prompt = f"""다음 비용 계정 {len(pending)}개의 전년 대비 변동 내역을 계정별로 분석하여 간결하고 명확한 설명을 작성해주세요.
+
+{blocks}
+
+**작성 요구사항** (계정마다):
+1. 구어체가 아닌 간결한 문체로 작성
+2. **전년 대비 차이 금액을 정확하게 계산하여 먼저 언급** (해당 계정의 차이 값을 그대로 사용)
+3. 주요 변동 항목(적요)을 2-3개 포함하여 구체적으로 설명
+4. 한 문단으로 작성 (2-3문장)
+5. "증가했습니다", "감소했습니다" 같은 구어체 대신 "증가", "감소" 사용
+
+**예시 형식**:
+"전년 대비 50백만원 감소. 주요 변동: 직원식대(-30백만원), 워크샵비용(+20백만원), 회의비(-15백만원)로 전반적인 복리후생 지출 축소."
+
+**중요**: 
+- "절대금액"이라는 표현 대신 "전년 대비"를 사용하세요.
+- 차이 금액은 반드시 계정별로 제공된 차이 값을 사용하세요. 절대 다른 숫자를 만들지 마세요.
+
+**응답 형식**: 다른 문장 없이 JSON 객체 하나로만 답하세요. 키는 위 계정명 그대로, 값은 설명 문자열입니다.
+{{"계정명": "설명", ...}}
+"""
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    batch_params = {**params, 'max_tokens': params['max_tokens'] * len(pending),
+                    'response_format': {'type': 'json_object'}}
+    accounts = [jobs[i][0] for i in pending]
+    
+    try:
+        answers = parse_batch_response(_complete(messages, batch_params, accounts, usage=usage), accounts)
+    except Exception as e:
+        print(f"⚠️  AI 배치 분석 실패 ({_label(accounts)}): {e}")
+        for i in pending:
+            if usage is not None:
+                usage.record_account(jobs[i][0], jobs[i][3], 'fallback')
+            results[i] = _fallback_description(jobs[i][3], jobs[i][4])
+        return results
+    
+    for i in pending:
+        answer = answers.get(str(jobs[i][0]))
+        if answer is None:
+            # 응답에서 빠진 계정은 계정별로 다시 요청
+            with _print_lock:
+                print(f"   ↻ 배치 응답에 없음, 개별 요청: {jobs[i][0]}")
+            results[i] = analyze_with_ai(*jobs[i], cache=cache, usage=usage)
+            continue
+        if cache is not None:
+            cache.put(keys[i], answer, gl_account=jobs[i][0], model=get_backend().model)
+        if usage is not None:
+            usage.record_account(jobs[i][0], jobs[i][3], 'ai')
+        results[i] = answer
+    return results
+
+def describe_accounts(jobs, concurrency=DEFAULT_CONCURRENCY, batch_size=DEFAULT_BATCH_SIZE, use_cache=True,
+                      usage=None):
+    """
+    계정별 AI 설명 요청 (동시 요청 / 배치, 완료 순서대로 진행 상황 출력)
+    
+    jobs : list
+        [(gl_account, current_amount, previous_amount, change, top_descriptions), ...]
+    usage : UsageLog, optional
+        요청별 / 계정별 사용량 기록 (없으면 이번 호출용으로 만들어 요청 수 출력에 사용)
+    
+    Returns:
+    --------
+    list : jobs 순서의 설명
+    """
+    usage = usage if usage is not None else UsageLog()
+    
+    batch_size = max(1, batch_size)
+    batches = [list(range(i, min(i + batch_size, len(jobs)))) for i in range(0, len(jobs), batch_size)]
+    concurrency = max(1, min(concurrency, len(batches) or 1))
+    batch_note = f", 배치 {batch_size}개씩 {len(batches)}건" if batch_size > 1 else ''
+    print(f"\n🤖 OpenAI 분석 시작 (총 {len(jobs)}개 계정, 동시 요청 {concurrency}개{batch_note})...")
+    print("-" * 80)
+    
+    ai_descriptions = [None] * len(jobs)
+    cache = ResponseCache(enabled=use_cache)
+    start = time.perf_counter()
+    before = usage.summary()
+    
+    def run_batch(batch):
+        if batch_size == 1:
+            return [analyze_with_ai(*jobs[batch[0]], cache=cache, usage=usage)]
+        return analyze_batch_with_ai([jobs[i] for i in batch], cache=cache, usage=usage)
+    
+    with span('ai.requests', rows=len(jobs), concurrency=concurrency, batch_size=batch_size), \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(run_batch, batch): batch for batch in batches}
+        for done, future in enumerate(as_completed(futures), 1):
+            batch = futures[future]
+            for i, description in zip(batch, future.result()):
+                ai_descriptions[i] = description
+            name = _label([jobs[i][0] for i in batch])
+            with _print_lock:
+                print(f"[{done}/{len(batches)}] ✅ {name} ({time.perf_counter() - start:.1f}초 경과)")
+    
+    after = usage.summary()
+    print(f"\n✓ LLM 요청 {after['requests'] - before['requests']}회 "
+          f"(재시도 {after['retries'] - before['retries']}회, 계정 {len(jobs)}개, {time.perf_counter() - start:.1f}초)")
+    if use_cache:
+        print(f"\n✓ {cache.summary()}")
+        removed = evict_ai_cache()
+        if removed:
+            print(f"✓ 오래된 캐시 {removed}개 정리")
+    
+    return ai_descriptions
+
+@traced('ai.analyze_account_details')
+def analyze_account_details(current_month='202512', previous_month='202412', current_df=None, previous_df=None,
+                            concurrency=DEFAULT_CONCURRENCY, use_cache=True, batch_size=DEFAULT_BATCH_SIZE,
+                            min_change=DEFAULT_MIN_CHANGE):
     """
     GL 계정별 전년 대비 차이 분석 CSV 생성 (OpenAI 사용)
+    
+    concurrency : int
+        동시에 보낼 OpenAI 요청 수 (기본값: 4, 1이면 순차 처리). 결과 순서는 동시 처리 여부와 관계없이 동일
+    
+    batch_size : int
+        한 요청에 묶을 계정 수 (기본값: 1 = 계정별 요청). 2 이상이면 요청 수가 약 1/batch_size 로 줄어듦
+    
+    min_change : float
+        AI 분석 대상 유의 변동 기준 (|차이| 백만원, 기본값: 1)
+    
+    use_cache : bool
+        응답 캐시(out/.ai_cache) 사용 여부 - 금액/적요가 지난 실행과 같은 계정은 OpenAI를 다시 호출하지 않음
+    
+    current_df, previous_df : pd.DataFrame, optional
+        create_detail_data_for_month 결과 (파이프라인에서 전달 시 out/details 폴더를 다시 읽지 않음)
+    
+    전달된 데이터가 없으면 월별 상세 저장소(out/detail_store)를 읽고,
+    저장소에 없는 월이면 기존 계정별 CSV 폴더(out/details/YYYYMM/)를 읽음
+    
+    요청별 토큰 / 지연 시간 / 재시도 / 기본 설명 사용 내역은 out/gl_account_analysis_ai_usage.json 에 저장
     """
     
+    llm = get_backend()
+    
     base_path = Path('out/details')
     current_path = base_path / current_month
     previous_path = base_path / previous_month
+    preloaded = current_df is not None and previous_df is not None
+    from_store = not preloaded and has_detail_month(current_month) and has_detail_month(previous_month)
     
-    if not current_path.exists() or not previous_path.exists():
+    if not preloaded and not from_store and (not current_path.exists() or not previous_path.exists()):
         print(f"❌ 경로를 찾을 수 없습니다: {current_path} 또는 {previous_path}")
         return
     
     print("=" * 80)
     print(f"🤖 OpenAI 기반 GL 계정 분석 시작")
     print(f"📅 비교 기간: {previous_month} vs {current_month}")
-    print(f"🔧 사용 모델: {model}")
+    print(f"🔧 사용 모델: {llm.model}" + (f" ({llm.name} 백엔드)" if llm.name != 'openai' else ''))
     print("=" * 80)
     
-    # 모든 CSV 파일 읽기
-    current_data = []
-    previous_data = []
-    
-    # 당년 데이터 읽기
-    print(f"\n📂 {current_month} 데이터 로드 중...")
-    for folder in current_path.iterdir():
-        if folder.is_dir():
-            for csv_file in folder.glob('*.csv'):
-                try:
-                    df = pd.read_csv(csv_file, encoding='utf-8-sig')
-                    current_data.append(df)
-                except Exception as e:
-                    print(f"⚠️  파일 읽기 실패: {csv_file.name}")
-    
-    # 전년 데이터 읽기
-    print(f"📂 {previous_month} 데이터 로드 중...")
-    for folder in previous_path.iterdir():
-        if folder.is_dir():
-            for csv_file in folder.glob('*.csv'):
-                try:
-                    df = pd.read_csv(csv_file, encoding='utf-8-sig')
-                    previous_data.append(df)
-                except Exception as e:
-                    print(f"⚠️  파일 읽기 실패: {csv_file.name}")
-    
-    # 데이터 합치기
-    current_df = pd.concat(current_data, ignore_index=True) if current_data else pd.DataFrame()
-    previous_df = pd.concat(previous_data, ignore_index=True) if previous_data else pd.DataFrame()
+    with span('ai.load', month=current_month) as load_span:
+        if preloaded:
+            # CSV로 저장 후 다시 읽은 것과 같은 결과가 나오도록 빈 적요는 결측으로 처리
+            print(f"\n📂 로드된 상세 데이터 사용: {current_month}, {previous_month}")
+            current_df = current_df.replace({'텍스트': {'': None}})
+            previous_df = previous_df.replace({'텍스트': {'': None}})
+        elif from_store:
+            # 월별 상세 저장소(out/detail_store)에서 분석에 필요한 컬럼만 로드 (빈 적요는 저장소에서 결측으로 반환)
+            print(f"\n📂 상세 저장소에서 로드: {current_month}, {previous_month}")
+            current_df = read_detail_month(current_month, columns=ANALYSIS_COLUMNS)
+            previous_df = read_detail_month(previous_month, columns=ANALYSIS_COLUMNS)
+        else:
+            # 모든 CSV 파일 읽기
+            current_data = []
+            previous_data = []
+        
+            # 당년 데이터 읽기
+            print(f"\n📂 {current_month} 데이터 로드 중...")
+            for folder in current_path.iterdir():
+                if folder.is_dir():
+                    for csv_file in folder.glob('*.csv'):
+                        try:
+                            df = pd.read_csv(csv_file, encoding='utf-8-sig')
+                            current_data.append(df)
+                        except Exception:
+                            print(f"⚠️  파일 읽기 실패: {csv_file.name}")
+        
+            # 전년 데이터 읽기
+            print(f"📂 {previous_month} 데이터 로드 중...")
+            for folder in previous_path.iterdir():
+                if folder.is_dir():
+                    for csv_file in folder.glob('*.csv'):
+                        try:
+                            df = pd.read_csv(csv_file, encoding='utf-8-sig')
+                            previous_data.append(df)
+                        except Exception:
+                            print(f"⚠️  파일 읽기 실패: {csv_file.name}")
+        
+            # 데이터 합치기
+            current_df = pd.concat(current_data, ignore_index=True) if current_data else pd.DataFrame()
+            previous_df = pd.concat(previous_data, ignore_index=True) if previous_data else pd.DataFrame()
     
+        load_span.rows = len(current_df) + len(previous_df)
     print(f"✅ 당년 데이터: {len(current_df):,}건")
     print(f"✅ 전년 데이터: {len(previous_df):,}건")
     
     # GL 계정별 집계
     print("\n📊 GL 계정별 집계 중...")
     
-    # 컬럼명 확인 (금액 컬럼)
-    amount_col = '금액_정제' if '금액_정제' in current_df.columns else '금액'
-    desc_col = 'G/L 계정 설명'
-    text_col = '텍스트' if '텍스트' in current_df.columns else '적요'
+    with span('ai.aggregate', rows=len(current_df) + len(previous_df)):
+        # 컬럼명 확인 (금액 컬럼)
+        amount_col = '금액_정제' if '금액_정제' in current_df.columns else '금액'
+        desc_col = 'G/L 계정 설명'
+        text_col = '텍스트' if '텍스트' in current_df.columns else '적요'
     
-    current_by_gl = current_df.groupby(desc_col)[amount_col].sum().reset_index()
-    current_by_gl.columns = ['GL계정', '당년금액']
+        current_by_gl = current_df.groupby(desc_col)[amount_col].sum().reset_index()
+        current_by_gl.columns = ['GL계정', '당년금액']
     
-    previous_by_gl = previous_df.groupby(desc_col)[amount_col].sum().reset_index()
-    previous_by_gl.columns = ['GL계정', '전년금액']
+        previous_by_gl = previous_df.groupby(desc_col)[amount_col].sum().reset_index()
+        previous_by_gl.columns = ['GL계정', '전년금액']
     
-    # 합치기
-    analysis = pd.merge(current_by_gl, previous_by_gl, on='GL계정', how='outer').fillna(0)
-    analysis['차이'] = analysis['당년금액'] - analysis['전년금액']
-    analysis['당년금액_백만원'] = (analysis['당년금액'] / 1_000_000)
-    analysis['전년금액_백만원'] = (analysis['전년금액'] / 1_000_000)
-    analysis['차이_백만원'] = (analysis['차이'] / 1_000_000)
+        # 합치기
+        analysis = pd.merge(current_by_gl, previous_by_gl, on='GL계정', how='outer').fillna(0)
+        analysis['차이'] = analysis['당년금액'] - analysis['전년금액']
+        analysis['당년금액_백만원'] = (analysis['당년금액'] / 1_000_000)
+        analysis['전년금액_백만원'] = (analysis['전년금액'] / 1_000_000)
+        analysis['차이_백만원'] = (analysis['차이'] / 1_000_000)
     
-    # 100만원 이상 차이나는 항목만
-    significant = analysis[analysis['차이_백만원'].abs() >= 1].copy()
-    significant = significant.sort_values('차이_백만원', key=abs, ascending=False)
+        # 100만원(min_change) 이상 차이나는 항목만
+        significant = analysis[analysis['차이_백만원'].abs() >= min_change].copy()
+        significant = significant.sort_values('차이_백만원', key=abs, ascending=False)
     
-    print(f"✅ 총 {len(analysis)}개 GL 계정 중 {len(significant)}개 유의미한 변동")
+        print(f"✅ 총 {len(analysis)}개 GL 계정 중 {len(significant)}개 유의미한 변동")
     
-    # AI 분석 시작
-    print(f"\n🤖 OpenAI 분석 시작 (총 {len(significant)}개 계정)...")
-    print("-" * 80)
-    
-    gl_descriptions = []
-    
-    # 컬럼명 저장
-    _desc_col = desc_col
-    _amount_col = amount_col
-    _text_col = text_col
+        # 컬럼명 저장
+        _desc_col = desc_col
+        _amount_col = amount_col
+        _text_col = text_col
     
-    for idx, (_, row) in enumerate(significant.iterrows(), 1):
-        gl_account = row['GL계정']
-        
-        print(f"[{idx}/{len(significant)}] 분석 중: {gl_account}...", end=" ")
-        
-        # 해당 GL 계정의 적요별 집계
-        current_detail = current_df[current_df[_desc_col] == gl_account].groupby(_text_col)[_amount_col].sum()
-        previous_detail = previous_df[previous_df[_desc_col] == gl_account].groupby(_text_col)[_amount_col].sum()
-        
-        # 적요별 차이 계산
-        detail_df = pd.DataFrame({
-            '당년': current_detail,
-            '전년': previous_detail
-        }).fillna(0)
-        detail_df['차이'] = detail_df['당년'] - detail_df['전년']
-        detail_df['차이_백만원'] = (detail_df['차이'] / 1_000_000)
-        detail_df['당년_백만원'] = (detail_df['당년'] / 1_000_000)
-        detail_df['전년_백만원'] = (detail_df['전년'] / 1_000_000)
+        # 계정별 적요 변동 정리 (AI 요청 준비) - 대상 계정 전체의 적요별 집계를 한 번에 계산
+        changes = description_changes(current_df, previous_df, accounts=significant['GL계정'],
+                                      desc_col=_desc_col, text_col=_text_col, amount_col=_amount_col)
+        # 50만원 이상 차이나는 적요 중 상위 5개
+        top_by_account = top_changes(changes, '차이_백만원', threshold=0.5, top=5)
         
-        # 50만원 이상 차이나는 적요만
-        significant_desc = detail_df[detail_df['차이_백만원'].abs() >= 0.5].copy()
-        significant_desc = significant_desc.sort_values('차이_백만원', key=abs, ascending=False)
-        
-        # 상위 5개 적요
-        top_descriptions = []
-        for desc, desc_row in significant_desc.head(5).iterrows():
-            if desc and str(desc).strip():
-                top_descriptions.append({
-                    '적요': str(desc),
-                    '차이_백만원': desc_row['차이_백만원'],
-                    '당년_백만원': desc_row['당년_백만원'],
-                    '전년_백만원': desc_row['전년_백만원']
-                })
-        
-        # OpenAI로 분석
-        ai_description = analyze_with_ai(
-            gl_account,
-            row['당년금액_백만원'],
-            row['전년금액_백만원'],
-            row['차이_백만원'],
-            top_descriptions
-        )
-        
-        print("✅")
+        jobs = []
+        for _, row in significant.iterrows():
+            gl_account = row['GL계정']
+            top_descriptions = []
+            for desc, desc_row in top_by_account.get(gl_account, []):
+                if desc and str(desc).strip():
+                    top_descriptions.append({
+                        '적요': str(desc),
+                        '차이_백만원': desc_row['차이_백만원'],
+                        '당년_백만원': desc_row['당년_백만원'],
+                        '전년_백만원': desc_row['전년_백만원']
+                    })
         
+            jobs.append((gl_account, row['당년금액_백만원'], row['전년금액_백만원'], row['차이_백만원'], top_descriptions))
+    
+    usage = UsageLog(backend=llm.name, model=llm.model, current_month=current_month, previous_month=previous_month,
+                     concurrency=concurrency, batch_size=batch_size, max_tokens=REQUEST_PARAMS['max_tokens'],
+                     min_change=min_change, significant_accounts=len(significant), total_accounts=len(analysis))
+    start = time.perf_counter()
+    ai_descriptions = describe_accounts(jobs, concurrency=concurrency, batch_size=batch_size, use_cache=use_cache,
+                                        usage=usage)
+    usage.print_summary()
+    usage_path = usage.write(Path('out') / 'gl_account_analysis_ai_usage.json',
+                             wall_seconds=time.perf_counter() - start)
+    print(f"✓ 요청 사용량 보고서: {usage_path}")
+    
+    gl_descriptions = []
+    for (gl_account, current_amount, previous_amount, change, _), ai_description in zip(jobs, ai_descriptions):
         gl_descriptions.append({
             'GL계정': gl_account,
-            '당년_백만원': round(row['당년금액_백만원'], 0),
-            '전년_백만원': round(row['전년금액_백만원'], 0),
-            '차이_백만원': round(row['차이_백만원'], 0),
+            '당년_백만원': round(current_amount, 0),
+            '전년_백만원': round(previous_amount, 0),
+            '차이_백만원': round(change, 0),
             '설명': ai_description
         })
     
@@ -278,7 +621,33 @@ def analyze_account_details(current_month='202512', previous_month='202412'):
     return result_df
 
 if __name__ == '__main__':
-    result = analyze_account_details()
+    parser = argparse.ArgumentParser(description='GL 계정별 전년 대비 차이 분석 (OpenAI)')
+    parser.add_argument('--current', default='202512', help='당년 월 (기본값: 202512)')
+    parser.add_argument('--previous', default='202412', help='전년 월 (기본값: 202412)')
+    parser.add_argument('--concurrency', '-c', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'동시 OpenAI 요청 수 (기본값: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--no-cache', action='store_true', help='응답 캐시를 사용하지 않고 모든 계정을 다시 요청')
+    parser.add_argument('--batch-size', '-b', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'한 요청에 묶을 계정 수 (기본값: {DEFAULT_BATCH_SIZE} = 계정별 요청)')
+    parser.add_argument('--max-tokens', type=int, default=REQUEST_PARAMS['max_tokens'],
+                        help=f"계정당 최대 출력 토큰 (기본값: {REQUEST_PARAMS['max_tokens']})")
+    parser.add_argument('--min-change', type=float, default=DEFAULT_MIN_CHANGE,
+                        help=f'AI 분석 대상 유의 변동 기준 |차이| 백만원 (기본값: {DEFAULT_MIN_CHANGE})')
+    parser.add_argument('--backend', choices=BACKENDS, default=LLM_BACKEND,
+                        help=f'LLM 백엔드 (기본값: {LLM_BACKEND}, stub = 키/네트워크 없는 결정적 응답)')
+    parser.add_argument('--stub-latency', type=float, default=0.0, help='stub 백엔드 요청당 지연 초 (기본값: 0)')
+    parser.add_argument('--stub-per-account-latency', type=float, default=0.0,
+                        help='stub 백엔드 계정당 추가 지연 초 (기본값: 0)')
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    
+    REQUEST_PARAMS['max_tokens'] = args.max_tokens
+    configure_backend(args.backend, stub_latency=args.stub_latency,
+                      stub_per_account_latency=args.stub_per_account_latency)
+    with profiling_session(args):
+        result = analyze_account_details(args.current, args.previous, concurrency=args.concurrency,
+                                         use_cache=not args.no_cache, batch_size=args.batch_size,
+                                         min_change=args.min_change)
     
     if result is not None:
         print("\n" + "=" * 80)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+상세 데이터 생성 (여러 월 일괄)
+목적: create_detail_2024xx.py / create_detail_2025xx.py 처럼 월마다 스크립트를 복사해 원장을 다시 읽는 대신,
+      요청한 월 목록(또는 범위)을 원장별로 묶어 원장당 한 번만 읽고, 연월 groupby 한 번으로 나눠
+      월별 상세 데이터(detail_YYYYMM_all.csv + 계정별 CSV + out/detail_store/YYYYMM.parquet)를 생성. 월별 소요 시간 출력.
+
+사용 예시:
+  python create_detail.py --months 202512 202412
+  python create_detail.py --months 202501-202512          # 범위 (양 끝 포함)
+  python create_detail.py --months 202411 202511 202512 --no-per-gl-csv
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+
+from ledger_cache import load_ledger
+from normalize import normalize_yyyymm_series
+from periods import parse_months
+from create_detail_data import create_detail_data_for_month
+from profiling import add_profiling_arguments, profiling_session, span, traced
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+
+def ledger_year(file_path):
+    """원장 파일명에서 연도 추출 (예: 25공통비.XLSX → '2025')"""
+    match = re.match(r'(\d{2})', os.path.basename(file_path))
+    return f"20{match.group(1)}" if match else None
+
+
+def default_ledger_file(year):
+    """연도별 기본 원장 파일명 (예: '2025' → '25공통비.XLSX')"""
+    return f"{year[2:]}공통비.XLSX"
+
+
+def group_months_by_ledger(months, files=None):
+    """
+    월 → 원장 파일 매핑 (원장 파일명 연도 기준)
+
+    Returns:
+    --------
+    OrderedDict : {원장 파일: [월, ...]}, list : 원장을 찾지 못한 월
+    """
+    ledgers_by_year = {ledger_year(f): f for f in files} if files else {}
+    by_file = OrderedDict()
+    missing = []
+    for month in months:
+        file_path = ledgers_by_year.get(month[:4]) if files else default_ledger_file(month[:4])
+        if file_path is None:
+            missing.append(month)
+            continue
+        by_file.setdefault(file_path, []).append(month)
+    return by_file, missing
+
+
+@traced('detail.create_details')
+def create_details(months, files=None, output_dir='./out/details', ledgers=None, use_cache=True,
+                   store_dir=None, per_gl_csv=True):
+    """
+    여러 월 상세 데이터 일괄 생성 (원장당 1회 로드 + 연월 groupby 1회)
+
+    Parameters:
+    -----------
+    months : list
+        대상 월 목록 (YYYYMM)
+    files : list, optional
+        원장 파일 목록 (없으면 월 연도 기준 '{YY}공통비.XLSX')
+    output_dir : str
+        출력 디렉토리 (기본값: ./out/details)
+    ledgers : dict, optional
+        {파일 경로: 로드된 원장 DataFrame} - 있으면 해당 파일은 다시 읽지 않음
+    use_cache : bool
+        원장 캐시(Parquet 스냅샷) 사용 여부
+    store_dir, per_gl_csv :
+        create_detail_data_for_month 와 동일
+
+    Returns:
+    --------
+    dict : {월: 상세 DataFrame 또는 None(데이터 없음)}
+    """
+    ledgers = ledgers or {}
+    by_file, missing = group_months_by_ledger(months, files or (list(ledgers) or None))
+    for month in missing:
+        print(f"⚠ {month}월 원장이 없습니다. 건너뜀")
+
+    results = {}
+    timings = []
+
+    for file_path, file_months in by_file.items():
+        if file_path not in ledgers and not os.path.exists(file_path):
+            print(f"⚠ 파일을 찾을 수 없습니다: {file_path} ({', '.join(file_months)}월 건너뜀)")
+            continue
+
+        print(f"\n{'#'*80}")
+        print(f"원장: {file_path} → {', '.join(file_months)}월")
+        print(f"{'#'*80}")
+
+        start = time.perf_counter()
+        with span('detail.split_ledger', file=os.path.basename(file_path)) as s:
+            df = ledgers.get(file_path)
+            if df is None:
+                df = load_ledger(file_path, use_cache=use_cache)
+            # 연월 정규화 + 분할은 원장당 한 번만
+            positions = df.groupby(normalize_yyyymm_series(df['연도/월']).to_numpy(), sort=False).indices
+            s.rows = len(df)
+        split_seconds = time.perf_counter() - start
+        print(f"   ✓ 로드 + 연월 분할 {split_seconds:.2f}초 ({len(df):,}행, {len(positions)}개월)")
+        timings.append((f"({os.path.basename(file_path)} 로드)", len(df), split_seconds))
+
+        for month in file_months:
+            month_start = time.perf_counter()
+            month_df = df.iloc[positions[month]] if month in positions else df.iloc[0:0]
+            results[month] = create_detail_data_for_month(
+                file_path, month, output_dir=output_dir, df=month_df,
+                store_dir=store_dir, per_gl_csv=per_gl_csv
+            )
+            timings.append((month, len(month_df), time.perf_counter() - month_start))
+
+    print(f"\n{'='*80}")
+    print("월별 소요 시간")
+    print(f"{'='*80}")
+    for label, rows, seconds in timings:
+        print(f"  {label:<24} {rows:>10,}행 {seconds:8.2f}초")
+    print(f"  {'합계':<26} {sum(t[2] for t in timings):19.2f}초")
+
+    return results
+
+
+def main():
+    """
+    메인 함수: CLI 인터페이스
+    """
+    parser = argparse.ArgumentParser(
+        description='공통부서비용 상세 데이터 생성 (여러 월 일괄, 원장당 1회 로드)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  # 2025년 12월 + 전년 동월
+  python create_detail.py --months 202512 202412
+
+  # 범위 지정 (양 끝 포함)
+  python create_detail.py --months 202501-202512
+
+  # 원장 파일 직접 지정
+  python create_detail.py --months 202411 202511 --files 24공통비.XLSX 25공통비.XLSX
+
+  # 구간별 소요 시간 트레이스(JSON) 저장
+  python create_detail.py --months 202512 202412 --trace out/trace_detail.json
+        """
+    )
+    parser.add_argument('--months', '-m', nargs='+', required=True, help='대상 월 (YYYYMM 또는 YYYYMM-YYYYMM)')
+    parser.add_argument('--files', '-i', nargs='+', help='원장 엑셀 파일 목록 (기본값: 월 연도 기준 {YY}공통비.XLSX)')
+    parser.add_argument('--outdir', '-o', default='./out/details', help='출력 디렉토리 (기본값: ./out/details)')
+    parser.add_argument('--no-per-gl-csv', dest='per_gl_csv', action='store_false',
+                        help='계정별 CSV(out/details/YYYYMM/...) 생성 생략 (대시보드 상세/월별 분석 API는 이 폴더를 읽음)')
+    parser.add_argument('--no-cache', action='store_true', help='원장 캐시를 사용하지 않고 엑셀을 직접 파싱')
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        months = parse_months(args.months)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print(f"공통부서비용 상세 데이터 생성 ({', '.join(months)})")
+    print("=" * 80)
+
+    with profiling_session(args):
+        results = create_details(months, files=args.files, output_dir=args.outdir,
+                                 use_cache=not args.no_cache, per_gl_csv=args.per_gl_csv)
+
+    created = [m for m in months if results.get(m) is not None]
+    print(f"\n{'='*80}")
+    print(f"✅ 상세 데이터 생성 완료: {len(created)}/{len(months)}개월")
+    print(f"{'='*80}")
+    for month in created:
+        print(f"  - {args.outdir}/detail_{month}_all.csv ({len(results[month]):,}건)")
+
+    if len(created) < len(months):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
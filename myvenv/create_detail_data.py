@@ -3,50 +3,31 @@
 특정 월의 상세 데이터 생성 스크립트
 목적: 계정별 거래 상세 내역(적요 포함)을 CSV로 저장
 """
-import pandas as pd
-import numpy as np
 import sys
 import os
 from pathlib import Path
-import re
+
+from ledger_cache import load_ledger
+from normalize import clean_amount_series, normalize_yyyymm_series
+from ledger_stream import stream_month_rows
+from detail_search import build_index as build_search_index
+from detail_store import write_month as write_detail_month
+from profiling import span, traced
 
 # 인코딩 설정
 sys.stdout.reconfigure(encoding='utf-8')
 
 
-def clean_amount(value):
-    """금액 데이터 정제"""
-    if pd.isna(value):
-        return 0
-    
-    if isinstance(value, (int, float)):
-        return float(value)
-    
-    value = str(value).strip()
-    value = value.replace(',', '').replace(' ', '').replace('-', '').replace('_', '')
-    value = re.sub(r'[^\d.-]', '', value)
-    
-    try:
-        return float(value) if value else 0
-    except:
-        return 0
-
-
-def normalize_yyyymm(value):
-    """연도/월 정규화"""
-    if pd.isna(value):
-        return None
-    
-    value = str(value).strip()
-    value = value.replace('/', '').replace('-', '')
-    
-    if len(value) >= 6:
-        return value[:6]
-    
-    return None
+# 상세 데이터에 필요한 원장 컬럼 (스트리밍 모드에서 이 컬럼만 읽음)
+DETAIL_SOURCE_COLUMNS = [
+    '연도/월', '금액(현지 통화)', '계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명',
+    '코스트 센터', '코스트센터명', '전표 번호', '전기일', '증빙일', '텍스트', '거래처명', '공급업체', '차변/대변지시자'
+]
 
 
-def create_detail_data_for_month(input_file, target_month, output_dir='./out/details'):
+@traced('detail.create_detail_data_for_month')
+def create_detail_data_for_month(input_file, target_month, output_dir='./out/details', df=None, streaming=False,
+                                 store_dir=None, per_gl_csv=True):
     """
     특정 월의 상세 데이터 생성
     
@@ -58,23 +39,42 @@ def create_detail_data_for_month(input_file, target_month, output_dir='./out/det
         대상 월 (YYYYMM 형식, 예: '202410')
     output_dir : str
         출력 디렉토리
+    df : pd.DataFrame, optional
+        이미 로드된 원장 (파이프라인에서 전달 시 엑셀을 다시 읽지 않음, 원본은 변경하지 않음)
+    streaming : bool
+        True면 엑셀을 청크 단위로 읽으며 대상 월 행 + 필요한 컬럼만 메모리에 유지 (ledger_stream.py)
+    store_dir : str, optional
+        월별 상세 저장소 디렉토리 (기본값: output_dir 옆 detail_store, 예: ./out/detail_store)
+    per_gl_csv : bool
+        True면 계정별 CSV(output_dir/YYYYMM/대분류_중분류/GL_*.csv)도 생성 (기본값: True,
+        대시보드 account-detail-analysis / insights 월별 분석 API가 이 폴더를 읽음)
     """
     print(f"\n{'='*80}")
     print(f"상세 데이터 생성: {input_file} - {target_month}월")
     print(f"{'='*80}\n")
     
     # 1. 데이터 읽기
-    print("1. 엑셀 파일 읽는 중...")
-    df = pd.read_excel(input_file, sheet_name=0)
+    with span('detail.load', file=os.path.basename(input_file)) as s:
+        if df is None and streaming:
+            print(f"1. 엑셀 스트리밍 읽는 중 ({target_month}월 행, 필요한 컬럼만)...")
+            df = stream_month_rows(input_file, target_month, DETAIL_SOURCE_COLUMNS)
+        elif df is None:
+            print("1. 엑셀 파일 읽는 중...")
+            df = load_ledger(input_file, sheet_name=0)
+        else:
+            print("1. 로드된 원장 사용...")
+        s.rows = len(df)
     print(f"   ✓ 총 {len(df):,}개 행 로드됨")
     
     # 2. 연도/월 정규화
     print("\n2. 연도/월 정규화 중...")
-    df['YYYYMM'] = df['연도/월'].apply(normalize_yyyymm)
-    
-    # 3. 해당 월 데이터만 필터링
-    print(f"\n3. {target_month}월 데이터 필터링 중...")
-    df_month = df[df['YYYYMM'] == target_month].copy()
+    with span('detail.filter_month', rows=len(df), month=target_month):
+        yyyymm = normalize_yyyymm_series(df['연도/월'])
+        
+        # 3. 해당 월 데이터만 필터링
+        print(f"\n3. {target_month}월 데이터 필터링 중...")
+        df_month = df[yyyymm == target_month].copy()
+        df_month['YYYYMM'] = target_month
     print(f"   ✓ {len(df_month):,}개 행 추출됨")
     
     if len(df_month) == 0:
@@ -83,7 +83,7 @@ def create_detail_data_for_month(input_file, target_month, output_dir='./out/det
     
     # 4. 금액 정제
     print("\n4. 금액 데이터 정제 중...")
-    df_month['금액_정제'] = df_month['금액(현지 통화)'].apply(clean_amount)
+    df_month['금액_정제'] = clean_amount_series(df_month['금액(현지 통화)'])
     
     # 5. 필요한 컬럼만 선택 및 정리
     print("\n5. 필요한 컬럼 선택 중...")
@@ -126,30 +126,47 @@ def create_detail_data_for_month(input_file, target_month, output_dir='./out/det
     # 9. 전체 상세 데이터 저장
     output_file_all = os.path.join(output_dir, f'detail_{target_month}_all.csv')
     print(f"\n6. 전체 상세 데이터 저장 중: {output_file_all}")
-    df_detail.to_csv(output_file_all, encoding='utf-8-sig', index=False)
+    with span('detail.to_csv', rows=len(df_detail), month=target_month):
+        df_detail.to_csv(output_file_all, encoding='utf-8-sig', index=False)
     print(f"   ✓ 저장 완료! ({len(df_detail):,}개 행)")
     
-    # 10. 계정별로 분리 저장
-    print(f"\n7. 계정별 파일 생성 중...")
-    
-    gl_groups = df_detail.groupby(['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명'])
-    gl_count = 0
-    
-    for (대분류, 중분류, gl_cd, gl_nm), group_df in gl_groups:
-        # 계정별 디렉토리 생성
-        gl_dir = os.path.join(output_dir, target_month, f"{대분류}_{중분류}")
-        Path(gl_dir).mkdir(parents=True, exist_ok=True)
+    # 10. 월별 상세 저장소 저장 (G/L 계정 순 정렬, 분석 스크립트는 이 파일을 읽음)
+    store_dir = store_dir or os.path.join(os.path.dirname(os.path.normpath(output_dir)), 'detail_store')
+    print(f"\n7. 상세 저장소 저장 중: {store_dir}")
+    with span('detail.store', rows=len(df_detail), month=target_month):
+        store_file = write_detail_month(df_detail, target_month, store_dir=store_dir)
+    gl_count = df_detail.groupby(['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명']).ngroups
+    print(f"   ✓ {store_file} ({gl_count}개 계정)")
+    
+    # 텍스트 / 거래처명 검색 색인 (실패해도 상세 데이터 생성은 계속, 검색은 컬럼 전체 비교로 대체됨)
+    with span('detail.search_index', rows=len(df_detail), month=target_month):
+        try:
+            index_file = build_search_index(target_month, store_dir=store_dir)
+            print(f"   ✓ 검색 색인: {index_file}")
+        except Exception as e:
+            print(f"   ⚠ 검색 색인 생성 실패: {e}")
+    
+    # 11. 계정별 CSV 분리 저장 (대시보드 API용)
+    if per_gl_csv:
+        print(f"\n8. 계정별 파일 생성 중...")
         
-        # 파일명: GL코드_계정명.csv
-        safe_gl_nm = gl_nm.replace('/', '_').replace('\\', '_').replace(':', '_')
-        output_file_gl = os.path.join(gl_dir, f"GL_{gl_cd}_{safe_gl_nm}.csv")
+        gl_groups = df_detail.groupby(['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명'])
         
-        group_df.to_csv(output_file_gl, encoding='utf-8-sig', index=False)
-        gl_count += 1
-    
-    print(f"   ✓ {gl_count}개 계정별 파일 생성 완료!")
+        with span('detail.per_gl_csv', rows=len(df_detail), month=target_month):
+            for (대분류, 중분류, gl_cd, gl_nm), group_df in gl_groups:
+                # 계정별 디렉토리 생성
+                gl_dir = os.path.join(output_dir, target_month, f"{대분류}_{중분류}")
+                Path(gl_dir).mkdir(parents=True, exist_ok=True)
+                
+                # 파일명: GL코드_계정명.csv
+                safe_gl_nm = gl_nm.replace('/', '_').replace('\\', '_').replace(':', '_')
+                output_file_gl = os.path.join(gl_dir, f"GL_{gl_cd}_{safe_gl_nm}.csv")
+                
+                group_df.to_csv(output_file_gl, encoding='utf-8-sig', index=False)
+        
+        print(f"   ✓ {gl_count}개 계정별 파일 생성 완료!")
     
-    # 11. 요약 정보
+    # 12. 요약 정보
     print(f"\n{'='*80}")
     print("처리 완료 요약")
     print(f"{'='*80}")
@@ -166,7 +183,7 @@ def create_detail_data_for_month(input_file, target_month, output_dir='./out/det
         if row['텍스트']:
             print(f"    적요: {row['텍스트'][:50]}...")
     
-    # 12. 계정별 집계 요약
+    # 13. 계정별 집계 요약
     print(f"\n계정별 금액 합계 (상위 10개):")
     gl_summary = df_detail.groupby(['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명'])['금액_정제'].agg([
         ('거래건수', 'count'),
@@ -187,29 +204,9 @@ def main():
     print("공통부서비용 상세 데이터 생성 (24년 10월, 25년 10월, 26년 1월)")
     print("="*80)
     
-    # 24년 10월 처리
-    print("\n[1/3] 24년 10월 데이터 처리")
-    df_2410 = create_detail_data_for_month(
-        input_file='24공통비.XLSX',
-        target_month='202410',
-        output_dir='./out/details'
-    )
-    
-    # 25년 10월 처리
-    print("\n[2/3] 25년 10월 데이터 처리")
-    df_2510 = create_detail_data_for_month(
-        input_file='25공통비.XLSX',
-        target_month='202510',
-        output_dir='./out/details'
-    )
-    
-    # 26년 1월 처리
-    print("\n[3/3] 26년 1월 데이터 처리")
-    df_2601 = create_detail_data_for_month(
-        input_file='26공통비.XLSX',
-        target_month='202601',
-        output_dir='./out/details'
-    )
+    # 원장당 1회 로드 (create_detail.py 참고)
+    from create_detail import create_details
+    create_details(['202410', '202510', '202601'], output_dir='./out/details')
     
     print(f"\n{'='*80}")
     print("✅ 모든 처리가 완료되었습니다!")
@@ -218,9 +215,9 @@ def main():
     print("  1. ./out/details/detail_202410_all.csv - 24년 10월 전체 상세 데이터")
     print("  2. ./out/details/detail_202510_all.csv - 25년 10월 전체 상세 데이터")
     print("  3. ./out/details/detail_202601_all.csv - 26년 1월 전체 상세 데이터")
-    print("  4. ./out/details/202410/ - 24년 10월 계정별 파일들")
-    print("  5. ./out/details/202510/ - 25년 10월 계정별 파일들")
-    print("  6. ./out/details/202601/ - 26년 1월 계정별 파일들")
+    print("  4. ./out/detail_store/202410.parquet - 24년 10월 상세 저장소 (G/L 계정 순)")
+    print("  5. ./out/detail_store/202510.parquet - 25년 10월 상세 저장소 (G/L 계정 순)")
+    print("  6. ./out/detail_store/202601.parquet - 26년 1월 상세 저장소 (G/L 계정 순)")
     print("\n이 데이터를 활용하여 AI가 비용 세부 분석을 수행할 수 있습니다.")
 
 
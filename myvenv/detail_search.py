@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""
+상세 데이터 적요 / 거래처 검색 색인
+목적: 대시보드 API 와 분석 담당자는 텍스트(적요) / 거래처명 부분 문자열로 거래를 찾을 때 out/details CSV 를 전부 읽어
+      문자열 비교를 함 → 1년치를 찾으려면 매번 모든 파일을 훑음.
+      상세 데이터 생성 단계에서 월별로 글자 n-gram 역색인(out/detail_store/{YYYYMM}.search.npz)을 만들고,
+      검색은 n-gram 게시 목록 교집합 → 후보 값 부분 문자열 확인 → 상세 저장소(Parquet) 행 번호로 해당 row group 만 읽음.
+
+색인 구조 (필드별, numpy 배열 - pickle 없이 로드):
+  값 사전      고유 값(소문자) UTF-8 묶음 + 오프셋
+  값 → 행      값별 저장 파일 행 번호 (CSR: offsets / rows)
+  n-gram → 값  1글자 / 2글자 n-gram 키(정수, 정렬) → 고유 값 ID 게시 목록 (CSR)
+
+  - 한글은 띄어쓰기 / 형태소와 무관하게 찾을 수 있도록 글자 2-gram (1글자 검색은 1-gram)
+  - 대소문자 구분 없음, 앞뒤 공백은 검색어에서만 제거
+  - 저장소 파일이 다시 만들어지면(생성 시각 / 행 수 / 파일 크기 불일치) 해당 월 색인은 사용하지 않고 컬럼 전체 비교로 대체
+  - 검색 대상은 상세 저장소(out/detail_store)에 있는 월만. 대시보드 API(account-detail-analysis,
+    insights/monthly-analysis)는 아직 out/details 계정별 CSV 를 직접 읽으므로 이 색인을 쓰지 않음
+    (현재는 Python 분석 코드 / 이 스크립트 CLI 용)
+
+사용 예시:
+  from detail_search import build_index, search
+  build_index('202601')                         # create_detail / create_detail_data 가 자동으로 생성
+  df = search('슬랙')                            # 저장소 전체 월
+  df = search('Atlassian', months=['202501', '202601'], fields=['텍스트'], columns=['YYYYMM', '텍스트', '금액_정제'])
+
+  python detail_search.py 슬랙
+  python detail_search.py Atlassian --months 202501-202601 --field 텍스트 --limit 50
+  python detail_search.py --build 202501-202601
+  python detail_search.py 식대 --verify          # 컬럼 전체 비교와 결과/시간 비교
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from detail_store import DEFAULT_STORE_DIR, available_months, read_meta, read_month, read_rows
+from periods import parse_period
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+INDEX_VERSION = 1
+SEARCH_FIELDS = ['텍스트', '거래처명']
+
+# n-gram 키: 1-gram 은 코드포인트, 2-gram 은 (첫 글자 + 1) × UNICODE_SIZE + 둘째 글자 → 서로 겹치지 않음
+UNICODE_SIZE = 0x110000
+
+_loaded = {}
+
+
+def _index_path(store_dir, yyyymm):
+    return Path(store_dir) / f"{yyyymm}.search.npz"
+
+
+def _store_bytes(store_dir, meta):
+    return (Path(store_dir) / meta['file']).stat().st_size
+
+
+def _gram_keys(text):
+    """문자열 → 1-gram / 2-gram 키 집합"""
+    codes = [ord(c) for c in text]
+    keys = set(codes)
+    keys.update((a + 1) * UNICODE_SIZE + b for a, b in zip(codes, codes[1:]))
+    return keys
+
+
+def _query_keys(query):
+    """검색어 → 교집합을 구할 n-gram 키 (1글자면 1-gram, 아니면 2-gram)"""
+    codes = [ord(c) for c in query]
+    if len(codes) == 1:
+        return codes
+    return sorted({(a + 1) * UNICODE_SIZE + b for a, b in zip(codes, codes[1:])})
+
+
+def _normalize(series):
+    """검색 대상 값 정규화 (결측 → '', 소문자)"""
+    return series.fillna('').astype(str).str.lower()
+
+
+def _build_field(series):
+    """필드 1개 색인 배열"""
+    codes, uniques = pd.factorize(_normalize(series))
+    uniques = list(uniques)
+
+    # 값 → 행 (빈 값은 색인하지 않음)
+    valid = np.array([bool(u) for u in uniques], dtype=bool)
+    rows = np.flatnonzero(valid[codes]) if len(codes) else np.array([], dtype=np.int64)
+    order = np.argsort(codes[rows], kind='stable')
+    value_rows = rows[order].astype(np.int32)
+    value_counts = np.bincount(codes[rows], minlength=len(uniques))
+    value_offsets = np.concatenate([[0], np.cumsum(value_counts)]).astype(np.int64)
+
+    # n-gram → 고유 값 ID
+    gram_keys, gram_values = [], []
+    for value_id, text in enumerate(uniques):
+        if text:
+            keys = _gram_keys(text)
+            gram_keys.extend(keys)
+            gram_values.extend([value_id] * len(keys))
+    gram_keys = np.asarray(gram_keys, dtype=np.int64)
+    gram_values = np.asarray(gram_values, dtype=np.int32)
+    order = np.lexsort((gram_values, gram_keys))
+    gram_keys, gram_values = gram_keys[order], gram_values[order]
+    keys, starts = np.unique(gram_keys, return_index=True)
+
+    encoded = [u.encode('utf-8') for u in uniques]
+    return {
+        'value_blob': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+        'value_blob_offsets': np.concatenate([[0], np.cumsum([len(e) for e in encoded])]).astype(np.int64),
+        'value_offsets': value_offsets,
+        'value_rows': value_rows,
+        'gram_keys': keys,
+        'gram_offsets': np.concatenate([starts, [len(gram_keys)]]).astype(np.int64),
+        'gram_values': gram_values,
+    }
+
+
+def build_index(yyyymm, store_dir=DEFAULT_STORE_DIR, fields=None):
+    """
+    한 달 상세 데이터 검색 색인 생성 → {store_dir}/{YYYYMM}.search.npz
+
+    Parameters:
+    -----------
+    yyyymm : str
+        대상 월 (상세 저장소에 있어야 함)
+    fields : list, optional
+        색인할 컬럼 (기본값: 텍스트, 거래처명 - 저장소에 없는 컬럼은 제외)
+
+    Returns:
+    --------
+    str : 색인 파일 경로 또는 저장소에 해당 월이 없으면 None
+    """
+    meta = read_meta(yyyymm, store_dir)
+    if meta is None:
+        return None
+    fields = [f for f in (fields or SEARCH_FIELDS) if f in meta['columns']]
+    df = read_month(yyyymm, columns=fields, store_dir=store_dir)
+
+    arrays = {}
+    for i, field in enumerate(fields):
+        for name, array in _build_field(df[field]).items():
+            arrays[f"f{i}_{name}"] = array
+    index_meta = {
+        'version': INDEX_VERSION,
+        'month': yyyymm,
+        'fields': fields,
+        'rows': meta['rows'],
+        'store_created_at': meta['created_at'],
+        'store_bytes': _store_bytes(store_dir, meta),
+    }
+    arrays['meta'] = np.array(json.dumps(index_meta, ensure_ascii=False))
+
+    path = _index_path(store_dir, yyyymm)
+    tmp_path = path.with_name(f"{path.stem}.tmp.npz")
+    np.savez(tmp_path, **arrays)
+    tmp_path.replace(path)
+    _loaded.pop(str(path), None)
+    return str(path)
+
+
+def load_index(yyyymm, store_dir=DEFAULT_STORE_DIR):
+    """
+    색인 로드 (없거나 버전 / 저장소 파일과 맞지 않으면 None, 파일 수정 시각 기준으로 메모리에 보관)
+
+    Returns:
+    --------
+    dict : {'meta': dict, 'fields': {필드명: {배열명: ndarray}}}
+    """
+    path = _index_path(store_dir, yyyymm)
+    store_meta = read_meta(yyyymm, store_dir)
+    if store_meta is None or not path.exists():
+        return None
+    mtime = path.stat().st_mtime
+    cached = _loaded.get(str(path))
+    if cached is None or cached[0] != mtime:
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            fields = {field: {name[len(f"f{i}_"):]: data[name] for name in data.files if name.startswith(f"f{i}_")}
+                      for i, field in enumerate(meta['fields'])}
+        cached = (mtime, {'meta': meta, 'fields': fields})
+        _loaded[str(path)] = cached
+    index = cached[1]
+    meta = index['meta']
+    if (meta.get('version') != INDEX_VERSION or meta.get('rows') != store_meta['rows']
+            or meta.get('store_created_at') != store_meta['created_at']
+            or meta.get('store_bytes') != _store_bytes(store_dir, store_meta)):
+        return None
+    return index
+
+
+def _value(field_index, value_id):
+    blob, offsets = field_index['value_blob'], field_index['value_blob_offsets']
+    return blob[offsets[value_id]:offsets[value_id + 1]].tobytes().decode('utf-8')
+
+
+def _match_field(field_index, query):
+    """색인 필드 1개에서 검색어를 포함하는 행 번호"""
+    keys = field_index['gram_keys']
+    candidates = None
+    for key in _query_keys(query):
+        pos = np.searchsorted(keys, key)
+        if pos == len(keys) or keys[pos] != key:
+            return np.array([], dtype=np.int64)
+        start, end = field_index['gram_offsets'][pos], field_index['gram_offsets'][pos + 1]
+        postings = field_index['gram_values'][start:end]
+        candidates = postings if candidates is None else np.intersect1d(candidates, postings, assume_unique=True)
+        if len(candidates) == 0:
+            return np.array([], dtype=np.int64)
+
+    # 2-gram 교집합은 후보일 뿐 → 값에 검색어가 실제로 들어 있는지 확인 (3글자 이상)
+    if len(query) > 2:
+        candidates = [v for v in candidates if query in _value(field_index, v)]
+    offsets, rows = field_index['value_offsets'], field_index['value_rows']
+    parts = [rows[offsets[v]:offsets[v + 1]] for v in candidates]
+    return np.concatenate(parts).astype(np.int64) if parts else np.array([], dtype=np.int64)
+
+
+def _scan_rows(yyyymm, query, fields, store_dir):
+    """색인 없이 컬럼 전체 비교 (색인이 없거나 오래된 월)"""
+    df = read_month(yyyymm, columns=fields, store_dir=store_dir)
+    mask = np.zeros(len(df), dtype=bool)
+    for field in df.columns:
+        mask |= _normalize(df[field]).str.contains(query, regex=False).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def match_rows(query, yyyymm, fields=None, store_dir=DEFAULT_STORE_DIR, use_index=True):
+    """
+    한 달 상세 데이터 중 검색어를 포함하는 행 번호 (저장 파일 기준, 오름차순)
+
+    Parameters:
+    -----------
+    query : str
+        검색어 (부분 문자열, 대소문자 구분 없음)
+    fields : list, optional
+        검색할 컬럼 (기본값: 텍스트, 거래처명) - 여러 개면 하나라도 포함하는 행
+    use_index : bool
+        False 면 색인 없이 컬럼 전체 비교
+
+    Returns:
+    --------
+    np.ndarray 또는 저장소에 해당 월이 없으면 None
+    """
+    query = str(query).strip().lower()
+    if not query:
+        raise ValueError("검색어가 비어 있습니다.")
+    meta = read_meta(yyyymm, store_dir)
+    if meta is None:
+        return None
+    fields = [f for f in (fields or SEARCH_FIELDS) if f in meta['columns']]
+
+    index = load_index(yyyymm, store_dir) if use_index else None
+    if index is None or not set(fields) <= set(index['fields']):
+        return _scan_rows(yyyymm, query, fields, store_dir)
+    parts = [_match_field(index['fields'][field], query) for field in fields]
+    return np.unique(np.concatenate(parts)) if parts else np.array([], dtype=np.int64)
+
+
+def search(query, months=None, fields=None, columns=None, store_dir=DEFAULT_STORE_DIR, use_index=True):
+    """
+    여러 달 상세 데이터에서 텍스트 / 거래처명 부분 문자열 검색
+
+    Parameters:
+    -----------
+    query : str
+        검색어 (대소문자 구분 없음)
+    months : list, optional
+        대상 월 (기본값: 저장소 전체 월)
+    fields : list, optional
+        검색할 컬럼 (기본값: 텍스트, 거래처명)
+    columns : list, optional
+        반환할 컬럼 (기본값: 전체)
+
+    Returns:
+    --------
+    pd.DataFrame : 월 순, 월 안에서는 저장 파일 순(G/L 계정 순)
+    """
+    frames = []
+    for yyyymm in (months or available_months(store_dir)):
+        rows = match_rows(query, yyyymm, fields=fields, store_dir=store_dir, use_index=use_index)
+        if rows is not None and len(rows):
+            frames.append(read_rows(yyyymm, rows, columns=columns, store_dir=store_dir))
+    if not frames:
+        return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='상세 데이터 텍스트 / 거래처명 검색 (글자 n-gram 색인)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python detail_search.py 슬랙
+  python detail_search.py Atlassian --months 202501-202601 --field 텍스트 --limit 50
+  python detail_search.py --build 202501-202601
+  python detail_search.py 식대 --verify
+        """
+    )
+    parser.add_argument('query', nargs='?', help='검색어 (부분 문자열, 대소문자 구분 없음)')
+    parser.add_argument('--months', '-m', nargs='+',
+                        help='대상 월 (YYYYMM, YYYYMM-YYYYMM, 기본값: 저장소 전체 월)')
+    parser.add_argument('--field', nargs='+', choices=SEARCH_FIELDS, help='검색할 컬럼 (기본값: 텍스트 거래처명)')
+    parser.add_argument('--columns', nargs='+', default=['YYYYMM', 'G/L 계정 설명', '코스트센터명', '텍스트', '거래처명', '금액_정제'],
+                        help='출력 컬럼')
+    parser.add_argument('--limit', type=int, default=20, help='출력 행 수 (기본값: 20)')
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR, help=f'저장소 디렉토리 (기본값: {DEFAULT_STORE_DIR})')
+    parser.add_argument('--build', nargs='*', metavar='MONTHS',
+                        help='색인 생성 (월 지정, 생략하면 저장소 전체 월)')
+    parser.add_argument('--verify', action='store_true', help='색인 없이 컬럼 전체 비교한 결과/시간과 비교')
+    args = parser.parse_args()
+
+    try:
+        months = sorted({m for spec in args.months for m in parse_period(spec)}) if args.months else None
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.build is not None:
+        try:
+            targets = sorted({m for spec in args.build for m in parse_period(spec)}) if args.build else None
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        for yyyymm in targets or months or available_months(args.store_dir):
+            start = time.perf_counter()
+            path = build_index(yyyymm, store_dir=args.store_dir)
+            if path is None:
+                print(f"⚠ 저장소에 {yyyymm}월 데이터가 없습니다.")
+            else:
+                print(f"✓ {path} ({Path(path).stat().st_size / 1024:,.0f}KB, {time.perf_counter() - start:.2f}초)")
+        if not args.query:
+            return
+
+    if not args.query:
+        parser.error('검색어를 지정하세요 (또는 --build)')
+
+    start = time.perf_counter()
+    result = search(args.query, months=months, fields=args.field, columns=args.columns, store_dir=args.store_dir)
+    seconds = time.perf_counter() - start
+    print(f"🔍 '{args.query}': {len(result):,}건 ({seconds * 1000:.1f}ms)")
+    if len(result):
+        print(result.head(args.limit).to_string(index=False))
+        if '금액_정제' in result.columns:
+            print(f"\n   합계 {result['금액_정제'].sum():,.0f}원")
+
+    if args.verify:
+        start = time.perf_counter()
+        scanned = search(args.query, months=months, fields=args.field, columns=args.columns,
+                         store_dir=args.store_dir, use_index=False)
+        scan_seconds = time.perf_counter() - start
+        same = scanned.equals(result)
+        print(f"\n   컬럼 전체 비교 {scan_seconds * 1000:.1f}ms → 색인 {seconds * 1000:.1f}ms, 결과 {'✓ 동일' if same else '❌ 불일치'}")
+        if not same:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+상세 데이터 컬럼형 저장소
+목적: 월별 상세 거래 내역을 out/detail_store/{YYYYMM}.parquet 한 파일로 저장 (G/L 계정 순 정렬).
+      기존에는 계정마다 out/details/{YYYYMM}/{대분류}_{중분류}/GL_*.csv 를 만들고
+      분석 스크립트가 수백 개의 작은 CSV를 다시 읽었음 → 월별 1개 파일 + 필요한 컬럼만 읽기로 대체.
+
+사용 예시:
+  from detail_store import read_month, read_gl
+  df = read_month('202512', columns=['G/L 계정 설명', '텍스트', '금액_정제'])
+  gl_df = read_gl('202512', 'IT사용료', by='G/L 계정 설명')
+  rows_df = read_rows('202512', [0, 15, 40021])    # 행 번호로 조회 (해당 row group 만 읽음)
+
+  - 적요(텍스트)가 빈 문자열인 행은 조회 시 결측(None)으로 돌려줌 (기존 계정별 CSV 를 pd.read_csv 로 읽던 결과와 동일)
+
+  python detail_store.py --list
+  python detail_store.py --month 202512 --gl 'IT사용료' --by 'G/L 계정 설명'
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ledger_cache import HAS_PYARROW, encode_mixed_columns, decode_mixed_column
+
+DEFAULT_STORE_DIR = './out/detail_store'
+STORE_VERSION = 1
+GL_COLUMN = 'G/L 계정'
+
+# G/L 계정별 조회 시 Parquet 통계로 건너뛸 수 있도록 row group 을 작게 유지
+ROW_GROUP_SIZE = 20_000
+
+# 상세 데이터 생성 시 결측을 ''로 채운 컬럼 → 조회 시 다시 결측으로
+EMPTY_AS_MISSING_COLUMNS = ['텍스트']
+
+
+def _meta_path(store_dir, yyyymm):
+    return Path(store_dir) / f"{yyyymm}.json"
+
+
+def read_meta(yyyymm, store_dir=DEFAULT_STORE_DIR):
+    """월별 메타데이터 (없거나 버전이 다르면 None)"""
+    path = _meta_path(store_dir, yyyymm)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != STORE_VERSION or not (Path(store_dir) / meta['file']).exists():
+        return None
+    return meta
+
+
+def available_months(store_dir=DEFAULT_STORE_DIR):
+    """저장소에 있는 월 목록 (정렬)"""
+    return sorted(p.stem for p in Path(store_dir).glob('*.json') if read_meta(p.stem, store_dir))
+
+
+def has_month(yyyymm, store_dir=DEFAULT_STORE_DIR):
+    return read_meta(yyyymm, store_dir) is not None
+
+
+def write_month(df_detail, yyyymm, store_dir=DEFAULT_STORE_DIR):
+    """
+    한 달 상세 데이터 저장 (G/L 계정 순 정렬, 계정 내 순서는 유지)
+
+    Parameters:
+    -----------
+    df_detail : pd.DataFrame
+        create_detail_data_for_month 결과
+    yyyymm : str
+        대상 월
+    store_dir : str
+        저장 디렉토리 (기본값: ./out/detail_store)
+
+    Returns:
+    --------
+    str : 저장된 파일 경로
+    """
+    Path(store_dir).mkdir(parents=True, exist_ok=True)
+
+    df_sorted = df_detail
+    if GL_COLUMN in df_detail.columns:
+        # 코드가 숫자/문자로 섞여 있어도 정렬되도록 문자열 기준, 안정 정렬로 금액순 유지
+        df_sorted = df_detail.sort_values(GL_COLUMN, kind='mergesort', key=lambda s: s.astype(str))
+    df_sorted = df_sorted.reset_index(drop=True)
+
+    fmt, mixed_parts = 'pickle', {}
+    if HAS_PYARROW:
+        encoded, mixed_parts = encode_mixed_columns(df_sorted)
+        if encoded is not None:
+            filename = f"{yyyymm}.parquet"
+            try:
+                encoded.to_parquet(Path(store_dir) / filename, index=False, row_group_size=ROW_GROUP_SIZE)
+                fmt = 'parquet'
+            except Exception as e:
+                print(f"   ⚠ Parquet 저장 실패, pickle로 대체: {e}")
+                mixed_parts = {}
+    if fmt == 'pickle':
+        filename = f"{yyyymm}.pkl"
+        df_sorted.to_pickle(Path(store_dir) / filename)
+
+    # 이전 포맷 파일 정리
+    for stale in (f"{yyyymm}.parquet", f"{yyyymm}.pkl"):
+        if stale != filename and (Path(store_dir) / stale).exists():
+            (Path(store_dir) / stale).unlink()
+
+    meta = {
+        'version': STORE_VERSION,
+        'month': yyyymm,
+        'file': filename,
+        'format': fmt,
+        'rows': len(df_sorted),
+        'columns': [str(c) for c in df_sorted.columns],
+        'mixed_parts': mixed_parts,
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+    path = _meta_path(store_dir, yyyymm)
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+    return str(Path(store_dir) / filename)
+
+
+def _parquet_columns(meta, columns):
+    """요청 컬럼 → 실제 Parquet 컬럼 (혼합 타입 컬럼은 분리된 하위 컬럼)"""
+    parquet_columns = []
+    for col in columns:
+        parquet_columns.extend(meta['mixed_parts'].get(col, [col]))
+    return parquet_columns
+
+
+def _empty_as_missing(df):
+    """EMPTY_AS_MISSING_COLUMNS 의 '' → None"""
+    replace = {col: {'': None} for col in EMPTY_AS_MISSING_COLUMNS if col in df.columns}
+    return df.replace(replace) if replace else df
+
+
+def _decode(encoded, meta, columns):
+    data = {}
+    for col in columns:
+        data[col] = decode_mixed_column(encoded, col) if col in meta['mixed_parts'] else encoded[col]
+    return _empty_as_missing(pd.DataFrame(data, columns=columns))
+
+
+def read_month(yyyymm, columns=None, store_dir=DEFAULT_STORE_DIR):
+    """
+    한 달 상세 데이터 조회 (필요한 컬럼만 읽음)
+
+    Parameters:
+    -----------
+    yyyymm : str
+        대상 월
+    columns : list, optional
+        읽을 컬럼 (없으면 전체, 저장소에 없는 컬럼은 제외)
+
+    Returns:
+    --------
+    pd.DataFrame (G/L 계정 순) 또는 저장소에 해당 월이 없으면 None
+    """
+    meta = read_meta(yyyymm, store_dir)
+    if meta is None:
+        return None
+
+    wanted = [c for c in columns if c in meta['columns']] if columns is not None else meta['columns']
+    path = Path(store_dir) / meta['file']
+
+    if meta['format'] == 'pickle':
+        return _empty_as_missing(pd.read_pickle(path)[wanted])
+
+    encoded = pd.read_parquet(path, columns=_parquet_columns(meta, wanted))
+    return _decode(encoded, meta, wanted)
+
+
+def read_gl(yyyymm, gl_account, columns=None, by=GL_COLUMN, store_dir=DEFAULT_STORE_DIR):
+    """
+    한 달 상세 데이터 중 특정 계정 거래만 조회
+
+    Parameters:
+    -----------
+    gl_account : str or int
+        G/L 계정 코드 (by='G/L 계정') 또는 계정명 (by='G/L 계정 설명')
+    by : str
+        계정 구분 컬럼 (기본값: 'G/L 계정')
+
+    Returns:
+    --------
+    pd.DataFrame 또는 저장소에 해당 월이 없으면 None
+    """
+    meta = read_meta(yyyymm, store_dir)
+    if meta is None:
+        return None
+
+    wanted = [c for c in columns if c in meta['columns']] if columns is not None else meta['columns']
+    path = Path(store_dir) / meta['file']
+
+    # 단일 타입 컬럼이면 Parquet 필터로 해당 row group 만 읽음
+    if meta['format'] == 'parquet' and by not in meta['mixed_parts']:
+        try:
+            read_cols = _parquet_columns(meta, wanted)
+            encoded = pd.read_parquet(path, columns=read_cols, filters=[(by, '==', gl_account)])
+            return _decode(encoded.reset_index(drop=True), meta, wanted)
+        except Exception:
+            pass  # 필터 값 타입이 컬럼과 다르면 아래에서 전체 컬럼 비교
+
+    key = read_month(yyyymm, columns=[by], store_dir=store_dir)[by]
+    mask = (key == gl_account) | (key.astype(str) == str(gl_account))
+    df = read_month(yyyymm, columns=wanted, store_dir=store_dir)
+    return df[mask.to_numpy()].reset_index(drop=True)
+
+
+def read_rows(yyyymm, rows, columns=None, store_dir=DEFAULT_STORE_DIR):
+    """
+    한 달 상세 데이터 중 지정한 행 번호만 조회 (검색 색인 결과 등)
+
+    Parameters:
+    -----------
+    rows : array-like
+        저장 파일 기준 행 번호 (0부터, 정렬/중복 무관)
+    columns : list, optional
+        읽을 컬럼 (없으면 전체)
+
+    Returns:
+    --------
+    pd.DataFrame (행 번호 오름차순) 또는 저장소에 해당 월이 없으면 None
+    Parquet 는 해당 행이 있는 row group 만 읽음
+    """
+    meta = read_meta(yyyymm, store_dir)
+    if meta is None:
+        return None
+
+    wanted = [c for c in columns if c in meta['columns']] if columns is not None else meta['columns']
+    rows = np.unique(np.asarray(rows, dtype=np.int64))
+    path = Path(store_dir) / meta['file']
+
+    if meta['format'] == 'pickle':
+        return _empty_as_missing(pd.read_pickle(path)[wanted].iloc[rows].reset_index(drop=True))
+
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(path)
+    starts = np.cumsum([0] + [parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)])
+    row_group = np.searchsorted(starts, rows, side='right') - 1
+    groups = np.unique(row_group)
+    table = parquet.read_row_groups(groups.tolist(), columns=_parquet_columns(meta, wanted))
+    # 읽은 row group 들을 이어 붙인 표 안에서의 위치
+    loaded_starts = np.cumsum([0] + [starts[g + 1] - starts[g] for g in groups])[:-1]
+    local = loaded_starts[np.searchsorted(groups, row_group)] + rows - starts[row_group]
+    encoded = table.take(local).to_pandas()
+    return _decode(encoded, meta, wanted)
+
+
+def main():
+    """
+    메인 함수: CLI 인터페이스
+    """
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description='월별 상세 데이터 저장소 조회')
+    parser.add_argument('--list', action='store_true', help='저장된 월 목록')
+    parser.add_argument('--month', '-m', help='조회할 월 (YYYYMM)')
+    parser.add_argument('--gl', help='조회할 G/L 계정 (코드 또는 --by 컬럼 값)')
+    parser.add_argument('--by', default=GL_COLUMN, help=f'계정 구분 컬럼 (기본값: {GL_COLUMN})')
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR, help=f'저장소 디렉토리 (기본값: {DEFAULT_STORE_DIR})')
+    args = parser.parse_args()
+
+    if args.list:
+        for yyyymm in available_months(args.store_dir):
+            meta = read_meta(yyyymm, args.store_dir)
+            print(f"  - {yyyymm}: {meta['rows']:,}행 ({meta['file']}, 생성: {meta['created_at']})")
+
+    if args.month:
+        if args.gl is not None:
+            gl_value = int(args.gl) if args.gl.isdigit() and args.by == GL_COLUMN else args.gl
+            df = read_gl(args.month, gl_value, by=args.by, store_dir=args.store_dir)
+        else:
+            df = read_month(args.month, store_dir=args.store_dir)
+        if df is None:
+            print(f"❌ 저장소에 {args.month}월 데이터가 없습니다.")
+            sys.exit(1)
+        print(f"{len(df):,}건")
+        print(df.head(20).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
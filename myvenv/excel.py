@@ -3,62 +3,104 @@
 공통부서비용 데이터 정제 스크립트
 목적: 엑셀 원장 데이터를 피벗 형태로 집계하여 CSV 출력
 """
-import pandas as pd
-import numpy as np
 import argparse
+import contextlib
+import io
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import re
+
+from ledger_cache import load_ledger
+from normalize import clean_amount_series, normalize_yyyymm_series
+from normalize import clean_amount, normalize_yyyymm  # noqa: F401 - 기존 import 호환용 (from excel import clean_amount)
+from pivot_parts import combine_pivots, refresh_pivots_incremental
+from rollups import with_period_columns, write_rollups
+from sparse_pivot import write_sparse
+from ledger_stream import DEFAULT_CHUNK_SIZE, stream_ledger_pivots
+from profiling import add_profiling_arguments, profiling_session, span, traced
+
+__all__ = [
+    'save_file_pivots', 'process_excel_to_pivot', 'process_multiple_files', 'main',
+    # normalize.py 로 옮긴 함수 (기존 import 호환용 재노출)
+    'clean_amount', 'normalize_yyyymm',
+]
 
 # 인코딩 설정
 sys.stdout.reconfigure(encoding='utf-8')
 
 
-def clean_amount(value):
+def save_file_pivots(pivot_gl, pivot_cctr, output_dir='./out'):
     """
-    금액 데이터 정제: 콤마, 공백, 하이픈, 문자 제거 후 숫자로 변환
+    원장별 피벗 CSV 저장 (pivot_by_gl_yyyymm.csv / pivot_by_gl_cctr_yyyymm.csv)
     """
-    if pd.isna(value):
-        return 0
-    
-    if isinstance(value, (int, float)):
-        return float(value)
-    
-    # 문자열인 경우 정제
-    value = str(value).strip()
-    value = value.replace(',', '').replace(' ', '').replace('-', '').replace('_', '')
+    # 출력 디렉토리 생성
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    # 숫자가 아닌 문자 제거 (음수 부호와 소수점은 유지)
-    value = re.sub(r'[^\d.-]', '', value)
+    # CSV 저장 - 계정별
+    output_file_gl = os.path.join(output_dir, 'pivot_by_gl_yyyymm.csv')
+    print(f"\n7. CSV 파일 저장 중: {output_file_gl}")
+    with span('excel.to_csv', rows=len(pivot_gl), file='pivot_by_gl_yyyymm.csv'):
+        pivot_gl.to_csv(output_file_gl, encoding='utf-8-sig')
+    print(f"   ✓ 계정별 파일 저장 완료!")
     
-    try:
-        return float(value) if value else 0
-    except:
-        return 0
+    # CSV 저장 - 계정+코스트센터별
+    output_file_cctr = os.path.join(output_dir, 'pivot_by_gl_cctr_yyyymm.csv')
+    print(f"\n8. CSV 파일 저장 중: {output_file_cctr}")
+    with span('excel.to_csv', rows=len(pivot_cctr), file='pivot_by_gl_cctr_yyyymm.csv'):
+        pivot_cctr.to_csv(output_file_cctr, encoding='utf-8-sig')
+    print(f"   ✓ 계정+코스트센터별 파일 저장 완료!")
 
 
-def normalize_yyyymm(value):
+def _save_and_summarize(input_file, pivot_gl, pivot_cctr, output_dir, save, period_columns=False):
     """
-    연도/월 정규화: 다양한 형식을 YYYYMM으로 통일
-    예: 2024/01, 2024-01, 202401 → 202401
+    피벗 CSV 저장 + 처리 완료 요약 출력 (계정별 피벗에 '총합' 컬럼 추가)
     """
-    if pd.isna(value):
-        return None
+    # 8~10. CSV 저장 (병렬 처리 워커에서는 저장하지 않고 메인 프로세스에서 저장)
+    output_file_gl = os.path.join(output_dir, 'pivot_by_gl_yyyymm.csv')
+    output_file_cctr = os.path.join(output_dir, 'pivot_by_gl_cctr_yyyymm.csv')
+    if save:
+        save_file_pivots(pivot_gl, pivot_cctr, output_dir)
+    
+    # 누계(YTD) / 전년 동월 대비(YoY) 행렬 (연도별 누적합 + 12개월 이동 차이, 컬럼 조회로 기간 비교)
+    gl_periods = None
+    if period_columns:
+        gl_periods = with_period_columns(pivot_gl)
+        if save:
+            output_file_periods = os.path.join(output_dir, 'pivot_by_gl_yyyymm_periods.csv')
+            gl_periods.to_csv(output_file_periods, encoding='utf-8-sig')
+            print(f"\n   ✓ 계정별 월/YTD/YoY 파일 저장 완료: {output_file_periods}")
     
-    value = str(value).strip()
+    # 11. 요약 정보 출력
+    print(f"\n{'='*80}")
+    print("처리 완료 요약")
+    print(f"{'='*80}")
+    print(f"입력 파일: {input_file}")
+    print(f"출력 파일:")
+    print(f"  1. 계정별: {output_file_gl}")
+    print(f"  2. 계정+코스트센터별: {output_file_cctr}")
+    print(f"총 계정 수: {len(pivot_gl)}개")
+    print(f"총 계정+코스트센터 조합: {len(pivot_cctr)}개")
+    print(f"연월 범위: {', '.join(pivot_gl.columns)}")
+    print(f"\n상위 5개 계정 (금액 합계 기준):")
     
-    # 슬래시나 하이픈 제거
-    value = value.replace('/', '').replace('-', '')
+    # 각 계정별 총합 계산
+    pivot_gl['총합'] = pivot_gl.sum(axis=1)
+    top5 = pivot_gl.nlargest(5, '총합')
     
-    # YYYYMM 형식 추출 (앞 6자리)
-    if len(value) >= 6:
-        return value[:6]
+    for idx, (index, row) in enumerate(top5.iterrows(), 1):
+        대분류, 중분류, gl_cd, gl_nm = index
+        print(f"  {idx}. [{대분류}] {gl_nm} (G/L: {gl_cd}): {row['총합']:,.0f}원")
     
-    return None
+    result = {'gl': pivot_gl, 'cctr': pivot_cctr}
+    if gl_periods is not None:
+        result['gl_periods'] = gl_periods
+    return result
 
 
-def process_excel_to_pivot(input_file, sheet_name=0, output_dir='./out'):
+@traced('excel.process_excel_to_pivot')
+def process_excel_to_pivot(input_file, sheet_name=0, output_dir='./out', use_cache=True, df=None, save=True,
+                           streaming=False, chunk_size=DEFAULT_CHUNK_SIZE, period_columns=False):
     """
     엑셀 파일을 읽어 피벗 형태로 집계
     
@@ -70,14 +112,43 @@ def process_excel_to_pivot(input_file, sheet_name=0, output_dir='./out'):
         시트 이름 또는 인덱스 (기본값: 0)
     output_dir : str
         출력 디렉토리 (기본값: ./out)
+    use_cache : bool
+        원장 캐시(Parquet 스냅샷) 사용 여부 (기본값: True)
+    df : pd.DataFrame, optional
+        이미 로드된 원장 (파이프라인에서 전달 시 엑셀을 다시 읽지 않음, 원본은 변경하지 않음)
+    save : bool
+        원장별 피벗 CSV 저장 여부 (기본값: True, 병렬 처리 워커에서는 False)
+    streaming : bool
+        True면 엑셀 전체를 읽지 않고 필요한 컬럼만 청크 단위로 읽으며 집계 (ledger_stream.py)
+    chunk_size : int
+        스트리밍 모드 청크당 행 수
+    period_columns : bool
+        True면 계정별 피벗의 월 / YTD_(1월~해당 월 누계) / YoY_(전년 동월 대비) / YTD_YoY_ 컬럼을
+        result['gl_periods'] 로 반환하고 pivot_by_gl_yyyymm_periods.csv 로 저장 (rollups.with_period_columns)
     """
     print(f"\n{'='*80}")
     print(f"데이터 정제 시작: {input_file}")
     print(f"{'='*80}\n")
     
+    if streaming and df is None:
+        print(f"1. 엑셀 스트리밍 집계 중 (필요한 컬럼만, {chunk_size:,}행 단위)...")
+        with span('excel.stream', file=os.path.basename(input_file)) as s:
+            pivots = stream_ledger_pivots(input_file, sheet_name=sheet_name, chunk_size=chunk_size)
+            s.rows = pivots['rows']
+        print(f"   ✓ 총 {pivots['rows']:,}개 행 / 유효한 연월 {pivots['valid_rows']:,}개 행 집계됨")
+        print(f"   ✓ 금액 합계: {pivots['gl'].to_numpy().sum():,.0f}원")
+        return _save_and_summarize(input_file, pivots['gl'], pivots['cctr'], output_dir, save,
+                                   period_columns=period_columns)
+    
     # 1. 데이터 읽기
-    print("1. 엑셀 파일 읽는 중...")
-    df = pd.read_excel(input_file, sheet_name=sheet_name)
+    with span('excel.load', file=os.path.basename(input_file)) as s:
+        if df is None:
+            print("1. 엑셀 파일 읽는 중...")
+            df = load_ledger(input_file, sheet_name=sheet_name, use_cache=use_cache)
+        else:
+            print("1. 로드된 원장 사용...")
+            df = df.copy()
+        s.rows = len(df)
     print(f"   ✓ 총 {len(df):,}개 행 로드됨")
     
     # 2. 필수 컬럼 확인
@@ -89,13 +160,15 @@ def process_excel_to_pivot(input_file, sheet_name=0, output_dir='./out'):
     
     # 3. 연도/월 정규화
     print("\n2. 연도/월 정규화 중...")
-    df['YYYYMM'] = df['연도/월'].apply(normalize_yyyymm)
-    df = df[df['YYYYMM'].notna()]  # 연월이 없는 행 제거
+    with span('excel.normalize_yyyymm', rows=len(df)):
+        df['YYYYMM'] = normalize_yyyymm_series(df['연도/월'])
+        df = df[df['YYYYMM'].notna()]  # 연월이 없는 행 제거
     print(f"   ✓ {len(df):,}개 행 (유효한 연월만)")
     
     # 4. 금액 정제
     print("\n3. 금액 데이터 정제 중...")
-    df['금액_정제'] = df['금액(현지 통화)'].apply(clean_amount)
+    with span('excel.clean_amount', rows=len(df)):
+        df['금액_정제'] = clean_amount_series(df['금액(현지 통화)'])
     print(f"   ✓ 금액 합계: {df['금액_정제'].sum():,.0f}원")
     
     # 5. 코스트센터 정제 (결측값 처리)
@@ -106,16 +179,17 @@ def process_excel_to_pivot(input_file, sheet_name=0, output_dir='./out'):
     
     # 6. 피벗 테이블 생성 - 계정별 (기본)
     print("\n5. 피벗 테이블 생성 중 (계정별)...")
-    pivot_gl = df.pivot_table(
-        index=['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명'],
-        columns='YYYYMM',
-        values='금액_정제',
-        aggfunc='sum',
-        fill_value=0
-    )
-    
-    # 컬럼(연월) 정렬
-    pivot_gl = pivot_gl.reindex(sorted(pivot_gl.columns), axis=1)
+    with span('excel.pivot_gl', rows=len(df)):
+        pivot_gl = df.pivot_table(
+            index=['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명'],
+            columns='YYYYMM',
+            values='금액_정제',
+            aggfunc='sum',
+            fill_value=0
+        )
+        
+        # 컬럼(연월) 정렬
+        pivot_gl = pivot_gl.reindex(sorted(pivot_gl.columns), axis=1)
     
     print(f"   ✓ 계정별 피벗 테이블 생성 완료")
     print(f"   - 행(계정): {len(pivot_gl)}개")
@@ -124,73 +198,119 @@ def process_excel_to_pivot(input_file, sheet_name=0, output_dir='./out'):
     
     # 7. 피벗 테이블 생성 - 계정+코스트센터별 (드릴다운용)
     print("\n6. 피벗 테이블 생성 중 (계정+코스트센터별)...")
-    pivot_cctr = df.pivot_table(
-        index=['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명', '코스트 센터', '코스트센터명'],
-        columns='YYYYMM',
-        values='금액_정제',
-        aggfunc='sum',
-        fill_value=0
-    )
-    
-    # 컬럼(연월) 정렬
-    pivot_cctr = pivot_cctr.reindex(sorted(pivot_cctr.columns), axis=1)
+    with span('excel.pivot_cctr', rows=len(df)):
+        pivot_cctr = df.pivot_table(
+            index=['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명', '코스트 센터', '코스트센터명'],
+            columns='YYYYMM',
+            values='금액_정제',
+            aggfunc='sum',
+            fill_value=0
+        )
+        
+        # 컬럼(연월) 정렬
+        pivot_cctr = pivot_cctr.reindex(sorted(pivot_cctr.columns), axis=1)
     
     print(f"   ✓ 계정+코스트센터별 피벗 테이블 생성 완료")
     print(f"   - 행(계정+코스트센터): {len(pivot_cctr)}개")
     print(f"   - 열(연월): {len(pivot_cctr.columns)}개")
     
-    # 8. 출력 디렉토리 생성
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
-    # 9. CSV 저장 - 계정별
-    output_file_gl = os.path.join(output_dir, 'pivot_by_gl_yyyymm.csv')
-    print(f"\n7. CSV 파일 저장 중: {output_file_gl}")
-    pivot_gl.to_csv(output_file_gl, encoding='utf-8-sig')
-    print(f"   ✓ 계정별 파일 저장 완료!")
-    
-    # 10. CSV 저장 - 계정+코스트센터별
-    output_file_cctr = os.path.join(output_dir, 'pivot_by_gl_cctr_yyyymm.csv')
-    print(f"\n8. CSV 파일 저장 중: {output_file_cctr}")
-    pivot_cctr.to_csv(output_file_cctr, encoding='utf-8-sig')
-    print(f"   ✓ 계정+코스트센터별 파일 저장 완료!")
-    
-    # 11. 요약 정보 출력
-    print(f"\n{'='*80}")
-    print("처리 완료 요약")
-    print(f"{'='*80}")
-    print(f"입력 파일: {input_file}")
-    print(f"출력 파일:")
-    print(f"  1. 계정별: {output_file_gl}")
-    print(f"  2. 계정+코스트센터별: {output_file_cctr}")
-    print(f"총 계정 수: {len(pivot_gl)}개")
-    print(f"총 계정+코스트센터 조합: {len(pivot_cctr)}개")
-    print(f"연월 범위: {', '.join(pivot_gl.columns)}")
-    print(f"\n상위 5개 계정 (금액 합계 기준):")
-    
-    # 각 계정별 총합 계산
-    pivot_gl['총합'] = pivot_gl.sum(axis=1)
-    top5 = pivot_gl.nlargest(5, '총합')
-    
-    for idx, (index, row) in enumerate(top5.iterrows(), 1):
-        대분류, 중분류, gl_cd, gl_nm = index
-        print(f"  {idx}. [{대분류}] {gl_nm} (G/L: {gl_cd}): {row['총합']:,.0f}원")
-    
-    return {'gl': pivot_gl, 'cctr': pivot_cctr}
+    return _save_and_summarize(input_file, pivot_gl, pivot_cctr, output_dir, save, period_columns=period_columns)
+
+
+def _pivot_worker(file_path, output_dir, use_cache, df, streaming=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    병렬 처리 워커: 원장 1개 파싱 + 피벗 (CSV 저장 없음)
+    워커 출력은 메인 프로세스에서 파일 순서대로 출력하도록 문자열로 반환
+    """
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        result = process_excel_to_pivot(file_path, output_dir=output_dir, use_cache=use_cache, df=df, save=False,
+                                        streaming=streaming, chunk_size=chunk_size)
+    return result, log.getvalue()
+
+
+def _process_files_parallel(file_list, output_dir, use_cache, ledgers, workers, streaming=False,
+                            chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    원장별 파싱/피벗을 프로세스 풀에서 동시에 실행
+    결과는 제출 순서(file_list 순서)대로 모으므로 통합 결과는 순차 처리와 동일
+    """
+    print(f"\n{len(file_list)}개 원장 병렬 처리 중 (워커 {workers}개)...")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_pivot_worker, file_path, output_dir, use_cache, ledgers.get(file_path),
+                            streaming, chunk_size)
+            for file_path in file_list
+        ]
+        outputs = [future.result() for future in futures]
+    
+    for result, log in outputs:
+        print(log, end='')
+    
+    # 원장별 피벗 CSV는 순차 처리와 같이 마지막 원장 기준으로 남김 (총합 컬럼은 저장 후 추가된 것이므로 제외)
+    if outputs:
+        last = outputs[-1][0]
+        save_file_pivots(last['gl'].drop(columns='총합'), last['cctr'], output_dir)
+    
+    return [result for result, _ in outputs]
 
 
-def process_multiple_files(file_list, output_dir='./out'):
+@traced('excel.process_multiple_files')
+def process_multiple_files(file_list, output_dir='./out', use_cache=True, ledgers=None, incremental=False,
+                           workers=1, streaming=False, chunk_size=DEFAULT_CHUNK_SIZE, rollups=True,
+                           sparse=False):
     """
     여러 엑셀 파일을 통합 처리
+    
+    ledgers : dict, optional
+        {파일 경로: 로드된 원장 DataFrame} - 있으면 해당 파일은 다시 읽지 않음
+    incremental : bool
+        True면 연월별 부분 집계(out/pivot_parts)를 사용해 변경된 연월만 다시 집계 (pivot_parts.py)
+        (변경된 원장만 순차로 읽으므로 workers / streaming 은 적용되지 않음)
+    workers : int
+        2 이상이면 원장별 파싱/피벗을 프로세스 풀로 동시에 실행 (통합 CSV는 순차 처리와 동일)
+    streaming : bool
+        True면 원장을 청크 단위로 스트리밍 집계 (메모리 사용량 제한)
+    chunk_size : int
+        스트리밍 모드 청크당 행 수
+    rollups : bool
+        True면 통합 피벗에서 계층별 롤업(out/rollups, 월/YTD/YoY)도 저장 (rollups.py)
+    sparse : bool
+        True면 계정+코스트센터 통합 피벗을 희소 형식(out/pivot_sparse, 정수 ID + 0이 아닌 칸)으로도 저장 (sparse_pivot.py)
     """
+    if incremental:
+        if workers > 1 or streaming:
+            print("⚠ 증분 갱신(incremental)에서는 workers / streaming 을 사용하지 않고 순차 처리합니다.")
+        result = refresh_pivots_incremental(file_list, output_dir=output_dir, use_cache=use_cache, ledgers=ledgers)
+        if rollups and result is not None and len(result['refreshed']) > 1:
+            write_rollups(result['cctr'], output_dir)
+        if sparse and result is not None and len(result['refreshed']) > 1:
+            write_sparse(result['cctr'], output_dir)
+        return result
+    
+    ledgers = ledgers or {}
     all_gl_dfs = []
     all_cctr_dfs = []
     
+    existing_files = []
     for file_path in file_list:
-        if not os.path.exists(file_path):
+        if file_path not in ledgers and not os.path.exists(file_path):
             print(f"⚠ 파일을 찾을 수 없습니다: {file_path}")
             continue
-        
-        result = process_excel_to_pivot(file_path, output_dir=output_dir)
+        existing_files.append(file_path)
+    
+    if workers > 1 and len(existing_files) > 1:
+        results = _process_files_parallel(existing_files, output_dir, use_cache, ledgers,
+                                          min(workers, len(existing_files)), streaming=streaming,
+                                          chunk_size=chunk_size)
+    else:
+        results = [
+            process_excel_to_pivot(file_path, output_dir=output_dir, use_cache=use_cache, df=ledgers.get(file_path),
+                                   streaming=streaming, chunk_size=chunk_size)
+            for file_path in existing_files
+        ]
+    
+    for result in results:
         all_gl_dfs.append(result['gl'])
         all_cctr_dfs.append(result['cctr'])
     
@@ -201,12 +321,12 @@ def process_multiple_files(file_list, output_dir='./out'):
         
         # 계정별 통합
         print("1. 계정별 통합 중...")
-        combined_gl = pd.concat(all_gl_dfs, axis=1)
-        combined_gl = combined_gl.groupby(level=0, axis=1).sum()
-        combined_gl = combined_gl.reindex(sorted(combined_gl.columns), axis=1)
+        with span('excel.combine', rows=sum(len(p) for p in all_gl_dfs)):
+            combined_gl = combine_pivots(all_gl_dfs)
         
         output_file_gl = os.path.join(output_dir, 'pivot_by_gl_yyyymm_combined.csv')
-        combined_gl.to_csv(output_file_gl, encoding='utf-8-sig')
+        with span('excel.to_csv', rows=len(combined_gl), file='pivot_by_gl_yyyymm_combined.csv'):
+            combined_gl.to_csv(output_file_gl, encoding='utf-8-sig')
         
         print(f"   ✓ 계정별 통합 파일 저장: {output_file_gl}")
         print(f"   - 총 계정 수: {len(combined_gl)}개")
@@ -214,17 +334,27 @@ def process_multiple_files(file_list, output_dir='./out'):
         
         # 계정+코스트센터별 통합
         print("\n2. 계정+코스트센터별 통합 중...")
-        combined_cctr = pd.concat(all_cctr_dfs, axis=1)
-        combined_cctr = combined_cctr.groupby(level=0, axis=1).sum()
-        combined_cctr = combined_cctr.reindex(sorted(combined_cctr.columns), axis=1)
+        with span('excel.combine', rows=sum(len(p) for p in all_cctr_dfs)):
+            combined_cctr = combine_pivots(all_cctr_dfs)
         
         output_file_cctr = os.path.join(output_dir, 'pivot_by_gl_cctr_yyyymm_combined.csv')
-        combined_cctr.to_csv(output_file_cctr, encoding='utf-8-sig')
+        with span('excel.to_csv', rows=len(combined_cctr), file='pivot_by_gl_cctr_yyyymm_combined.csv'):
+            combined_cctr.to_csv(output_file_cctr, encoding='utf-8-sig')
         
         print(f"   ✓ 계정+코스트센터별 통합 파일 저장: {output_file_cctr}")
         print(f"   - 총 계정+코스트센터 조합: {len(combined_cctr)}개")
         print(f"   - 연월 범위: {combined_cctr.columns[0]} ~ {combined_cctr.columns[-1]}")
         
+        if rollups:
+            print("\n3. 계층별 롤업 생성 중...")
+            with span('excel.rollups', rows=len(combined_cctr)):
+                write_rollups(combined_cctr, output_dir)
+        
+        if sparse:
+            print("\n4. 희소 피벗 저장 중...")
+            with span('excel.sparse', rows=len(combined_cctr)):
+                write_sparse(combined_cctr, output_dir)
+        
         return {'gl': combined_gl, 'cctr': combined_cctr}
     
     return all_gl_dfs[0] if all_gl_dfs else None
@@ -250,6 +380,30 @@ def main():
   
   # 특정 시트 지정
   python excel.py --input 24공통비.XLSX --sheet "Sheet1"
+  
+  # 원장 캐시 없이 엑셀 직접 파싱
+  python excel.py --input 24공통비.XLSX --no-cache
+  
+  # 여러 파일 병렬 처리 (원장별 프로세스)
+  python excel.py --input 24공통비.XLSX 25공통비.XLSX 26공통비.XLSX --workers 3
+  
+  # 스트리밍 집계 (필요한 컬럼만 청크 단위로 읽어 메모리 사용량 제한)
+  python excel.py --input 24공통비.XLSX 25공통비.XLSX 26공통비.XLSX --stream
+  
+  # 증분 갱신 (변경된 연월만 다시 집계)
+  python excel.py --input 24공통비.XLSX 25공통비.XLSX 26공통비.XLSX --incremental
+  
+  # 계정별 월/YTD/YoY 컬럼 파일(pivot_by_gl_yyyymm_periods.csv)도 저장 (단일 파일)
+  python excel.py --input 25공통비.XLSX --period-columns
+  
+  # 계층별 롤업(out/rollups) 생성 생략
+  python excel.py --input 24공통비.XLSX 25공통비.XLSX --no-rollups
+  
+  # 계정+코스트센터 통합 피벗 희소 저장(out/pivot_sparse)도 생성
+  python excel.py --input 24공통비.XLSX 25공통비.XLSX 26공통비.XLSX --sparse
+  
+  # 구간별 소요 시간 트레이스(JSON) / cProfile 통계 저장
+  python excel.py --input 25공통비.XLSX --trace out/trace.json --profile
         """
     )
     
@@ -272,8 +426,66 @@ def main():
         help='출력 디렉토리 (기본값: ./out)'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='원장 캐시(Parquet 스냅샷)를 사용하지 않고 엑셀을 직접 파싱'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='연월별 부분 집계(out/pivot_parts)를 사용해 변경된 연월만 다시 집계'
+    )
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='여러 파일 처리 시 동시에 실행할 프로세스 수 (기본값: 1, 순차 처리)'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='엑셀 전체를 읽지 않고 필요한 컬럼만 청크 단위로 읽으며 집계 (원장 캐시 미사용)'
+    )
+    
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'스트리밍 모드 청크당 행 수 (기본값: {DEFAULT_CHUNK_SIZE:,})'
+    )
+    
+    parser.add_argument(
+        '--period-columns',
+        action='store_true',
+        help='단일 파일 처리 시 계정별 월/YTD/YoY 컬럼 파일도 저장 (여러 파일 통합 시에는 out/rollups/rollup_gl.csv)'
+    )
+    
+    parser.add_argument(
+        '--no-rollups',
+        action='store_true',
+        help='통합 피벗에서 계층별 롤업(out/rollups, 월/YTD/YoY) 생성 생략'
+    )
+    
+    parser.add_argument(
+        '--sparse',
+        action='store_true',
+        help='계정+코스트센터 통합 피벗을 희소 형식(out/pivot_sparse)으로도 저장'
+    )
+    
+    add_profiling_arguments(parser)
+    
     args = parser.parse_args()
     
+    if args.incremental and (args.workers > 1 or args.stream):
+        parser.error('--incremental 은 --workers / --stream 과 함께 사용할 수 없습니다 (증분 갱신은 변경된 원장만 순차 처리)')
+    if args.period_columns and (len(args.input) > 1 or args.incremental):
+        parser.error('--period-columns 는 단일 파일(--incremental 없이)에서만 사용할 수 있습니다 '
+                     '(여러 파일 통합 시 월/YTD/YoY 는 out/rollups/rollup_gl.csv)')
+    
     try:
         # 시트 인덱스를 숫자로 변환 시도
         try:
@@ -282,10 +494,16 @@ def main():
             sheet = args.sheet
         
         # 파일 처리
-        if len(args.input) == 1:
-            process_excel_to_pivot(args.input[0], sheet_name=sheet, output_dir=args.outdir)
-        else:
-            process_multiple_files(args.input, output_dir=args.outdir)
+        with profiling_session(args):
+            if len(args.input) == 1 and not args.incremental:
+                process_excel_to_pivot(args.input[0], sheet_name=sheet, output_dir=args.outdir,
+                                       use_cache=not args.no_cache, streaming=args.stream,
+                                       chunk_size=args.chunk_size, period_columns=args.period_columns)
+            else:
+                process_multiple_files(args.input, output_dir=args.outdir, use_cache=not args.no_cache,
+                                       incremental=args.incremental, workers=args.workers,
+                                       streaming=args.stream, chunk_size=args.chunk_size,
+                                       rollups=not args.no_rollups, sparse=args.sparse)
         
         print(f"\n{'='*80}")
         print("✅ 모든 처리가 완료되었습니다!")
@@ -2,7 +2,12 @@
 import pandas as pd
 import json
 import os
-import re
+
+from columnar_json import write_columnar
+from ledger_records import amount_column, build_records, clean_cctr_column, str_column, to_million_won
+from normalize_memo import NormalizeMemo, scalar_batch, source_fingerprint
+from profiling import span, traced
+from vendor_rules import USAGE_2026_CLEANUP, USAGE_2026_RULES, RuleMatcher, normalize_usage_2026_text, normalize_usage_2026_series
 
 def is_ai_usage(text):
     """텍스트에서 임직원 AI사용료 여부를 판별 (법인카드 '지정' 필드 없을 때 텍스트 기반 분류)"""
@@ -63,132 +68,34 @@ def is_ai_usage(text):
     return False
 
 def normalize_usage_text(text, vendor=''):
-    """IT사용료 텍스트 정규화 (extract_it_usage_v2.py의 normalize_text 기반)"""
-    if not text:
-        return vendor if vendor else 'Unknown'
-    
-    # 날짜 패턴 제거
-    text = re.sub(r'^\d{2}\.\d{1,2}월?_?\s*', '', text)
-    text = re.sub(r'^\d{4}\.\d{1,2}_?\s*', '', text)
-    text = re.sub(r'^\d{2}년\s*\d{1,2}월\s*', '', text)
-    text = re.sub(r'^\d{4}년도?\s*\d{0,2}월?\s*', '', text)
-    text = re.sub(r'^\d{1,2}월\s*', '', text)
-    text = re.sub(r'\d{2}\.\d{1,2}월?\s*', '', text)
-    text = re.sub(r'^\d{2}\s+', '', text)  # "26 " 등
-    text = text.replace('_', ' ').strip()
-    text = re.sub(r'\s+', ' ', text)
-    
-    lower = text.lower()
-    
-    # --- 클라우드 인프라 ---
-    if 'aws' in lower: return 'AWS'
-    if 'alibaba' in lower: return 'Alibaba Cloud'
-    if 'google cloud' in lower or 'gcp' in lower: return 'Google Cloud'
-    if 'naver cloud' in lower or '네이버 클라우드' in text: return 'Naver Cloud'
-    if 'azure' in lower: return 'Azure'
-    if 'oci' in lower and ('클라우드' in text or 'msp' in lower): return 'OCI 클라우드'
-    if 'cloudflare' in lower: return 'Cloudflare'
-    if 'vercel' in lower: return 'Vercel'
-    if 'datadog' in lower: return 'Datadog'
-    if 'kinx' in lower: return 'KINX CloudHub'
-    if 'heroku' in lower: return 'Salesforce'
-    
-    # --- 협업/생산성 도구 ---
-    if 'm365' in lower or 'ms365' in lower or 'office 365' in lower: return 'MS 365'
-    if 'sharepoint' in lower: return 'MS 365'
-    if 'ms 라이' in lower or 'ms라이' in lower: return 'MS 365'
-    if 'teams premium' in lower: return 'MS 365'
-    if 'slack' in lower: return 'Slack'
-    if 'notion' in lower or '노션' in text: return 'Notion'
-    if 'atlassian' in lower: return 'Atlassian'
-    if 'miro' in lower or '미로' in text: return 'Miro'
-    if 'zoom' in lower or '화상회의' in text: return 'Zoom'
-    if '카카오' in text: return '카카오워크'
-    if 'figma' in lower or '피그마' in text: return 'Figma'
-    if 'g.suite' in lower or 'gsuite' in lower or '구글 드라이브' in text: return 'Google Workspace'
-    if '모두싸인' in text: return '전자계약(모두싸인)'
-    
-    # --- 개발 도구 ---
-    if 'github' in lower: return 'GitHub'
-    if 'jetbrain' in lower or '파이참' in lower or 'pycharm' in lower: return 'JetBrains'
-    if 'sentry' in lower: return 'Sentry'
-    if 'sendbird' in lower: return 'Sendbird'
-    if 'fingerprint' in lower: return 'Fingerprint'
-    if 'apify' in lower: return 'APIFY'
-    if 'readme' in lower: return 'Readme'
-    if 'n8n' in lower: return 'n8n'
-    if 'obsidian' in lower: return 'Obsidian'
-    if 'datagrip' in lower: return 'JetBrains'
-    if 'rest 클라이언트' in lower or 'postman' in lower: return 'Postman'
-    if 'font awesome' in lower: return 'Font Awesome'
-    if 'apple developer' in lower: return 'Apple Developer'
-    if '파워오토메이트' in text or 'power automate' in lower: return 'Power Automate'
-    
-    # --- 데이터/분석 ---
-    if 'snowflake' in lower or '스노우플레이크' in text: return 'Snowflake'
-    if 'power bi' in lower or 'powerbi' in lower: return 'Power BI'
-    if 'ga4' in lower: return 'GA4'
-    if 'retool' in lower: return 'Retool'
-    if '차트메트릭' in text: return '차트메트릭'
-    if '썸트렌드' in text: return '썸트렌드'
-    if '블랙키위' in text: return '블랙키위'
-    if '미디엄' in text or 'medium' in lower: return 'Medium'
-    
-    # --- SaaS/비즈니스 ---
-    if 'salesforce' in lower or 'sfdc' in lower or '세일즈포스' in text: return 'Salesforce'
-    if 'marketing cloud' in lower: return 'Salesforce'
-    if 'sap' in lower: return 'SAP'
-    if 'oracle' in lower or '오라클' in text: return 'Oracle'
-    if 'okta' in lower: return 'Okta'
-    if 'docusign' in lower: return 'DocuSign'
-    if '1password' in lower: return '1Password'
-    if 'tibco' in lower: return 'Tibco'
-    if 'adobe' in lower: return 'Adobe'
-    if 'plm' in lower: return 'PLM'
-    if 'sac' in lower: return 'SAC Public Option'
-    
-    # --- 특수 서비스 ---
-    if '브랜드폴더' in text or 'brandfolder' in lower: return '브랜드폴더'
-    if '스마트시트' in text or 'smartsheet' in lower: return '스마트시트'
-    if '유로모니터' in text or 'euromonitor' in lower: return '유로모니터'
-    if 'nox' in lower or 'influencer' in lower: return 'Nox Influencer'
-    if '인플루언서' in text: return '인플루언서시스템'
-    if 'wgsn' in lower or '온라인 정보' in text: return '온라인 정보사이트(WGSN)'
-    if 'udemy' in lower: return 'Udemy'
-    if '채용플랫폼' in text or '잡플래닛' in text or 'jobplanet' in lower or '마이다스아이티' in text: return '채용플랫폼'
-    if '직원 의견' in text or '직원의견' in text: return '채용플랫폼'
-    if '한국평가데이터' in text or 'cretop' in lower or '크레탑' in text: return '기업정보 서비스'
-    if '에프앤가이드' in text: return '에프앤가이드'
-    if '로앤비' in text or 'lawnb' in lower: return '법률정보 서비스'
-    if '쇼피파이' in text or 'shopify' in lower: return 'Shopify'
-    if '한국기업데이터' in text: return '기업정보 서비스'
-    if '산돌' in text: return '산돌구름 폰트'
-    if 'canva' in lower: return 'Canva'
-    if '캡컷' in text: return '캡컷'
-    if '나노바나나' in text: return '나노바나나'
-    if 'varco' in lower: return 'Varco Art'
-    if '이지헬프' in text or '원격 지원' in text: return '원격지원 프로그램'
-    
-    # --- 보안 ---
-    if '방화벽' in text: return '방화벽'
-    if '방문객' in text or 'qr' in lower or '엔로비' in text: return '방문객 QR시스템'
-    
-    # --- 크롤링 ---
-    if '크롤링' in text: return '크롤링 프록시'
-    
-    # --- CJ APP ---
-    if 'cj app' in lower or 'cjapp' in lower: return 'CJ APP'
-    
-    # --- EAI ---
-    if 'eai' in lower: return 'EAI'
-    
-    # --- E-LAW ---
-    if 'e-law' in lower: return 'E-LAW Chatbot'
-    
-    return text.strip() if text.strip() else (vendor if vendor else 'Unknown')
+    """IT사용료 텍스트 정규화 (규칙: vendor_rules.USAGE_2026_RULES)"""
+    return normalize_usage_2026_text(text, vendor)
+
+def usage_memos():
+    """
+    IT사용료 정규화 / AI사용료 판별 메모 (고유 조합 단위, 규칙이 바뀌면 새로 계산)
+    
+    Returns:
+    --------
+    (NormalizeMemo, NormalizeMemo) : (텍스트, 거래처명) → 서비스명, 텍스트 → AI사용료 여부
+    """
+    usage = NormalizeMemo(
+        'usage_2026', normalize_usage_2026_series,
+        source_fingerprint(USAGE_2026_CLEANUP, USAGE_2026_RULES, RuleMatcher, normalize_usage_2026_series)
+    )
+    ai = NormalizeMemo('ai_usage', scalar_batch(is_ai_usage), source_fingerprint(is_ai_usage))
+    return usage, ai
 
-def extract_2026_it_data():
-    """detail_202601_all.csv에서 IT사용료와 IT유지보수비 데이터를 추출하여 기존 JSON에 추가"""
+@traced('it2026.extract_2026_it_data')
+def extract_2026_it_data(detail_df=None, columnar=False):
+    """
+    detail_202601_all.csv에서 IT사용료와 IT유지보수비 데이터를 추출하여 기존 JSON에 추가
+    
+    detail_df : pd.DataFrame, optional
+        create_detail_data_for_month 결과 (파이프라인에서 전달 시 CSV를 다시 읽지 않음)
+    columnar : bool
+        True면 컬럼형 JSON({이름}.columnar.json)도 함께 갱신
+    """
     
     # 기존 JSON 파일 로드
     usage_json_path = 'out/it_usage_details.json'
@@ -206,9 +113,13 @@ def extract_2026_it_data():
     maintenance_data['2026'] = []
     
     # detail_202601_all.csv 로드
-    detail_path = 'out/details/detail_202601_all.csv'
-    print(f"Loading {detail_path}...")
-    df = pd.read_csv(detail_path)
+    if detail_df is not None:
+        print("Using in-memory detail data...")
+        df = detail_df
+    else:
+        detail_path = 'out/details/detail_202601_all.csv'
+        print(f"Loading {detail_path}...")
+        df = pd.read_csv(detail_path)
     print(f"Total rows: {len(df)}")
     
     # IT사용료 추출
@@ -216,36 +127,31 @@ def extract_2026_it_data():
     usage_filtered = df[usage_mask].copy()
     print(f"\nIT사용료 rows: {len(usage_filtered)}")
     
-    ai_usage_count = 0
-    for _, row in usage_filtered.iterrows():
-        yyyymm = str(row['YYYYMM'])
-        month = yyyymm[-2:]  # 마지막 2자리가 월
-        
-        text = str(row['텍스트']) if pd.notna(row['텍스트']) else ''
-        vendor = str(row['거래처명']) if pd.notna(row['거래처명']) else ''
-        cctr = str(row['코스트센터명']) if pd.notna(row['코스트센터명']) else ''
-        
-        try:
-            amount = float(row['금액_정제']) if pd.notna(row['금액_정제']) else 0
-        except:
-            amount = 0
-        
-        if amount != 0:  # 0이 아닌 금액만 (음수 포함)
-            # 텍스트 기반 임직원 AI사용료 분류
-            if is_ai_usage(text):
-                normalized_text = '임직원 AI사용료'
-                ai_usage_count += 1
-            else:
-                normalized_text = normalize_usage_text(text, vendor)
-            
-            usage_data['2026'].append({
-                'month': month,
-                'text': normalized_text,
-                'original_text': text,
-                'vendor': vendor,
-                'cctr': cctr.replace('공통_', '').replace('[CLSD]공통_', '').replace('[CLSD]', ''),
-                'amount': amount  # 원 단위 (IT사용료 API에서 백만원 변환)
-            })
+    # 텍스트 정규화 / AI사용료 판별은 고유 (텍스트, 거래처명) 조합만
+    with span('it2026.normalize_usage', rows=len(usage_filtered)):
+        usage_memo, ai_memo = usage_memos()
+        text_values = str_column(usage_filtered['텍스트'])
+        vendor_values = str_column(usage_filtered['거래처명'])
+        normalized = usage_memo.apply(text_values, vendor_values)
+        ai_flags = ai_memo.apply(text_values)
+        usage_memo.save()
+        ai_memo.save()
+    print(f"  -> {usage_memo.summary()}")
+    print(f"  -> {ai_memo.summary()}")
+    
+    # 0이 아닌 금액만 (음수 포함), 텍스트 기반 임직원 AI사용료 분류
+    amount = amount_column(usage_filtered['금액_정제'])
+    keep = amount != 0
+    ai_usage_count = int(ai_flags[keep].sum())
+    
+    usage_data['2026'].extend(build_records({
+        'month': str_column(usage_filtered['YYYYMM']).str[-2:],  # 마지막 2자리가 월
+        'text': normalized.where(~ai_flags.astype(bool), '임직원 AI사용료'),
+        'original_text': text_values,
+        'vendor': vendor_values,
+        'cctr': clean_cctr_column(usage_filtered['코스트센터명']),
+        'amount': amount  # 원 단위 (IT사용료 API에서 백만원 변환)
+    }, keep))
     
     print(f"  -> 임직원 AI사용료로 분류: {ai_usage_count}건")
     
@@ -254,34 +160,28 @@ def extract_2026_it_data():
     maintenance_filtered = df[maintenance_mask].copy()
     print(f"IT유지보수비 rows: {len(maintenance_filtered)}")
     
-    for _, row in maintenance_filtered.iterrows():
-        yyyymm = str(row['YYYYMM'])
-        month = yyyymm[-2:]
-        
-        text = str(row['텍스트']) if pd.notna(row['텍스트']) else ''
-        vendor = str(row['거래처명']) if pd.notna(row['거래처명']) else ''
-        cctr = str(row['코스트센터명']) if pd.notna(row['코스트센터명']) else ''
-        
-        try:
-            amount = float(row['금액_정제']) if pd.notna(row['금액_정제']) else 0
-        except:
-            amount = 0
-        
-        if amount != 0:
-            maintenance_data['2026'].append({
-                'month': month,
-                'text': text,
-                'vendor': vendor,
-                'cctr': cctr.replace('공통_', '').replace('[CLSD]공통_', '').replace('[CLSD]', ''),
-                'amount': round(amount / 1_000_000)  # 백만원 단위 (유지보수비 API는 변환 없이 표시)
-            })
+    amount = amount_column(maintenance_filtered['금액_정제'])
+    keep = amount != 0
     
-    # JSON 파일 저장
-    with open(usage_json_path, 'w', encoding='utf-8') as f:
-        json.dump(usage_data, f, ensure_ascii=False, indent=2)
+    maintenance_data['2026'].extend(build_records({
+        'month': str_column(maintenance_filtered['YYYYMM'])[keep].str[-2:],
+        'text': str_column(maintenance_filtered['텍스트'])[keep],
+        'vendor': str_column(maintenance_filtered['거래처명'])[keep],
+        'cctr': clean_cctr_column(maintenance_filtered['코스트센터명'])[keep],
+        'amount': to_million_won(amount[keep])  # 백만원 단위 (유지보수비 API는 변환 없이 표시)
+    }))
     
-    with open(maintenance_json_path, 'w', encoding='utf-8') as f:
-        json.dump(maintenance_data, f, ensure_ascii=False, indent=2)
+    # JSON 파일 저장
+    with span('it2026.write_json', rows=len(usage_data['2026']) + len(maintenance_data['2026'])):
+        with open(usage_json_path, 'w', encoding='utf-8') as f:
+            json.dump(usage_data, f, ensure_ascii=False, indent=2)
+        if columnar:
+            write_columnar(usage_json_path, usage_data)
+        
+        with open(maintenance_json_path, 'w', encoding='utf-8') as f:
+            json.dump(maintenance_data, f, ensure_ascii=False, indent=2)
+        if columnar:
+            write_columnar(maintenance_json_path, maintenance_data)
     
     print(f"\n[OK] 저장 완료!")
     print(f"IT사용료 2026년: {len(usage_data['2026'])}건")
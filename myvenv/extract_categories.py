@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+IT사용료 / IT유지보수비 / 지급수수료 통합 추출 스크립트
+목적: extract_it_usage_v2.py, extract_it_maintenance.py, extract_commission.py 는 같은 원장을 각각 읽고
+      각자 G/L 계정 설명을 다시 필터링함 (연도당 원장 3회 로드 + 3회 스캔).
+      원장을 연도당 한 번만 읽고, G/L 계정 설명 고유값 단위로 모든 행을 한 번에 분류
+      (IT사용료 / IT유지보수비 / 지급수수료 / 기타) 한 뒤 세 JSON을 함께 저장.
+
+레코드 변환은 각 스크립트의 usage_records / maintenance_records / commission_records 를 그대로 사용하므로
+출력 JSON은 개별 스크립트 결과와 동일.
+
+사용 예시:
+  python extract_categories.py
+  → out/it_usage_details.json, out/it_maintenance_details.json, out/commission_details.json
+  python extract_categories.py --columnar
+  → 위 파일 + 컬럼형 out/*_details.columnar.json
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from columnar_json import write_columnar
+from extract_commission import commission_memo, commission_records, is_commission_account
+from extract_it_maintenance import maintenance_records
+from extract_it_usage_v2 import usage_memo, usage_records
+from ledger_cache import load_ledger
+from profiling import add_profiling_arguments, profiling_session, span, traced
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+CATEGORY_IT_USAGE = 'IT사용료'
+CATEGORY_IT_MAINTENANCE = 'IT유지보수비'
+CATEGORY_COMMISSION = '지급수수료'
+CATEGORY_OTHER = '기타'
+
+FILES = [
+    ('24공통비.XLSX', '2024'),
+    ('25공통비.XLSX', '2025'),
+    ('26공통비.XLSX', '2026')
+]
+
+OUTPUT_PATHS = {
+    CATEGORY_IT_USAGE: 'out/it_usage_details.json',
+    CATEGORY_IT_MAINTENANCE: 'out/it_maintenance_details.json',
+    CATEGORY_COMMISSION: 'out/commission_details.json',
+}
+
+
+def classify_account(gl_desc):
+    """
+    G/L 계정 설명 → 카테고리
+
+    IT사용료 > IT유지보수비 > 지급수수료 순으로 판정 (지급수수료는 IT사용료/IT유지보수비 제외)
+    """
+    gl_str = str(gl_desc)
+    if 'IT사용료' in gl_str:
+        return CATEGORY_IT_USAGE
+    if 'IT유지보수비' in gl_str:
+        return CATEGORY_IT_MAINTENANCE
+    if is_commission_account(gl_str):
+        return CATEGORY_COMMISSION
+    return CATEGORY_OTHER
+
+
+def classify_accounts(gl_values):
+    """
+    G/L 계정 설명 컬럼 → 카테고리 컬럼
+
+    계정 설명 종류는 수십~수백 개이므로 고유값만 판정하여 전체 행에 매핑
+    """
+    codes, uniques = pd.factorize(gl_values.astype(str), sort=False)
+    labels = np.array([classify_account(gl) for gl in uniques], dtype=object)
+    return pd.Series(labels[codes], index=gl_values.index)
+
+
+@traced('categories.extract_categories')
+def extract_categories(ledgers=None, columnar=False):
+    """
+    IT사용료 / IT유지보수비 / 지급수수료 상세 내역을 원장 1회 스캔으로 추출하여 JSON 3개 저장
+
+    Parameters:
+    -----------
+    ledgers : dict, optional
+        {파일명: 로드된 원장 DataFrame} - 파이프라인에서 전달 시 엑셀을 다시 읽지 않음
+    columnar : bool
+        True면 컬럼형 JSON({이름}.columnar.json, columnar_json 참고)도 함께 저장
+
+    Returns:
+    --------
+    dict : {카테고리: {연도: 레코드 수}}
+    """
+    ledgers = ledgers or {}
+    usage = usage_memo()
+    commission = commission_memo()
+    output_data = {category: {year: [] for _, year in FILES} for category in OUTPUT_PATHS}
+
+    for filename, year in FILES:
+        if filename in ledgers:
+            print(f"\n{filename} (로드된 원장 사용)")
+            df = ledgers[filename]
+        elif not os.path.exists(filename):
+            print(f"{filename} 파일 없음")
+            continue
+        else:
+            print(f"\n{filename} 로딩 중...")
+            with span('categories.load', file=filename) as s:
+                df = load_ledger(filename)
+                s.rows = len(df)
+        print(f"원장: {len(df)}행")
+
+        with span('categories.classify', rows=len(df), file=filename):
+            gl_col = 'G/L 계정 설명' if 'G/L 계정 설명' in df.columns else df.columns[4]
+            categories = classify_accounts(df[gl_col])
+
+            # 카테고리별 행 (원장 순서 유지)
+            groups = dict(tuple(df.groupby(categories.to_numpy(), sort=False)))
+        counts = {category: len(groups.get(category, ())) for category in (*OUTPUT_PATHS, CATEGORY_OTHER)}
+        print("  " + ", ".join(f"{category} {count:,}행" for category, count in counts.items()))
+
+        if CATEGORY_IT_USAGE in groups:
+            with span('categories.it_usage_records', rows=counts[CATEGORY_IT_USAGE], file=filename):
+                output_data[CATEGORY_IT_USAGE][year] = usage_records(groups[CATEGORY_IT_USAGE], usage)
+        if CATEGORY_IT_MAINTENANCE in groups:
+            with span('categories.it_maintenance_records', rows=counts[CATEGORY_IT_MAINTENANCE], file=filename):
+                output_data[CATEGORY_IT_MAINTENANCE][year] = maintenance_records(groups[CATEGORY_IT_MAINTENANCE])
+        if CATEGORY_COMMISSION in groups:
+            with span('categories.commission_records', rows=counts[CATEGORY_COMMISSION], file=filename):
+                output_data[CATEGORY_COMMISSION][year] = commission_records(groups[CATEGORY_COMMISSION], commission)
+
+    # JSON 파일로 저장
+    os.makedirs('out', exist_ok=True)
+    for category, output_path in OUTPUT_PATHS.items():
+        records = sum(len(by_year) for by_year in output_data[category].values())
+        with span('categories.write_json', rows=records, file=output_path):
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(output_data[category], f, ensure_ascii=False, indent=2)
+            if columnar:
+                write_columnar(output_path, output_data[category])
+
+    usage.save()
+    commission.save()
+
+    print(f"\n저장 완료:")
+    for category, output_path in OUTPUT_PATHS.items():
+        years = ", ".join(f"{year}년 {len(records)}건" for year, records in output_data[category].items())
+        print(f"  {category:<8} {output_path} ({years})")
+    print(usage.summary())
+    print(commission.summary())
+
+    return {category: {year: len(records) for year, records in by_year.items()}
+            for category, by_year in output_data.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='IT사용료 / IT유지보수비 / 지급수수료 상세 내역 통합 추출 (원장 1회 스캔)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python extract_categories.py
+  python extract_categories.py --columnar    # 컬럼형 JSON(*.columnar.json)도 함께 저장
+  python extract_categories.py --trace out/trace_categories.json --profile
+        """
+    )
+    parser.add_argument('--columnar', action='store_true', help='컬럼형 JSON도 함께 저장 (대시보드 API 로드용)')
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    with profiling_session(args):
+        extract_categories(columnar=args.columnar)
+
+
+if __name__ == '__main__':
+    main()
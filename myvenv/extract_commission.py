@@ -8,6 +8,11 @@ import os
 import json
 import re
 
+from ledger_cache import load_ledger
+from ledger_records import amount_column, build_records, clean_cctr_column, final_vendor_column, month_column, str_column
+from normalize_memo import NormalizeMemo, scalar_batch, source_fingerprint
+from profiling import traced
+
 def normalize_text(text, vendor):
     """텍스트 정규화 - 날짜 패턴 제거 및 거래처명 기반 통합"""
     if not text or pd.isna(text):
@@ -41,7 +46,69 @@ def normalize_text(text, vendor):
     
     return text if text else (str(vendor).strip() if vendor and not pd.isna(vendor) else 'Unknown')
 
-def extract_commission():
+def commission_memo():
+    """지급수수료 텍스트 정규화 메모 ((텍스트, 거래처명) 고유 조합 단위, 함수가 바뀌면 새로 계산)"""
+    return NormalizeMemo('commission', scalar_batch(normalize_text), source_fingerprint(normalize_text))
+
+def is_commission_account(gl_desc):
+    """지급수수료 계정 여부 (지급수수료_로 시작, IT사용료/IT유지보수비 제외)"""
+    gl_str = str(gl_desc)
+    # IT수수료는 제외
+    if 'IT사용료' in gl_str or 'IT유지보수비' in gl_str:
+        return False
+    # 지급수수료로 시작하는 것만
+    return gl_str.startswith('지급수수료_')
+
+def commission_records(filtered, memo):
+    """
+    지급수수료 행 → JSON 레코드 목록 (금액 ≠ 0, 월 있는 행만)
+    
+    Parameters:
+    -----------
+    filtered : pd.DataFrame
+        지급수수료 계정 원장 행 (원장 컬럼 순서 그대로)
+    memo : NormalizeMemo
+        텍스트 정규화 메모 (commission_memo)
+    """
+    # 컬럼명 매핑 (인덱스 기반)
+    gl_col = filtered.columns[4]  # G/L 계정 설명
+    period_col = filtered.columns[1]  # 기간/월
+    text_col = filtered.columns[21]  # 텍스트
+    vendor_col = filtered.columns[24]  # 거래처명
+    amount_col = filtered.columns[16]  # 금액(문서 통화)
+    cctr_col = filtered.columns[29]  # 코스트센터명
+    ref3_col = filtered.columns[34]  # 참조 키 3
+    
+    # 행 단위 값은 컬럼 단위로 한 번에 변환 (거래처명 없으면 참조키3)
+    month = month_column(filtered[period_col])
+    text = str_column(filtered[text_col])
+    final_vendor = final_vendor_column(filtered[vendor_col], filtered[ref3_col])
+    amount = amount_column(filtered[amount_col])
+    keep = (amount != 0) & (month != '')  # 음수 금액도 포함 (대변)
+    
+    # 텍스트 정규화는 고유 (텍스트, 거래처명) 조합만
+    normalized = memo.apply(text[keep], final_vendor[keep])
+    
+    return build_records({
+        'month': month[keep],
+        'account': str_column(filtered[gl_col])[keep],  # 계정 설명 추가
+        'text': normalized,
+        'original_text': text[keep],
+        'vendor': final_vendor[keep],
+        'cctr': clean_cctr_column(filtered[cctr_col])[keep],
+        'amount': amount[keep]  # 원 단위로 저장
+    })
+
+@traced('extract.commission')
+def extract_commission(ledgers=None):
+    """
+    지급수수료 상세 내역 추출 → out/commission_details.json
+    
+    ledgers : dict, optional
+        {파일명: 로드된 원장 DataFrame} - 파이프라인에서 전달 시 엑셀을 다시 읽지 않음
+    """
+    ledgers = ledgers or {}
+    memo = commission_memo()
     output_data = {
         '2024': [],
         '2025': [],
@@ -80,36 +147,27 @@ def extract_commission():
     ]
     
     for filename, year in files:
-        if not os.path.exists(filename):
+        if filename in ledgers:
+            print(f"\n{filename} (로드된 원장 사용)")
+            df = ledgers[filename]
+        elif not os.path.exists(filename):
             print(f"{filename} 파일 없음")
             continue
-            
-        print(f"\n{filename} 로딩 중...")
-        df = pd.read_excel(filename)
+        else:
+            print(f"\n{filename} 로딩 중...")
+            df = load_ledger(filename)
         print(f"원장: {len(df)}행")
         
         # 컬럼명 매핑 (인덱스 기반)
         gl_col = df.columns[4]  # G/L 계정 설명
-        period_col = df.columns[1]  # 기간/월
         text_col = df.columns[21]  # 텍스트
         vendor_col = df.columns[24]  # 거래처명
-        amount_col = df.columns[16]  # 금액(문서 통화)
-        cctr_col = df.columns[29]  # 코스트센터명
-        ref3_col = df.columns[34]  # 참조 키 3
         
         print(f"G/L계정설명: {gl_col}")
         print(f"텍스트: {text_col}")
         print(f"거래처명: {vendor_col}")
         
         # 지급수수료 필터링 (IT사용료, IT유지보수비 제외)
-        def is_commission_account(gl_desc):
-            gl_str = str(gl_desc)
-            # IT수수료는 제외
-            if 'IT사용료' in gl_str or 'IT유지보수비' in gl_str:
-                return False
-            # 지급수수료로 시작하는 것만
-            return gl_str.startswith('지급수수료_')
-        
         mask = df[gl_col].apply(is_commission_account)
         filtered = df[mask].copy()
         print(f"지급수수료 필터 후: {len(filtered)}행")
@@ -120,41 +178,7 @@ def extract_commission():
         for acc, cnt in account_counts.head(10).items():
             print(f"  {acc}: {cnt}건")
         
-        for _, row in filtered.iterrows():
-            # 기간/월 추출
-            period = str(row[period_col]) if pd.notna(row[period_col]) else ''
-            month = period.split('/')[-1] if '/' in period else period[-2:] if len(period) >= 2 else ''
-            try:
-                month = str(int(month)).zfill(2)
-            except:
-                month = ''
-            
-            gl_desc = str(row[gl_col]) if pd.notna(row[gl_col]) else ''
-            text = str(row[text_col]) if pd.notna(row[text_col]) else ''
-            vendor = str(row[vendor_col]) if pd.notna(row[vendor_col]) else ''
-            ref3_vendor = str(row[ref3_col]) if pd.notna(row[ref3_col]) else ''
-            cctr = str(row[cctr_col]) if pd.notna(row[cctr_col]) else ''
-            
-            # 거래처명은 거래처명 컬럼 또는 참조키3 사용
-            final_vendor = vendor if vendor and vendor != 'nan' else ref3_vendor
-            
-            try:
-                amount = float(row[amount_col]) if pd.notna(row[amount_col]) else 0
-            except:
-                amount = 0
-            
-            if amount != 0 and month:  # 음수 금액도 포함 (대변)
-                normalized_text = normalize_text(text, final_vendor)
-                
-                output_data[year].append({
-                    'month': month,
-                    'account': gl_desc,  # 계정 설명 추가
-                    'text': normalized_text,
-                    'original_text': text,
-                    'vendor': final_vendor,
-                    'cctr': cctr.replace('공통_', '').replace('[CLSD]공통_', '').replace('[CLSD]', ''),
-                    'amount': amount  # 원 단위로 저장
-                })
+        output_data[year].extend(commission_records(filtered, memo))
     
     # JSON 파일로 저장
     output_path = 'out/commission_details.json'
@@ -163,7 +187,10 @@ def extract_commission():
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(output_data, f, ensure_ascii=False, indent=2)
     
+    memo.save()
+    
     print(f"\n저장 완료: {output_path}")
+    print(memo.summary())
     print(f"2024년: {len(output_data['2024'])}건")
     print(f"2025년: {len(output_data['2025'])}건")
     print(f"2026년: {len(output_data['2026'])}건")
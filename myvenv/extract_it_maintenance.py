@@ -1,123 +1,79 @@
 # -*- coding: utf-8 -*-
-import pandas as pd
 import os
 import json
 
-def extract_it_maintenance():
+from ledger_cache import load_ledger
+from ledger_records import amount_column, build_records, clean_cctr_column, month_column, str_column, to_million_won
+from profiling import traced
+
+def maintenance_columns(df):
+    """원장 컬럼 매핑 (컬럼명이 없으면 인덱스 기준) → (GL, 기간, 텍스트, 거래처, 금액, 코스트센터)"""
+    gl_col = 'G/L 계정 설명' if 'G/L 계정 설명' in df.columns else df.columns[4]
+    period_col = '기간/월' if '기간/월' in df.columns else df.columns[1]
+    text_col = '텍스트' if '텍스트' in df.columns else df.columns[21]
+    vendor_col = '거래처명' if '거래처명' in df.columns else df.columns[24]
+    amount_col = '금액(문서 통화)' if '금액(문서 통화)' in df.columns else df.columns[16]
+    cctr_col = '코스트센터명' if '코스트센터명' in df.columns else df.columns[29]
+    return gl_col, period_col, text_col, vendor_col, amount_col, cctr_col
+
+def maintenance_records(filtered):
+    """
+    IT유지보수비 행 → JSON 레코드 목록 (금액 > 0, 월 있는 행만, 금액은 백만원 단위 정수)
+    
+    Parameters:
+    -----------
+    filtered : pd.DataFrame
+        G/L 계정 설명이 IT유지보수비인 원장 행
+    """
+    _, period_col, text_col, vendor_col, amount_col, cctr_col = maintenance_columns(filtered)
+    
+    month = month_column(filtered[period_col])
+    amount = amount_column(filtered[amount_col])
+    keep = (amount > 0) & (month != '')
+    
+    return build_records({
+        'month': month[keep],
+        'text': str_column(filtered[text_col])[keep],
+        'vendor': str_column(filtered[vendor_col])[keep],
+        'cctr': clean_cctr_column(filtered[cctr_col])[keep],
+        'amount': to_million_won(amount[keep])  # 백만원 단위 정수
+    })
+
+@traced('extract.it_maintenance')
+def extract_it_maintenance(ledgers=None):
+    """
+    IT유지보수비 상세 내역 추출 → out/it_maintenance_details.json (금액은 백만원 단위 정수)
+    
+    ledgers : dict, optional
+        {파일명: 로드된 원장 DataFrame} - 파이프라인에서 전달 시 엑셀을 다시 읽지 않음
+    """
+    ledgers = ledgers or {}
     output_data = {
         '2024': [],
         '2025': [],
         '2026': []
     }
     
-    # 2024년 원장
-    if os.path.exists('24공통비.XLSX'):
-        print("24공통비.XLSX 로딩 중...")
-        df = pd.read_excel('24공통비.XLSX')
-        print(f"2024년 원장: {len(df)}행")
-        
-        # G/L 계정 설명이 IT유지보수비인 것만 필터
-        # 컬럼명 확인
-        gl_col = 'G/L 계정 설명' if 'G/L 계정 설명' in df.columns else df.columns[4]
-        period_col = '기간/월' if '기간/월' in df.columns else df.columns[1]
-        text_col = '텍스트' if '텍스트' in df.columns else df.columns[21]
-        vendor_col = '거래처명' if '거래처명' in df.columns else df.columns[24]
-        amount_col = '금액(문서 통화)' if '금액(문서 통화)' in df.columns else df.columns[16]
-        cctr_col = '코스트센터명' if '코스트센터명' in df.columns else df.columns[29]
-        
-        print(f"컬럼 매핑: GL={gl_col}, 기간={period_col}, 텍스트={text_col}, 거래처={vendor_col}, 금액={amount_col}, 코센터={cctr_col}")
-        
-        # IT유지보수비 필터링
-        mask = df[gl_col].astype(str).str.contains('IT유지보수비', na=False)
-        filtered = df[mask].copy()
-        print(f"IT유지보수비 필터 후: {len(filtered)}행")
-        
-        for _, row in filtered.iterrows():
-            period = str(row[period_col]) if pd.notna(row[period_col]) else ''
-            month = period.split('/')[-1] if '/' in period else period[-2:] if len(period) >= 2 else ''
-            try:
-                month = str(int(month)).zfill(2)
-            except:
-                month = ''
-            
-            text = str(row[text_col]) if pd.notna(row[text_col]) else ''
-            vendor = str(row[vendor_col]) if pd.notna(row[vendor_col]) else ''
-            cctr = str(row[cctr_col]) if pd.notna(row[cctr_col]) else ''
-            
-            try:
-                amount = float(row[amount_col]) if pd.notna(row[amount_col]) else 0
-            except:
-                amount = 0
-            
-            if amount > 0 and month:
-                output_data['2024'].append({
-                    'month': month,
-                    'text': text,
-                    'vendor': vendor,
-                    'cctr': cctr.replace('공통_', '').replace('[CLSD]공통_', '').replace('[CLSD]', ''),
-                    'amount': round(amount / 1_000_000)  # 백만원 단위 정수
-                })
-    
-    # 2025년 원장
-    if os.path.exists('25공통비.XLSX'):
-        print("\n25공통비.XLSX 로딩 중...")
-        df = pd.read_excel('25공통비.XLSX')
-        print(f"2025년 원장: {len(df)}행")
-        
-        # 컬럼명 확인
-        gl_col = 'G/L 계정 설명' if 'G/L 계정 설명' in df.columns else df.columns[4]
-        period_col = '기간/월' if '기간/월' in df.columns else df.columns[1]
-        text_col = '텍스트' if '텍스트' in df.columns else df.columns[21]
-        vendor_col = '거래처명' if '거래처명' in df.columns else df.columns[24]
-        amount_col = '금액(문서 통화)' if '금액(문서 통화)' in df.columns else df.columns[16]
-        cctr_col = '코스트센터명' if '코스트센터명' in df.columns else df.columns[29]
-        
-        print(f"컬럼 매핑: GL={gl_col}, 기간={period_col}, 텍스트={text_col}, 거래처={vendor_col}, 금액={amount_col}, 코센터={cctr_col}")
-        
-        # IT유지보수비 필터링
-        mask = df[gl_col].astype(str).str.contains('IT유지보수비', na=False)
-        filtered = df[mask].copy()
-        print(f"IT유지보수비 필터 후: {len(filtered)}행")
-        
-        for _, row in filtered.iterrows():
-            period = str(row[period_col]) if pd.notna(row[period_col]) else ''
-            month = period.split('/')[-1] if '/' in period else period[-2:] if len(period) >= 2 else ''
-            try:
-                month = str(int(month)).zfill(2)
-            except:
-                month = ''
-            
-            text = str(row[text_col]) if pd.notna(row[text_col]) else ''
-            vendor = str(row[vendor_col]) if pd.notna(row[vendor_col]) else ''
-            cctr = str(row[cctr_col]) if pd.notna(row[cctr_col]) else ''
-            
-            try:
-                amount = float(row[amount_col]) if pd.notna(row[amount_col]) else 0
-            except:
-                amount = 0
-            
-            if amount > 0 and month:
-                output_data['2025'].append({
-                    'month': month,
-                    'text': text,
-                    'vendor': vendor,
-                    'cctr': cctr.replace('공통_', '').replace('[CLSD]공통_', '').replace('[CLSD]', ''),
-                    'amount': round(amount / 1_000_000)
-                })
+    files = [
+        ('24공통비.XLSX', '2024'),
+        ('25공통비.XLSX', '2025'),
+        ('26공통비.XLSX', '2026')
+    ]
     
-    # 2026년 원장
-    if os.path.exists('26공통비.XLSX'):
-        print("\n26공통비.XLSX 로딩 중...")
-        df = pd.read_excel('26공통비.XLSX')
-        print(f"2026년 원장: {len(df)}행")
+    for filename, year in files:
+        if filename in ledgers:
+            print(f"\n{filename} (로드된 원장 사용)")
+            df = ledgers[filename]
+        elif not os.path.exists(filename):
+            continue
+        else:
+            print(f"\n{filename} 로딩 중...")
+            df = load_ledger(filename)
+        print(f"{year}년 원장: {len(df)}행")
         
+        # G/L 계정 설명이 IT유지보수비인 것만 필터
         # 컬럼명 확인
-        gl_col = 'G/L 계정 설명' if 'G/L 계정 설명' in df.columns else df.columns[4]
-        period_col = '기간/월' if '기간/월' in df.columns else df.columns[1]
-        text_col = '텍스트' if '텍스트' in df.columns else df.columns[21]
-        vendor_col = '거래처명' if '거래처명' in df.columns else df.columns[24]
-        amount_col = '금액(문서 통화)' if '금액(문서 통화)' in df.columns else df.columns[16]
-        cctr_col = '코스트센터명' if '코스트센터명' in df.columns else df.columns[29]
+        gl_col, period_col, text_col, vendor_col, amount_col, cctr_col = maintenance_columns(df)
         
         print(f"컬럼 매핑: GL={gl_col}, 기간={period_col}, 텍스트={text_col}, 거래처={vendor_col}, 금액={amount_col}, 코센터={cctr_col}")
         
@@ -126,31 +82,7 @@ def extract_it_maintenance():
         filtered = df[mask].copy()
         print(f"IT유지보수비 필터 후: {len(filtered)}행")
         
-        for _, row in filtered.iterrows():
-            period = str(row[period_col]) if pd.notna(row[period_col]) else ''
-            month = period.split('/')[-1] if '/' in period else period[-2:] if len(period) >= 2 else ''
-            try:
-                month = str(int(month)).zfill(2)
-            except:
-                month = ''
-            
-            text = str(row[text_col]) if pd.notna(row[text_col]) else ''
-            vendor = str(row[vendor_col]) if pd.notna(row[vendor_col]) else ''
-            cctr = str(row[cctr_col]) if pd.notna(row[cctr_col]) else ''
-            
-            try:
-                amount = float(row[amount_col]) if pd.notna(row[amount_col]) else 0
-            except:
-                amount = 0
-            
-            if amount > 0 and month:
-                output_data['2026'].append({
-                    'month': month,
-                    'text': text,
-                    'vendor': vendor,
-                    'cctr': cctr.replace('공통_', '').replace('[CLSD]공통_', '').replace('[CLSD]', ''),
-                    'amount': round(amount / 1_000_000)
-                })
+        output_data[year].extend(maintenance_records(filtered))
     
     # JSON 파일로 저장
     output_path = 'out/it_maintenance_details.json'
@@ -3,6 +3,8 @@ import pandas as pd
 import os
 import json
 
+from ledger_cache import load_ledger
+
 def extract_it_usage():
     output_data = {
         '2024': [],
@@ -13,7 +15,7 @@ def extract_it_usage():
     # 2024년 원장
     if os.path.exists('24공통비.XLSX'):
         print("24공통비.XLSX 로딩 중...")
-        df = pd.read_excel('24공통비.XLSX')
+        df = load_ledger('24공통비.XLSX')
         print(f"2024년 원장: {len(df)}행")
         
         # 컬럼명 확인
@@ -58,7 +60,7 @@ def extract_it_usage():
     # 2025년 원장
     if os.path.exists('25공통비.XLSX'):
         print("\n25공통비.XLSX 로딩 중...")
-        df = pd.read_excel('25공통비.XLSX')
+        df = load_ledger('25공통비.XLSX')
         print(f"2025년 원장: {len(df)}행")
         
         # 컬럼명 확인
@@ -103,7 +105,7 @@ def extract_it_usage():
     # 2026년 원장
     if os.path.exists('26공통비.XLSX'):
         print("\n26공통비.XLSX 로딩 중...")
-        df = pd.read_excel('26공통비.XLSX')
+        df = load_ledger('26공통비.XLSX')
         print(f"2026년 원장: {len(df)}행")
         
         # 컬럼명 확인
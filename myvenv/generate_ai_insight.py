@@ -1,11 +1,25 @@
 # -*- coding: utf-8 -*-
-import pandas as pd
+import os
 import sys
 
+import pandas as pd
+
+from rollups import month_columns, ytd_column
+
 sys.stdout.reconfigure(encoding='utf-8')
 
-# CSV 읽기
-df = pd.read_csv('./out/pivot_by_gl_yyyymm_combined.csv', encoding='utf-8-sig')
+# 계정대분류 롤업 읽기 (excel.py 통합 피벗 생성 시 out/rollups 에 월/YTD/YoY 컬럼까지 저장됨)
+# --no-rollups / 단일 파일 실행 등으로 통합 피벗만 다시 만들어졌으면 롤업이 이전 데이터이므로 사용하지 않음
+rollup_path = './out/rollups/rollup_major.csv'
+pivot_path = './out/pivot_by_gl_yyyymm_combined.csv'
+if os.path.exists(rollup_path) and os.path.getmtime(rollup_path) >= os.path.getmtime(pivot_path):
+    rollup = pd.read_csv(rollup_path, encoding='utf-8-sig', index_col='계정대분류')
+else:
+    if os.path.exists(rollup_path):
+        print(f"⚠ {rollup_path} 가 통합 피벗보다 오래되어 통합 피벗에서 다시 계산합니다.")
+    # 롤업이 없거나 오래되었으면 통합 피벗에서 계정대분류별 합계만 계산 (누계는 ytd_column 에서 계산)
+    df = pd.read_csv(pivot_path, encoding='utf-8-sig')
+    rollup = df.groupby('계정대분류')[month_columns(df)].sum()
 
 # 계정대분류 → KPI 카테고리 매핑
 CATEGORY_MAPPING = {
@@ -18,32 +32,16 @@ CATEGORY_MAPPING = {
 def get_category_name(account_category):
     return CATEGORY_MAPPING.get(account_category, '기타비용')
 
-# 카테고리별 집계
+# 1-11월 누적: 2025년 / 2024년 YTD 컬럼 조회 후 카테고리별 합산
+categories = rollup.index.map(get_category_name)
+current_ytd = ytd_column(rollup, '202511').groupby(categories).sum()
+previous_ytd = ytd_column(rollup, '202411').groupby(categories).sum()
+
 category_data = {
-    '인건비': {'current': 0, 'previous': 0},
-    'IT수수료': {'current': 0, 'previous': 0},
-    '지급수수료': {'current': 0, 'previous': 0},
-    '직원경비': {'current': 0, 'previous': 0},
-    '기타비용': {'current': 0, 'previous': 0},
+    category: {'current': float(current_ytd.get(category, 0)), 'previous': float(previous_ytd.get(category, 0))}
+    for category in ['인건비', 'IT수수료', '지급수수료', '직원경비', '기타비용']
 }
 
-# 1-11월 누적 계산
-for idx, row in df.iterrows():
-    account_category = row['계정대분류']
-    category_name = get_category_name(account_category)
-    
-    # 2025년 1-11월 누적
-    for month in range(1, 12):
-        current_month = f'2025{month:02d}'
-        if current_month in df.columns:
-            category_data[category_name]['current'] += float(row.get(current_month, 0))
-    
-    # 2024년 1-11월 누적
-    for month in range(1, 12):
-        previous_month = f'2024{month:02d}'
-        if previous_month in df.columns:
-            category_data[category_name]['previous'] += float(row.get(previous_month, 0))
-
 # 백만원 단위로 변환 및 계산
 print("="*80)
 print("2025년 1-11월 vs 2024년 1-11월 비교 (누적)")
@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+"""
+공통비 원장 캐시 모듈
+목적: 엑셀 원장(24/25/26공통비.XLSX)을 한 번만 파싱하여 컬럼형 스냅샷(Parquet)으로 저장하고,
+      이후 로드는 스냅샷에서 바로 읽음. 원본 XLSX가 바뀌면(해시 변경) 자동으로 다시 파싱.
+
+사용 예시:
+  from ledger_cache import load_ledger
+  df = load_ledger('25공통비.XLSX')
+
+  # 캐시 미리 만들기 / 상태 확인 / 삭제
+  python ledger_cache.py --warm 24공통비.XLSX 25공통비.XLSX 26공통비.XLSX
+  python ledger_cache.py --status
+  python ledger_cache.py --clear
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Parquet 저장에는 pyarrow가 필요 (없으면 pickle 스냅샷으로 대체)
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+DEFAULT_CACHE_DIR = './out/.ledger_cache'
+CACHE_VERSION = 1
+
+# 혼합 타입(object) 컬럼 인코딩용 값 종류 코드
+_KIND_NULL = 0
+_KIND_STR = 1
+_KIND_INT = 2
+_KIND_FLOAT = 3
+_KIND_BOOL = 4
+_KIND_DATETIME = 5
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """파일 내용 SHA-256 해시"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_key(input_file, sheet_name):
+    """원장 경로 + 시트 기준 캐시 키 (같은 파일명이 다른 폴더에 있어도 충돌하지 않도록 경로 해시 포함)"""
+    resolved = str(Path(input_file).resolve())
+    path_hash = hashlib.sha1(resolved.encode('utf-8')).hexdigest()[:8]
+    return f"{Path(input_file).stem}_{sheet_name}_{path_hash}"
+
+
+def _manifest_path(cache_dir, key):
+    return Path(cache_dir) / f"{key}.manifest.json"
+
+
+def _read_manifest(cache_dir, key):
+    path = _manifest_path(cache_dir, key)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != CACHE_VERSION:
+        return None
+    return manifest
+
+
+def _write_manifest(cache_dir, key, manifest):
+    """매니페스트 저장 (임시 파일 후 교체 - 동시 실행 시 깨진 파일 방지)"""
+    path = _manifest_path(cache_dir, key)
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _value_kind(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NaT:
+        return _KIND_NULL
+    if isinstance(value, str):
+        return _KIND_STR
+    if isinstance(value, (bool, np.bool_)):
+        return _KIND_BOOL
+    if isinstance(value, (int, np.integer)):
+        return _KIND_INT
+    if isinstance(value, (float, np.floating)):
+        return _KIND_FLOAT
+    if isinstance(value, datetime.datetime):
+        return _KIND_DATETIME
+    return -1
+
+
+def encode_mixed_columns(df):
+    """
+    엑셀 원장의 혼합 타입 컬럼(문자/숫자가 섞인 object 컬럼)을 타입별 컬럼으로 분리
+
+    예: '금액(현지 통화)'에 1234.0 과 '1,234' 가 섞여 있으면
+        '금액(현지 통화)::kind' / '::str' / '::float' 세 컬럼으로 나눠 저장하고 로드 시 원래 값으로 복원.
+        (문자열로 일괄 변환하면 '-500' 처리 등 기존 정제 로직 결과가 달라지므로 타입을 그대로 보존)
+
+    Returns:
+    --------
+    (encoded_df, mixed_parts) 또는 인코딩 불가 시 (None, None)
+    mixed_parts : {원래 컬럼명: [분리된 컬럼명, ...]}
+    """
+    encoded = {}
+    mixed_parts = {}
+
+    for col in df.columns:
+        series = df[col]
+        if series.dtype != object:
+            encoded[col] = series
+            continue
+
+        kinds = series.map(_value_kind).to_numpy(dtype=np.int8)
+        if (kinds < 0).any():
+            return None, None
+
+        present = set(np.unique(kinds)) - {_KIND_NULL}
+        if present <= {_KIND_STR}:
+            encoded[col] = series
+            continue
+
+        values = series.to_numpy(dtype=object)
+        encoded[f'{col}::kind'] = kinds
+        if _KIND_STR in present:
+            encoded[f'{col}::str'] = pd.Series(
+                np.where(kinds == _KIND_STR, values, None), dtype=object
+            )
+        if _KIND_INT in present or _KIND_BOOL in present:
+            int_mask = (kinds == _KIND_INT) | (kinds == _KIND_BOOL)
+            int_values = pd.array(np.where(int_mask, values, None), dtype='Int64')
+            encoded[f'{col}::int'] = int_values
+        if _KIND_FLOAT in present:
+            encoded[f'{col}::float'] = np.where(kinds == _KIND_FLOAT, values, np.nan).astype(float)
+        if _KIND_DATETIME in present:
+            encoded[f'{col}::datetime'] = pd.to_datetime(
+                pd.Series(np.where(kinds == _KIND_DATETIME, values, None), dtype=object)
+            )
+
+        mixed_parts[col] = [name for name in encoded if name.startswith(f'{col}::')]
+
+    return pd.DataFrame(encoded, index=df.index), mixed_parts
+
+
+def decode_mixed_column(encoded, col):
+    """encode_mixed_columns로 분리된 컬럼을 원래 object 컬럼으로 복원"""
+    kinds = encoded[f'{col}::kind'].to_numpy()
+    result = np.full(len(kinds), np.nan, dtype=object)
+
+    if f'{col}::str' in encoded.columns:
+        mask = kinds == _KIND_STR
+        result[mask] = encoded[f'{col}::str'].to_numpy(dtype=object)[mask]
+    if f'{col}::int' in encoded.columns:
+        int_values = encoded[f'{col}::int']
+        mask = kinds == _KIND_INT
+        result[mask] = int_values[mask].to_numpy(dtype='int64').astype(object)
+        mask = kinds == _KIND_BOOL
+        result[mask] = int_values[mask].to_numpy(dtype='int64').astype(bool).astype(object)
+    if f'{col}::float' in encoded.columns:
+        mask = kinds == _KIND_FLOAT
+        result[mask] = encoded[f'{col}::float'].to_numpy()[mask].astype(object)
+    if f'{col}::datetime' in encoded.columns:
+        mask = kinds == _KIND_DATETIME
+        result[mask] = np.array(encoded[f'{col}::datetime'][mask].dt.to_pydatetime(), dtype=object)
+
+    return pd.Series(result, index=encoded.index, name=col, dtype=object)
+
+
+def _write_snapshot(df, cache_dir, key, sha256):
+    """스냅샷 저장. Returns: (파일명, 포맷, 혼합 타입 컬럼 분리 정보)"""
+    if HAS_PYARROW:
+        encoded, mixed_parts = encode_mixed_columns(df)
+        if encoded is not None:
+            filename = f"{key}_{sha256[:16]}.parquet"
+            try:
+                encoded.to_parquet(Path(cache_dir) / filename, index=False)
+                return filename, 'parquet', mixed_parts
+            except Exception as e:
+                print(f"   ⚠ Parquet 저장 실패, pickle로 대체: {e}")
+
+    filename = f"{key}_{sha256[:16]}.pkl"
+    df.to_pickle(Path(cache_dir) / filename)
+    return filename, 'pickle', {}
+
+
+def _read_snapshot(manifest, cache_dir, columns=None):
+    path = Path(cache_dir) / manifest['snapshot']
+
+    if manifest['format'] == 'pickle':
+        df = pd.read_pickle(path)
+        return df[columns] if columns is not None else df
+
+    mixed_parts = manifest.get('mixed_parts', {})
+    wanted = list(columns) if columns is not None else manifest['columns']
+
+    # 컬럼 선택 시 필요한 Parquet 컬럼만 읽음 (혼합 타입 컬럼은 분리된 하위 컬럼 포함)
+    parquet_columns = None
+    if columns is not None:
+        parquet_columns = []
+        for col in wanted:
+            if col in mixed_parts:
+                parquet_columns.extend(mixed_parts[col])
+            else:
+                parquet_columns.append(col)
+
+    encoded = pd.read_parquet(path, columns=parquet_columns)
+
+    data = {}
+    for col in wanted:
+        data[col] = decode_mixed_column(encoded, col) if col in mixed_parts else encoded[col]
+    return pd.DataFrame(data, columns=wanted)
+
+
+def _lookup_valid_manifest(input_file, cache_dir, key, stat):
+    """
+    캐시 유효성 검사
+    1) 크기 + 수정시각이 매니페스트와 같으면 해시 계산 없이 유효
+    2) 수정시각만 달라졌으면 해시를 다시 계산해 내용이 같을 때 유효 (매니페스트 시각 갱신)
+    """
+    manifest = _read_manifest(cache_dir, key)
+    if manifest is None or not (Path(cache_dir) / manifest['snapshot']).exists():
+        return None, None
+
+    if manifest['size'] == stat.st_size and manifest['mtime_ns'] == stat.st_mtime_ns:
+        return manifest, manifest['sha256']
+
+    sha256 = file_sha256(input_file)
+    if manifest['sha256'] == sha256:
+        manifest['mtime_ns'] = stat.st_mtime_ns
+        manifest['size'] = stat.st_size
+        _write_manifest(cache_dir, key, manifest)
+        return manifest, sha256
+
+    return None, sha256
+
+
+def load_ledger(input_file, sheet_name=0, columns=None, cache_dir=DEFAULT_CACHE_DIR,
+                use_cache=True, verbose=True):
+    """
+    원장 엑셀 로드 (캐시 사용)
+
+    Parameters:
+    -----------
+    input_file : str
+        입력 엑셀 파일 경로
+    sheet_name : int or str
+        시트 이름 또는 인덱스 (기본값: 0)
+    columns : list, optional
+        필요한 컬럼만 읽을 때 컬럼 목록 (스냅샷에서 해당 컬럼만 로드)
+    cache_dir : str
+        스냅샷 저장 디렉토리 (기본값: ./out/.ledger_cache)
+    use_cache : bool
+        False면 캐시를 사용하지 않고 pd.read_excel로 직접 읽음
+
+    Returns:
+    --------
+    pd.DataFrame : pd.read_excel(input_file, sheet_name=sheet_name) 과 같은 데이터
+    """
+    if not use_cache:
+        df = pd.read_excel(input_file, sheet_name=sheet_name)
+        return df[list(columns)] if columns is not None else df
+
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    key = _cache_key(input_file, sheet_name)
+    stat = os.stat(input_file)
+
+    manifest, sha256 = _lookup_valid_manifest(input_file, cache_dir, key, stat)
+    if manifest is not None:
+        start = time.perf_counter()
+        df = _read_snapshot(manifest, cache_dir, columns)
+        if verbose:
+            print(f"   ✓ 캐시 스냅샷 사용: {manifest['snapshot']} ({time.perf_counter() - start:.2f}초)")
+        return df
+
+    # 캐시 없음 또는 원본 변경 → 엑셀 파싱 후 스냅샷 저장
+    if sha256 is None:
+        sha256 = file_sha256(input_file)
+
+    start = time.perf_counter()
+    df = pd.read_excel(input_file, sheet_name=sheet_name)
+    parse_seconds = time.perf_counter() - start
+
+    previous = _read_manifest(cache_dir, key)
+    snapshot, fmt, mixed_parts = _write_snapshot(df, cache_dir, key, sha256)
+
+    manifest = {
+        'version': CACHE_VERSION,
+        'source': str(Path(input_file).resolve()),
+        'sheet_name': sheet_name,
+        'sha256': sha256,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'snapshot': snapshot,
+        'format': fmt,
+        'rows': len(df),
+        'columns': [str(c) for c in df.columns],
+        'dtypes': {str(c): str(t) for c, t in df.dtypes.items()},
+        'mixed_parts': mixed_parts,
+        'parse_seconds': round(parse_seconds, 3),
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+    _write_manifest(cache_dir, key, manifest)
+
+    # 이전 버전 스냅샷 정리
+    if previous and previous.get('snapshot') != snapshot:
+        old_path = Path(cache_dir) / previous['snapshot']
+        if old_path.exists():
+            old_path.unlink()
+
+    if verbose:
+        print(f"   ✓ 엑셀 파싱 {parse_seconds:.1f}초 → 스냅샷 저장: {snapshot}")
+
+    return df[list(columns)] if columns is not None else df
+
+
+def cache_status(cache_dir=DEFAULT_CACHE_DIR):
+    """캐시된 원장 목록 (매니페스트 기준)"""
+    manifests = []
+    for path in sorted(Path(cache_dir).glob('*.manifest.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            manifests.append(json.load(f))
+    return manifests
+
+
+def clear_ledger_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """캐시 디렉토리의 스냅샷/매니페스트 삭제. Returns: 삭제한 파일 수"""
+    removed = 0
+    for pattern in ('*.manifest.json', '*.parquet', '*.pkl', '*.tmp'):
+        for path in Path(cache_dir).glob(pattern):
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def main():
+    """
+    메인 함수: CLI 인터페이스
+    """
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description='공통비 원장 캐시(Parquet 스냅샷) 관리')
+    parser.add_argument('--warm', nargs='+', metavar='XLSX', help='스냅샷을 미리 생성할 엑셀 파일')
+    parser.add_argument('--status', action='store_true', help='캐시 상태 출력')
+    parser.add_argument('--clear', action='store_true', help='캐시 삭제')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f'캐시 디렉토리 (기본값: {DEFAULT_CACHE_DIR})')
+    args = parser.parse_args()
+
+    if args.clear:
+        removed = clear_ledger_cache(args.cache_dir)
+        print(f"✓ 캐시 파일 {removed}개 삭제")
+
+    for input_file in args.warm or []:
+        if not os.path.exists(input_file):
+            print(f"⚠ 파일을 찾을 수 없습니다: {input_file}")
+            continue
+        print(f"\n{input_file} 캐시 준비 중...")
+        start = time.perf_counter()
+        df = load_ledger(input_file, cache_dir=args.cache_dir)
+        print(f"   ✓ {len(df):,}개 행 ({time.perf_counter() - start:.2f}초)")
+
+    if args.status:
+        print(f"\n캐시 디렉토리: {args.cache_dir}")
+        for manifest in cache_status(args.cache_dir):
+            print(f"  - {manifest['source']} [시트 {manifest['sheet_name']}]")
+            print(f"    스냅샷: {manifest['snapshot']} ({manifest['format']}, {manifest['rows']:,}행)")
+            print(f"    해시: {manifest['sha256'][:16]}..., 생성: {manifest['created_at']}, 파싱 {manifest['parse_seconds']}초")
+
+
+if __name__ == '__main__':
+    main()
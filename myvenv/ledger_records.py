@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+원장 → JSON 레코드 변환 모듈 (컬럼 단위)
+목적: extract_it_usage_v2 / extract_commission / extract_it_maintenance / extract_2026_it_data 가
+      filtered.iterrows() 로 행마다 월 파싱, 코스트센터 접두어('공통_', '[CLSD]') 제거, 거래처명 대체(참조 키 3),
+      금액 변환을 하고 dict 를 하나씩 append 하던 것을 컬럼 연산으로 바꾸고 레코드는 한 번에 생성.
+
+변환 규칙은 기존 행 단위 코드와 동일:
+  - 문자열: 결측 → '', 그 외 str(값)
+  - 월: '2025/01' → '01', '202501' → '01' (뒤 2자리), 숫자로 바꿀 수 없으면 ''
+  - 금액: float(값), 결측/변환 불가 → 0
+  - 코스트센터: '공통_', '[CLSD]공통_', '[CLSD]' 순서로 제거
+
+사용 예시:
+  from ledger_records import str_column, month_column, amount_column, clean_cctr_column, build_records
+  amount = amount_column(filtered['금액(문서 통화)'])
+  records = build_records({'month': month_column(filtered['기간/월']), ..., 'amount': amount}, amount > 0)
+
+  python bench_records.py      # iterrows 루프 vs 컬럼 단위 처리 속도 비교
+"""
+import pandas as pd
+
+from normalize import str_column
+
+
+def _parse_month(period):
+    """기간 문자열 → 2자리 월 (행 단위 규칙)"""
+    month = period.split('/')[-1] if '/' in period else period[-2:] if len(period) >= 2 else ''
+    try:
+        return str(int(month)).zfill(2)
+    except ValueError:
+        return ''
+
+
+def month_column(periods):
+    """
+    기간/월 컬럼 → 2자리 월 ('2025/01' → '01', 변환 불가 → '')
+
+    기간 값 종류는 많아야 수십 개이므로 고유값만 파싱하여 매핑
+    """
+    periods = str_column(periods)
+    mapping = {period: _parse_month(period) for period in pd.unique(periods)}
+    return periods.map(mapping)
+
+
+def _float_or_zero(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def amount_column(values):
+    """금액 컬럼 → float (결측/변환 불가 → 0, float(값) 과 같은 결과)"""
+    amounts = pd.to_numeric(values, errors='coerce').astype(float)
+    # to_numeric 이 못 바꾼 값('nan', 'inf' 등)은 float() 규칙으로 다시 변환
+    retry = values.notna() & amounts.isna()
+    if retry.any():
+        amounts[retry] = values[retry].map(_float_or_zero)
+    amounts[values.isna()] = 0.0
+    return amounts
+
+
+def to_million_won(amounts):
+    """원 → 백만원 단위 정수 (round(금액 / 1,000,000) 과 같은 결과, 짝수 반올림)"""
+    return (amounts / 1_000_000).round().astype('int64')
+
+
+def clean_cctr_column(values):
+    """코스트센터명에서 '공통_', '[CLSD]공통_', '[CLSD]' 제거"""
+    cctr = str_column(values)
+    for prefix in ('공통_', '[CLSD]공통_', '[CLSD]'):
+        cctr = cctr.str.replace(prefix, '', regex=False)
+    return cctr
+
+
+def final_vendor_column(vendors, ref3_vendors):
+    """거래처명 (없거나 'nan' 이면 참조 키 3)"""
+    vendors = str_column(vendors)
+    return vendors.where((vendors != '') & (vendors != 'nan'), str_column(ref3_vendors))
+
+
+def build_records(columns, mask=None):
+    """
+    컬럼 dict → JSON 레코드 목록 (dict 키 순서 = columns 순서, 행 순서 유지)
+
+    Parameters:
+    -----------
+    columns : dict
+        {필드명: pd.Series} (같은 인덱스)
+    mask : pd.Series, optional
+        포함할 행 (bool)
+    """
+    frame = pd.DataFrame(columns)
+    if mask is not None:
+        frame = frame[mask.to_numpy()]
+    return frame.to_dict('records')
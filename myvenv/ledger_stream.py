@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+원장 스트리밍 읽기 모듈
+목적: pd.read_excel 은 시트 전체(약 40개 컬럼, 긴 텍스트 포함)를 메모리에 올린 뒤 필요한 컬럼만 사용함.
+      openpyxl read-only 모드(iter_rows)로 행을 순서대로 읽으면서 필요한 컬럼만 청크 단위 DataFrame으로 만들고,
+      피벗(계정×연월, 계정+코스트센터×연월)은 청크별 합계를 누적하여 원장 크기와 관계없이 메모리 사용량을 일정하게 유지.
+
+셀 값 변환은 pd.read_excel 과 같은 규칙(빈 셀/오류 셀 → NaN, 정수값 float → int, TextParser 타입 추론)을 따름.
+타입 추론은 시트 전체 컬럼 기준이어야 같은 결과가 나오므로(예: 텍스트 셀 '-500' 은 컬럼 전체가 숫자로
+변환될 때만 -500, 아니면 문자열로 남아 clean_amount 에서 500) 청크는 원래 값(object) 그대로 두고
+컬럼별 청크 추론 결과(ColumnKinds)를 모아 마지막에 시트 전체 기준으로 변환 (iter_ledger_chunks(raw=True)).
+금액은 청크별 합계를 다시 합산하므로 원 단위 정수 금액이면 전체 합산과 결과가 같음.
+
+사용 예시:
+  python excel.py --input 24공통비.XLSX 25공통비.XLSX 26공통비.XLSX --stream
+  python bench_stream.py 26공통비.XLSX        # read_excel vs 스트리밍 메모리/시간 비교
+"""
+import openpyxl
+import pandas as pd
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+
+from normalize import clean_amount_series, normalize_yyyymm_series
+from pivot_parts import GL_INDEX, CCTR_INDEX, REQUIRED_COLS
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def _convert_value(value):
+    """openpyxl 셀 값 → pd.read_excel 과 같은 값 (빈 셀은 '' 로 두고 TextParser에서 NaN 처리)"""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        as_int = int(value)
+        return as_int if as_int == value else value
+    if isinstance(value, str) and value in ERROR_CODES:
+        return float('nan')
+    return value
+
+
+class ColumnKinds:
+    """
+    컬럼별 청크 타입 추론 결과 누적 → 시트 전체를 한 번에 읽었을 때(pd.read_excel)의 컬럼 타입 결정
+
+    TextParser 는 컬럼의 모든 값이 숫자로 변환될 때만 숫자 컬럼(결측이나 실수가 있으면 float)으로,
+    아니면 원래 값 그대로 object 컬럼으로 만듦 → 모든 청크가 숫자로 추론된 컬럼만 전체도 숫자
+    """
+
+    def __init__(self):
+        self.kinds = {}
+
+    def update(self, inferred):
+        """청크의 타입 추론 결과(DataFrame) 반영"""
+        for col in inferred.columns:
+            self.kinds.setdefault(col, set()).add(inferred[col].dtype.kind)
+
+    def is_numeric(self, col):
+        kinds = self.kinds.get(col, set())
+        return bool(kinds) and kinds <= {'i', 'f'}
+
+    def resolve(self, col, values):
+        """
+        원래 값(object) → 시트 전체 기준 타입의 값
+
+        Parameters:
+        -----------
+        col : str
+            컬럼명
+        values : array-like
+            해당 컬럼의 원래 값 (일부 행만 있어도 됨)
+
+        Returns:
+        --------
+        pd.Series (0부터 시작하는 인덱스)
+        """
+        values = list(values)
+        if not values or not self.is_numeric(col):
+            return pd.Series(values, dtype=object)
+        converted = TextParser([[col]] + [[v] for v in values], header=0, skip_blank_lines=False).read()[col]
+        return converted.astype(float) if 'f' in self.kinds[col] else converted
+
+
+def iter_ledger_chunks(input_file, columns, sheet_name=0, chunk_size=DEFAULT_CHUNK_SIZE, skip_missing=False,
+                       raw=False):
+    """
+    원장 엑셀을 청크 단위로 읽기 (필요한 컬럼만)
+
+    Parameters:
+    -----------
+    input_file : str
+        입력 엑셀 파일 경로
+    columns : list
+        읽을 컬럼명 목록 (엑셀 헤더 기준)
+    sheet_name : int or str
+        시트 이름 또는 인덱스 (기본값: 0)
+    chunk_size : int
+        청크당 행 수 (기본값: 50,000)
+    skip_missing : bool
+        True면 엑셀에 없는 컬럼은 제외하고 읽음 (False면 ValueError)
+    raw : bool
+        True면 (원래 값 청크(object, 결측만 NaN), 타입 추론 청크) 튜플을 반환
+        (타입 추론은 청크 단위라 청크마다 컬럼 타입이 다를 수 있음 → ColumnKinds 로 시트 전체 기준 변환)
+
+    Yields:
+    -------
+    pd.DataFrame : columns 순서의 청크 (행 순서는 엑셀과 동일), raw=True면 (원래 값, 타입 추론) 튜플
+    """
+    workbook = openpyxl.load_workbook(input_file, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        rows = sheet.iter_rows(values_only=True)
+
+        header = [str(v) if v is not None else '' for v in next(rows, ())]
+        missing_cols = [col for col in columns if col not in header]
+        if missing_cols and not skip_missing:
+            raise ValueError(f"필수 컬럼이 없습니다: {missing_cols}")
+        columns = [col for col in columns if col in header]
+        # 같은 이름의 컬럼이 여러 개면 pd.read_excel 처럼 첫 번째 컬럼 사용
+        positions = [header.index(col) for col in columns]
+
+        chunk = []
+        for row in rows:
+            chunk.append([_convert_value(row[i]) if i < len(row) else '' for i in positions])
+            if len(chunk) >= chunk_size:
+                yield _chunk_to_frame(chunk, columns, raw)
+                chunk = []
+        if chunk:
+            yield _chunk_to_frame(chunk, columns, raw)
+    finally:
+        workbook.close()
+
+
+def _chunk_to_frame(chunk, columns, raw=False):
+    """
+    pd.read_excel 과 같은 TextParser 로 청크를 DataFrame으로 변환 (결측/숫자 타입 추론 동일)
+    raw=True면 (타입 추론 없이 결측만 NaN 처리한 object 청크, 타입 추론 청크) 튜플
+    """
+    inferred = TextParser([list(columns)] + chunk, header=0, skip_blank_lines=False).read()
+    if not raw:
+        return inferred
+    # object 로 추론된 컬럼은 이미 원래 값 그대로이므로 숫자로 변환된 컬럼만 다시 읽음
+    original = inferred.copy()
+    converted = [i for i, col in enumerate(columns) if inferred[col].dtype != object]
+    if converted:
+        values = TextParser([[columns[i] for i in converted]] + [[row[i] for i in converted] for row in chunk],
+                            header=0, skip_blank_lines=False, dtype=object).read()
+        for col in values.columns:
+            original[col] = values[col].to_numpy()
+    return original, inferred
+
+
+def _accumulate(total, part):
+    """누적 합계 + 청크 합계 (같은 키는 합산, 키는 원래 값이라 타입이 섞일 수 있어 정렬하지 않음)"""
+    if total is None:
+        return part
+    combined = pd.concat([total, part])
+    return combined.groupby(level=list(range(combined.index.nlevels)), sort=False, dropna=False).sum()
+
+
+def _pivot_from_sums(sums, index_cols):
+    """(index + YYYYMM) 합계 Series → process_excel_to_pivot 와 같은 피벗 형태"""
+    pivot = sums.rename('금액_정제').reset_index().pivot_table(
+        index=index_cols, columns='YYYYMM', values='금액_정제', aggfunc='sum', fill_value=0
+    )
+    return pivot.reindex(sorted(pivot.columns), axis=1)
+
+
+def stream_ledger_pivots(input_file, sheet_name=0, chunk_size=DEFAULT_CHUNK_SIZE, verbose=True):
+    """
+    원장을 스트리밍으로 읽으며 계정별 / 계정+코스트센터별 연월 피벗 집계
+
+    청크마다 원래 값 기준 (계정, 코스트센터, 연도/월) 합계만 남기고 원본 행은 버리므로
+    메모리 사용량은 청크 크기 + 집계 결과 크기로 제한됨.
+    금액은 원래 값 기준 / 청크 추론 값 기준 합계를 함께 누적했다가 시트 전체 금액 컬럼 타입에 맞는 쪽을 사용하고,
+    키 컬럼도 마지막에 시트 전체 기준 타입으로 변환한 뒤 prepare_ledger 와 같은 정제(연월 정규화,
+    연월 없는 행 제거, 코스트센터 결측 '미배정')를 거쳐 다시 합산
+
+    Returns:
+    --------
+    dict : {'gl': 계정별 피벗, 'cctr': 계정+코스트센터별 피벗, 'rows': 읽은 행 수, 'valid_rows': 연월이 있는 행 수}
+    """
+    keys = CCTR_INDEX + ['연도/월']
+    kinds = ColumnKinds()
+    sums = None
+    total_rows = 0
+
+    for chunk, inferred in iter_ledger_chunks(input_file, REQUIRED_COLS, sheet_name=sheet_name,
+                                              chunk_size=chunk_size, raw=True):
+        kinds.update(inferred)
+        total_rows += len(chunk)
+        amounts = pd.DataFrame({
+            'raw': clean_amount_series(chunk['금액(현지 통화)']),
+            'inferred': clean_amount_series(inferred['금액(현지 통화)']),
+            'rows': 1,
+        })
+        chunk_sums = amounts.groupby([chunk[col] for col in keys], sort=False, dropna=False).sum()
+        sums = _accumulate(sums, chunk_sums)
+
+        if verbose:
+            print(f"   - {total_rows:,}행 읽음 (집계 {len(sums):,}개 조합)")
+
+    if sums is None:
+        raise ValueError(f"연월이 있는 데이터가 없습니다: {input_file}")
+
+    # 시트 전체 기준 타입으로 변환 후 prepare_ledger 와 같은 정제
+    sums = sums.reset_index()
+    for col in keys:
+        sums[col] = kinds.resolve(col, sums[col]).to_numpy()
+    amount = 'inferred' if kinds.is_numeric('금액(현지 통화)') else 'raw'
+    prepared = sums[CCTR_INDEX].assign(YYYYMM=normalize_yyyymm_series(sums['연도/월']),
+                                       금액_정제=sums[amount], rows=sums['rows'])
+    prepared = prepared[prepared['YYYYMM'].notna()]
+    prepared['코스트 센터'] = prepared['코스트 센터'].fillna('미배정')
+    prepared['코스트센터명'] = prepared['코스트센터명'].fillna('미배정')
+    valid_rows = int(prepared['rows'].sum())
+
+    if prepared.empty:
+        raise ValueError(f"연월이 있는 데이터가 없습니다: {input_file}")
+    gl_sums = prepared.groupby(GL_INDEX + ['YYYYMM'])['금액_정제'].sum()
+    cctr_sums = prepared.groupby(CCTR_INDEX + ['YYYYMM'])['금액_정제'].sum()
+
+    return {
+        'gl': _pivot_from_sums(gl_sums, GL_INDEX),
+        'cctr': _pivot_from_sums(cctr_sums, CCTR_INDEX),
+        'rows': total_rows,
+        'valid_rows': valid_rows,
+    }
+
+
+def stream_month_rows(input_file, target_month, columns, sheet_name=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    원장에서 특정 월의 행만 스트리밍으로 추출 (상세 데이터 생성용)
+
+    Parameters:
+    -----------
+    target_month : str
+        대상 월 (YYYYMM)
+    columns : list
+        읽을 컬럼 목록 ('연도/월' 은 자동 포함, 엑셀에 없는 컬럼은 제외)
+
+    Returns:
+    --------
+    pd.DataFrame : 해당 월 행 (엑셀 행 순서, 인덱스는 엑셀 데이터 행 번호 기준)
+    """
+    columns = list(dict.fromkeys(['연도/월'] + list(columns)))
+    kinds = ColumnKinds()
+    frames = []
+    offset = 0
+    for chunk, inferred in iter_ledger_chunks(input_file, columns, sheet_name=sheet_name, chunk_size=chunk_size,
+                                              skip_missing=True, raw=True):
+        kinds.update(inferred)
+        chunk.index = inferred.index = range(offset, offset + len(chunk))
+        offset += len(chunk)
+        # 연도/월 타입은 시트 전체를 읽어야 정해지므로 원래 값 / 청크 추론 값 중 하나라도 대상 월이면 후보로 보관
+        matched = chunk[(normalize_yyyymm_series(chunk['연도/월']) == target_month)
+                        | (normalize_yyyymm_series(inferred['연도/월']) == target_month)]
+        if len(matched):
+            frames.append(matched)
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    candidates = pd.concat(frames)
+    month_rows = pd.DataFrame({col: kinds.resolve(col, candidates[col]).to_numpy() for col in candidates.columns},
+                              index=candidates.index)
+    return month_rows[normalize_yyyymm_series(month_rows['연도/월']) == target_month]
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+AI 분석 LLM 백엔드 모듈
+목적: create_account_analysis_with_ai.py 는 OpenAI 클라이언트를 직접 호출해서 키/네트워크가 없는 환경에서는
+      요청 동시 처리·배치·재시도 흐름을 실행하거나 시간을 잴 수 없음.
+      complete(messages, **params) → 응답 문자열 인터페이스로 백엔드를 분리하고
+      네트워크 없이 결정적(같은 프롬프트 → 같은 응답) 응답을 주는 스텁 백엔드를 함께 제공.
+
+  openai  OpenAI chat.completions (OPENAI_BASE_URL 을 주면 stub_llm_server.py 같은 호환 서버도 가능)
+  stub    프로세스 내 스텁 (stub_llm_server.fake_completion 과 같은 응답, 지연 시간 지정 가능)
+
+  - 백엔드는 오류를 그대로 올림 (재시도/기본 설명 대체는 호출하는 쪽에서 처리)
+  - 요청 횟수는 백엔드별 requests 에 누적 (재시도 시도 포함 - 실행 보고의 요청 수는 ai_usage.UsageLog 기준)
+  - request() 는 응답 문장과 토큰 사용량 / 종료 사유(Completion), complete() 는 응답 문장만 반환
+  - 스텁의 토큰 수는 글자 수 기준 추정값 (stub_llm_server.estimate_tokens)
+
+사용 예시:
+  from llm_backend import OpenAIBackend, StubBackend
+  backend = StubBackend(latency=0.5, per_account_latency=0.1)
+  text = backend.complete(messages, temperature=0.3, max_tokens=300)
+  result = backend.request(messages, max_tokens=300)   # result.prompt_tokens, result.finish_reason, ...
+"""
+import threading
+import time
+from collections import namedtuple
+
+from stub_llm_server import count_accounts, estimate_tokens, fake_completion
+
+BACKENDS = ('openai', 'stub')
+
+# 응답 1건 (토큰 수는 서버가 알려주지 않으면 None)
+Completion = namedtuple('Completion', ['content', 'prompt_tokens', 'completion_tokens', 'finish_reason'])
+
+
+class LLMBackend:
+    """LLM 백엔드 공통 (요청 횟수 집계)"""
+
+    name = None
+
+    def __init__(self, model):
+        self.model = model
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def request(self, messages, **params):
+        """chat 메시지 → Completion (응답 문장은 앞뒤 공백 제거)"""
+        with self._lock:
+            self.requests += 1
+        result = self._request(messages, **params)
+        return result._replace(content=(result.content or '').strip())
+
+    def complete(self, messages, **params):
+        """chat 메시지 → 응답 문자열 (앞뒤 공백 제거)"""
+        return self.request(messages, **params).content
+
+    def _request(self, messages, **params):
+        raise NotImplementedError
+
+
+class OpenAIBackend(LLMBackend):
+    """
+    OpenAI chat.completions 백엔드
+
+    Parameters:
+    -----------
+    client : openai.OpenAI
+        클라이언트 (재시도는 호출하는 쪽에서 하므로 max_retries=0 권장)
+    model : str
+        모델명
+    """
+
+    name = 'openai'
+
+    def __init__(self, client, model):
+        super().__init__(model)
+        self.client = client
+
+    def _request(self, messages, **params):
+        response = self.client.chat.completions.create(model=self.model, messages=messages, **params)
+        usage = getattr(response, 'usage', None)
+        return Completion(
+            content=response.choices[0].message.content,
+            prompt_tokens=getattr(usage, 'prompt_tokens', None),
+            completion_tokens=getattr(usage, 'completion_tokens', None),
+            finish_reason=response.choices[0].finish_reason,
+        )
+
+
+class StubBackend(LLMBackend):
+    """
+    네트워크 없는 결정적 스텁 백엔드
+
+    Parameters:
+    -----------
+    latency : float
+        요청당 지연 초 (기본값: 0)
+    per_account_latency : float
+        프롬프트에 든 계정 1개당 추가 지연 초 (배치 요청은 계정 수만큼 길어짐, 기본값: 0)
+    model : str
+        모델명 (캐시 키에 들어가므로 실제 모델과 구분, 기본값: 'stub')
+    """
+
+    name = 'stub'
+
+    def __init__(self, latency=0.0, per_account_latency=0.0, model='stub'):
+        super().__init__(model)
+        self.latency = latency
+        self.per_account_latency = per_account_latency
+
+    def _request(self, messages, **params):
+        delay = self.latency + self.per_account_latency * count_accounts(messages)
+        if delay > 0:
+            time.sleep(delay)
+        content = fake_completion(messages)
+        return Completion(content, estimate_tokens(messages), estimate_tokens(content), 'stop')
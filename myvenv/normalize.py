@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+원장 금액/연월 정규화 모듈
+목적: excel.py, create_detail_*.py 등에 중복되어 있던 clean_amount / normalize_yyyymm 를 한 곳에 두고,
+      원장 전체 컬럼을 한 번에 처리하는 벡터화 버전(clean_amount_series / normalize_yyyymm_series) 제공.
+      문자열 컬럼 변환(str_column: 결측 → '')도 ledger_records / vendor_rules / normalize_memo 가 함께 사용
+
+벡터화 버전은 행 단위 apply 결과와 비트 단위까지 동일한 값을 반환 (bench_normalize.py로 검증)
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+
+def clean_amount(value):
+    """
+    금액 데이터 정제: 콤마, 공백, 하이픈, 문자 제거 후 숫자로 변환
+    """
+    if pd.isna(value):
+        return 0
+
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    # 문자열인 경우 정제
+    value = str(value).strip()
+    value = value.replace(',', '').replace(' ', '').replace('-', '').replace('_', '')
+
+    # 숫자가 아닌 문자 제거 (음수 부호와 소수점은 유지)
+    value = re.sub(r'[^\d.-]', '', value)
+
+    try:
+        return float(value) if value else 0
+    except:
+        return 0
+
+
+def normalize_yyyymm(value):
+    """
+    연도/월 정규화: 다양한 형식을 YYYYMM으로 통일
+    예: 2024/01, 2024-01, 202401 → 202401
+    """
+    if pd.isna(value):
+        return None
+
+    value = str(value).strip()
+
+    # 슬래시나 하이픈 제거
+    value = value.replace('/', '').replace('-', '')
+
+    # YYYYMM 형식 추출 (앞 6자리)
+    if len(value) >= 6:
+        return value[:6]
+
+    return None
+
+
+def _value_type_masks(s):
+    """
+    object 컬럼 값의 타입 분류 (결측 / int·float / 그 외)
+    타입 판별은 고유 타입 단위로만 수행 (행마다 isinstance 호출하지 않음)
+    """
+    na_mask = s.isna().to_numpy()
+    types = s.map(type)
+    is_number_type = {t: issubclass(t, (int, float)) for t in types.unique()}
+    number_mask = types.map(is_number_type).to_numpy(dtype=bool) & ~na_mask
+    other_mask = ~na_mask & ~number_mask
+    return na_mask, number_mask, other_mask
+
+
+def clean_amount_series(values):
+    """
+    clean_amount 의 벡터화 버전
+
+    - 결측 → 0
+    - int/float → float 그대로 (음수 유지)
+    - 문자열 등 → 숫자와 소수점만 남기고 변환 ('-' 도 제거되므로 '-1,000' → 1000.0), 변환 불가 시 0
+
+    Returns:
+    --------
+    pd.Series (float64, 입력과 같은 인덱스)
+    """
+    s = pd.Series(values)
+
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return s.astype(float).fillna(0.0)
+
+    result = np.zeros(len(s), dtype=float)
+    obj = s.to_numpy(dtype=object)
+    na_mask, number_mask, other_mask = _value_type_masks(s)
+
+    if number_mask.any():
+        result[number_mask] = obj[number_mask].astype(float)
+
+    if other_mask.any():
+        # strip/콤마/공백/하이픈/언더스코어 제거 + [^\d.-] 제거 = 숫자와 소수점 외 전부 제거
+        text = pd.Series(obj[other_mask], dtype=object).astype(str)
+        digits = text.str.replace(r'[^\d.]', '', regex=True)
+        # float()로 변환 가능한 형태만 변환 ('', '.', '1.2.3' 등은 0)
+        valid = digits.str.fullmatch(r'\d+\.?\d*|\.\d+').to_numpy(dtype=bool)
+        parsed = np.zeros(len(digits), dtype=float)
+        parsed[valid] = digits.to_numpy(dtype=object)[valid].astype(float)
+        result[other_mask] = parsed
+
+    return pd.Series(result, index=s.index, name=s.name)
+
+
+def str_column(values):
+    """결측 → '', 그 외 str(값) (iterrows 의 str(row[col]) 과 같은 결과, 입력과 같은 인덱스)"""
+    values = pd.Series(values).astype(object)
+    return values.where(values.notna(), '').astype(str)
+
+
+def normalize_yyyymm_series(values):
+    """
+    normalize_yyyymm 의 벡터화 버전
+
+    연월 컬럼은 고유값이 적으므로(월 단위) 고유값만 문자열 연산으로 정규화한 뒤 전체 행에 매핑
+
+    Returns:
+    --------
+    pd.Series (object, 'YYYYMM' 문자열 또는 None, 입력과 같은 인덱스)
+    """
+    s = pd.Series(values)
+    result = np.full(len(s), None, dtype=object)
+
+    if pd.api.types.is_numeric_dtype(s.dtype) or pd.api.types.is_datetime64_any_dtype(s.dtype):
+        # 단일 타입 컬럼: 고유값 단위로 기존 함수 적용
+        codes, uniques = pd.factorize(s, use_na_sentinel=True)
+        mapped = np.array([normalize_yyyymm(v) for v in uniques.astype(object)] + [None], dtype=object)
+        result = mapped[codes]
+        return pd.Series(result, index=s.index, name=s.name, dtype=object)
+
+    obj = s.to_numpy(dtype=object)
+    na_mask = s.isna().to_numpy()
+    types = s.map(type)
+    is_str = types.map({t: issubclass(t, str) for t in types.unique()}).to_numpy(dtype=bool) & ~na_mask
+
+    if is_str.any():
+        codes, uniques = pd.factorize(pd.Series(obj[is_str], dtype=object))
+        text = pd.Series(uniques, dtype=object).str.strip()
+        text = text.str.replace('/', '', regex=False).str.replace('-', '', regex=False)
+        normalized = text.str[:6].where(text.str.len() >= 6, None).to_numpy(dtype=object)
+        result[is_str] = normalized[codes]
+
+    # 문자열이 아닌 값(숫자/날짜 등이 섞인 경우)은 기존 함수 그대로 적용
+    other = ~na_mask & ~is_str
+    if other.any():
+        result[other] = [normalize_yyyymm(v) for v in obj[other]]
+
+    return pd.Series(result, index=s.index, name=s.name, dtype=object)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+적요 정규화 메모 모듈
+목적: 원장 적요는 매달 같은 문구(AWS, Slack, MS 365 ...)가 반복되는데 추출 스크립트는 행마다 정규화 함수를 다시 실행함.
+      (텍스트, 거래처명) 고유 조합만 골라(factorize) 정규화한 뒤 전체 행에 다시 매핑하고,
+      결과를 out/.normalize_memo/{이름}.json 에 저장하여 다음 실행에서는 처음 보는 조합만 계산.
+      → 정규화 비용이 행 수가 아니라 고유 문구 수에 비례.
+
+메모에는 정규화 함수/규칙 표의 지문(fingerprint)을 같이 저장하며, 규칙이 바뀌면 지문이 달라져 메모를 버리고 새로 계산.
+
+사용 예시:
+  from normalize_memo import NormalizeMemo, source_fingerprint
+  memo = NormalizeMemo('it_usage', normalize_it_usage_series,
+                       source_fingerprint(normalize_it_usage_text, IT_USAGE_RULES))
+  df['서비스명'] = memo.apply(df['텍스트'], df['거래처명'])
+  memo.save()
+  print(memo.summary())
+"""
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from normalize import str_column
+
+DEFAULT_MEMO_DIR = './out/.normalize_memo'
+MEMO_VERSION = 1
+
+# 텍스트 / 거래처명 구분자 (적요에 나오지 않는 제어 문자)
+_KEY_SEP = '\x1f'
+
+# 메모에 없는 조합 표시
+_MISSING = object()
+
+
+def source_fingerprint(*objects):
+    """함수(소스 코드) / 규칙 표(repr) 기준 지문 - 하나라도 바뀌면 값이 달라짐"""
+    h = hashlib.sha256()
+    for obj in objects:
+        text = inspect.getsource(obj) if callable(obj) else repr(obj)
+        h.update(text.encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def scalar_batch(func):
+    """행 단위 함수 func(text, vendor) → 컬럼 단위 함수 (NormalizeMemo 용)"""
+    def apply(texts, vendors):
+        if vendors is None:
+            return pd.Series([func(t) for t in texts], index=texts.index, dtype=object)
+        return pd.Series([func(t, v) for t, v in zip(texts, vendors)], index=texts.index, dtype=object)
+    return apply
+
+
+class NormalizeMemo:
+    """
+    (텍스트, 거래처명) 고유 조합 단위 정규화 + 실행 간 메모
+
+    Parameters:
+    -----------
+    name : str
+        메모 이름 (저장 파일명)
+    func : callable
+        컬럼 단위 정규화 함수 func(texts, vendors) → pd.Series (vendors 는 None 일 수 있음)
+    fingerprint : str
+        정규화 규칙 지문 (source_fingerprint) - 저장된 메모와 다르면 메모를 사용하지 않음
+    memo_dir : str
+        저장 디렉토리 (기본값: ./out/.normalize_memo)
+    persist : bool
+        False면 실행 간 메모 없이 고유 조합 단위 정규화만 수행
+    """
+
+    def __init__(self, name, func, fingerprint, memo_dir=DEFAULT_MEMO_DIR, persist=True):
+        self.name = name
+        self.func = func
+        self.fingerprint = fingerprint
+        self.memo_dir = memo_dir
+        self.persist = persist
+        self.rows = 0
+        self.distinct = 0
+        self.computed = 0
+        self._dirty = False
+        self._entries = self._load() if persist else {}
+
+    @property
+    def path(self):
+        return Path(self.memo_dir) / f"{self.name}.json"
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                memo = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if memo.get('version') != MEMO_VERSION or memo.get('fingerprint') != self.fingerprint:
+            return {}
+        return memo.get('entries', {})
+
+    def apply(self, texts, vendors=None):
+        """
+        정규화 결과 컬럼 (texts 와 같은 인덱스)
+
+        Parameters:
+        -----------
+        texts : pd.Series
+            적요 (결측은 '')
+        vendors : pd.Series, optional
+            거래처명 (없으면 텍스트만으로 정규화)
+        """
+        texts = str_column(texts)
+        if vendors is not None:
+            vendors = str_column(vendors).set_axis(texts.index)
+            keys = texts + _KEY_SEP + vendors
+        else:
+            keys = texts
+
+        codes, uniques = pd.factorize(keys, sort=False)
+        results = np.array([self._entries.get(key, _MISSING) for key in uniques], dtype=object)
+        missing = [pos for pos, value in enumerate(results) if value is _MISSING]
+
+        if missing:
+            # 고유 조합별 첫 등장 행
+            first = np.empty(len(uniques), dtype=np.int64)
+            first[codes[::-1]] = np.arange(len(codes))[::-1]
+            rows = first[missing]
+            computed = self.func(
+                texts.iloc[rows].reset_index(drop=True),
+                vendors.iloc[rows].reset_index(drop=True) if vendors is not None else None
+            )
+            for pos, value in zip(missing, computed):
+                value = value.item() if isinstance(value, np.generic) else value
+                results[pos] = value
+                self._entries[uniques[pos]] = value
+            self._dirty = True
+
+        self.rows += len(keys)
+        self.distinct += len(uniques)
+        self.computed += len(missing)
+        return pd.Series(results[codes] if len(codes) else [], index=texts.index, dtype=object)
+
+    def save(self):
+        """메모 저장 (새로 계산한 조합이 있을 때만)"""
+        if not self.persist or not self._dirty:
+            return
+        Path(self.memo_dir).mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': MEMO_VERSION,
+                'fingerprint': self.fingerprint,
+                'entries': self._entries,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def summary(self):
+        """중복 제거 통계 문자열"""
+        ratio = (1 - self.distinct / self.rows) * 100 if self.rows else 0
+        return (f"{self.name} 정규화: {self.rows:,}행 → 고유 {self.distinct:,}개 (중복 제거 {ratio:.1f}%), "
+                f"메모 재사용 {self.distinct - self.computed:,}개, 새로 계산 {self.computed:,}개")
+
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+연월(YYYYMM) 기간 표기 모듈
+목적: create_detail.py(--months), account_variance.py(--pair, 기간 비교), detail_search.py(--months) 가
+      같은 월 범위 해석을 쓰도록 YYYYMM 이동 / 범위 / 기간 표기 파싱을 한 곳에 둠
+
+  '202601'                → ['202601']
+  '202511-202601'         → ['202511', '202512', '202601']  (양 끝 포함, '~' 도 가능)
+  '202501+202503'         → ['202501', '202503']            (parse_period: 월 묶음)
+  ['202512', '202501,202502'] → ['202512', '202501', '202502'] (parse_months: 여러 지정, 입력 순서 유지)
+
+사용 예시:
+  from periods import parse_months, parse_period, period_label, shift_month
+  parse_period('202511-202601')   # ['202511', '202512', '202601']
+  shift_month('202601', -12)      # '202501'
+"""
+import re
+from collections import OrderedDict
+
+_PART_PATTERN = re.compile(r'(\d{6})(?:\s*[-~]\s*(\d{6}))?')
+
+
+def shift_month(yyyymm, months):
+    """YYYYMM 에서 months 개월 이동 (음수면 이전)"""
+    index = int(yyyymm[:4]) * 12 + int(yyyymm[4:]) - 1 + months
+    return f"{index // 12:04d}{index % 12 + 1:02d}"
+
+
+def month_range(start, end):
+    """YYYYMM 범위 (양 끝 포함)"""
+    if start > end:
+        raise ValueError(f"잘못된 월 범위입니다: {start}-{end}")
+    months = []
+    month = start
+    while month <= end:
+        months.append(month)
+        month = shift_month(month, 1)
+    return months
+
+
+def _parse_part(part):
+    """'YYYYMM' 또는 'YYYYMM-YYYYMM' → 월 목록"""
+    part = part.strip()
+    match = _PART_PATTERN.fullmatch(part)
+    if not match or not all(1 <= int(m[4:]) <= 12 for m in match.groups() if m):
+        raise ValueError(f"월 형식이 올바르지 않습니다 (YYYYMM 또는 YYYYMM-YYYYMM): {part}")
+    return month_range(match.group(1), match.group(2)) if match.group(2) else [match.group(1)]
+
+
+def parse_months(specs):
+    """
+    월 지정 목록 파싱 (각 항목은 '202512', '202501-202512', 쉼표 구분 가능) → 중복 제거된 월 목록 (입력 순서 유지)
+    """
+    months = []
+    for spec in specs:
+        for part in str(spec).split(','):
+            if part.strip():
+                months.extend(_parse_part(part))
+    return list(OrderedDict.fromkeys(months))
+
+
+def parse_period(spec):
+    """
+    기간 표기 → 정렬된 월 목록
+
+    '202601' → ['202601'], '202511-202601' → ['202511', '202512', '202601'], '202501+202503' → ['202501', '202503']
+    """
+    return sorted({month for part in str(spec).split('+') for month in _parse_part(part)})
+
+
+def period_label(months):
+    """월 목록 → 기간 표기 (연속이면 시작-끝)"""
+    months = sorted(months)
+    if len(months) == 1:
+        return months[0]
+    if months == month_range(months[0], months[-1]):
+        return f"{months[0]}-{months[-1]}"
+    return '+'.join(months)
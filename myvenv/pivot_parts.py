@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+피벗 증분 갱신 모듈
+목적: 원장(파일) × 연월(YYYYMM) 단위 부분 집계를 디스크(out/pivot_parts)에 보관하고,
+      원장에서 내용이 바뀐 연월 파티션만 다시 집계하여 통합 피벗 CSV에 병합.
+      월마감 때 새로 마감된 한 달만 다시 집계하면 되므로 전체 이력을 매번 피벗하지 않음.
+
+변경 감지:
+  1) 원장 파일 크기 + 수정시각(또는 SHA-256)이 매니페스트와 같으면 원장을 읽지 않고 기존 부분 집계 사용
+  2) 파일이 바뀌었으면 연월별 행 지문(계정/코스트센터/금액 해시)을 비교해 달라진 연월만 다시 집계
+
+매니페스트 항목과 부분 집계 파일은 원장 경로 기준 키(파일명 + 경로 해시)로 구분하므로
+같은 파일명의 원장이 다른 폴더에 있어도 서로 덮어쓰지 않음.
+
+사용 예시:
+  python excel.py --input 24공통비.XLSX 25공통비.XLSX 26공통비.XLSX --incremental
+  python run_monthly_update.py --month 202601 --incremental
+"""
+import datetime
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from ledger_cache import file_sha256, load_ledger
+from normalize import clean_amount_series, normalize_yyyymm_series
+
+PARTS_VERSION = 2
+DEFAULT_PARTS_DIRNAME = 'pivot_parts'
+
+GL_INDEX = ['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명']
+CCTR_INDEX = GL_INDEX + ['코스트 센터', '코스트센터명']
+REQUIRED_COLS = ['연도/월', 'G/L 계정', 'G/L 계정 설명', '금액(현지 통화)', '계정대분류', '계정중분류', '코스트 센터', '코스트센터명']
+
+
+def combine_pivots(pivots):
+    """
+    파일별 피벗(연월 컬럼)을 하나로 통합 - 같은 연월 컬럼은 합산, 컬럼은 정렬
+    (groupby(axis=1)는 pandas 2.1부터 deprecated 되어 전치 후 groupby 사용)
+    """
+    combined = pd.concat(pivots, axis=1)
+    combined = combined.T.groupby(level=0).sum().T
+    return combined.reindex(sorted(combined.columns), axis=1)
+
+
+def prepare_ledger(df):
+    """
+    피벗 집계용 원장 정제 (process_excel_to_pivot 의 2~5단계와 동일)
+    연월 정규화 → 연월 없는 행 제거 → 금액 정제 → 코스트센터 결측 '미배정'
+    """
+    missing_cols = [col for col in REQUIRED_COLS if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"필수 컬럼이 없습니다: {missing_cols}")
+
+    prepared = df[REQUIRED_COLS].copy()
+    prepared['YYYYMM'] = normalize_yyyymm_series(prepared['연도/월'])
+    prepared = prepared[prepared['YYYYMM'].notna()]
+    prepared['금액_정제'] = clean_amount_series(prepared['금액(현지 통화)'])
+    prepared['코스트 센터'] = prepared['코스트 센터'].fillna('미배정')
+    prepared['코스트센터명'] = prepared['코스트센터명'].fillna('미배정')
+    return prepared
+
+
+def month_fingerprints(prepared):
+    """
+    연월별 행 지문 (집계에 쓰이는 컬럼 + 행 순서 기준)
+
+    Returns:
+    --------
+    dict : {YYYYMM: (sha256 앞 32자, 행 수)}
+    """
+    row_hashes = pd.util.hash_pandas_object(prepared[CCTR_INDEX + ['금액_정제']], index=False).to_numpy()
+    positions = pd.Series(range(len(prepared))).groupby(prepared['YYYYMM'].to_numpy(), sort=True)
+
+    fingerprints = {}
+    for yyyymm, pos in positions:
+        digest = hashlib.sha256(row_hashes[pos.to_numpy()].tobytes()).hexdigest()[:32]
+        fingerprints[yyyymm] = (digest, len(pos))
+    return fingerprints
+
+
+def aggregate_month(month_rows):
+    """한 달치 원장 → 계정별 / 계정+코스트센터별 부분 집계 (long 형식 Series)"""
+    return {
+        'gl': month_rows.groupby(GL_INDEX)['금액_정제'].sum(),
+        'cctr': month_rows.groupby(CCTR_INDEX)['금액_정제'].sum(),
+    }
+
+
+def _parts_to_pivot(parts, index_cols):
+    """
+    부분 집계(연월별 long Series)를 process_excel_to_pivot 와 같은 피벗 형태로 변환
+    (같은 pivot_table 로 만들어 행 정렬/0 채우기가 전체 재계산 결과와 동일)
+    """
+    long_df = pd.concat(
+        [series.rename('금액_정제').reset_index().assign(YYYYMM=yyyymm) for yyyymm, series in parts],
+        ignore_index=True
+    )
+    pivot = long_df.pivot_table(index=index_cols, columns='YYYYMM', values='금액_정제',
+                                aggfunc='sum', fill_value=0)
+    return pivot.reindex(sorted(pivot.columns), axis=1)
+
+
+def _manifest_path(parts_dir):
+    return Path(parts_dir) / 'manifest.json'
+
+
+def load_manifest(parts_dir):
+    """부분 집계 매니페스트 로드 (없거나 버전이 다르면 빈 매니페스트)"""
+    path = _manifest_path(parts_dir)
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == PARTS_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+    return {'version': PARTS_VERSION, 'files': {}}
+
+
+def save_manifest(parts_dir, manifest):
+    """매니페스트 저장 (임시 파일 후 교체)"""
+    path = _manifest_path(parts_dir)
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _file_key(file_path):
+    """원장 경로 기준 키 (ledger_cache._cache_key 와 같이 파일명 + 해석된 경로 해시)"""
+    resolved = str(Path(file_path).resolve())
+    path_hash = hashlib.sha1(resolved.encode('utf-8')).hexdigest()[:8]
+    return f"{Path(file_path).stem}_{path_hash}"
+
+
+def _part_filename(file_path, yyyymm):
+    return f"{_file_key(file_path)}_{yyyymm}.pkl"
+
+
+def _source_unchanged(entry, file_path, parts_dir):
+    """원장 파일이 매니페스트 기록과 같고 부분 집계 파일이 모두 있는지"""
+    if not entry or not os.path.exists(file_path):
+        return False
+    if not all((Path(parts_dir) / m['part']).exists() for m in entry['months'].values()):
+        return False
+
+    stat = os.stat(file_path)
+    if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return True
+    if entry['sha256'] == file_sha256(file_path):
+        entry['size'] = stat.st_size
+        entry['mtime_ns'] = stat.st_mtime_ns
+        return True
+    return False
+
+
+def refresh_file_parts(file_path, manifest, parts_dir, use_cache=True, df=None):
+    """
+    원장 1개의 연월 파티션 갱신
+
+    Parameters:
+    -----------
+    file_path : str
+        원장 엑셀 파일 경로
+    manifest : dict
+        load_manifest() 결과 (이 함수에서 갱신됨)
+    parts_dir : str
+        부분 집계 저장 디렉토리
+    use_cache : bool
+        원장 캐시(Parquet 스냅샷) 사용 여부
+    df : pd.DataFrame, optional
+        이미 로드된 원장 (파일이 바뀌었을 때만 사용)
+
+    Returns:
+    --------
+    dict : {'recomputed': [YYYYMM, ...], 'reused': [...], 'removed': [...]}
+    """
+    name = os.path.basename(file_path)
+    key = _file_key(file_path)
+    entry = manifest['files'].get(key)
+
+    if _source_unchanged(entry, file_path, parts_dir):
+        print(f"   ✓ {name}: 원장 변경 없음 → 부분 집계 {len(entry['months'])}개월 재사용")
+        return {'recomputed': [], 'reused': sorted(entry['months']), 'removed': []}
+
+    if df is None:
+        df = load_ledger(file_path, use_cache=use_cache)
+    prepared = prepare_ledger(df)
+    fingerprints = month_fingerprints(prepared)
+
+    old_months = entry['months'] if entry else {}
+    result = {'recomputed': [], 'reused': [], 'removed': sorted(set(old_months) - set(fingerprints))}
+    months = {}
+
+    month_groups = None
+    for yyyymm, (fingerprint, rows) in fingerprints.items():
+        old = old_months.get(yyyymm)
+        if old and old['fingerprint'] == fingerprint and (Path(parts_dir) / old['part']).exists():
+            months[yyyymm] = old
+            result['reused'].append(yyyymm)
+            continue
+
+        if month_groups is None:
+            month_groups = prepared.groupby('YYYYMM', sort=True)
+        part = _part_filename(file_path, yyyymm)
+        pd.to_pickle(aggregate_month(month_groups.get_group(yyyymm)), Path(parts_dir) / part)
+        months[yyyymm] = {'fingerprint': fingerprint, 'rows': rows, 'part': part}
+        result['recomputed'].append(yyyymm)
+
+    for yyyymm in result['removed']:
+        old_path = Path(parts_dir) / old_months[yyyymm]['part']
+        if old_path.exists():
+            old_path.unlink()
+
+    stat = os.stat(file_path)
+    manifest['files'][key] = {
+        'source': str(Path(file_path).resolve()),
+        'sha256': file_sha256(file_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'months': months,
+        'updated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+
+    print(f"   ✓ {name}: 재집계 {len(result['recomputed'])}개월 {result['recomputed']}, "
+          f"재사용 {len(result['reused'])}개월"
+          + (f", 삭제 {result['removed']}" if result['removed'] else ''))
+    return result
+
+
+def load_file_pivots(file_path, manifest, parts_dir):
+    """원장 1개의 부분 집계를 읽어 process_excel_to_pivot 결과와 같은 {'gl', 'cctr'} 피벗 생성"""
+    entry = manifest['files'][_file_key(file_path)]
+    parts = [(yyyymm, pd.read_pickle(Path(parts_dir) / m['part'])) for yyyymm, m in sorted(entry['months'].items())]
+
+    pivot_gl = _parts_to_pivot([(yyyymm, p['gl']) for yyyymm, p in parts], GL_INDEX)
+    pivot_cctr = _parts_to_pivot([(yyyymm, p['cctr']) for yyyymm, p in parts], CCTR_INDEX)
+    return {'gl': pivot_gl, 'cctr': pivot_cctr}
+
+
+def refresh_pivots_incremental(file_list, output_dir='./out', use_cache=True, ledgers=None, parts_dir=None):
+    """
+    증분 모드 피벗 갱신 (process_multiple_files 와 같은 CSV 출력)
+
+    Parameters:
+    -----------
+    file_list : list
+        원장 엑셀 파일 목록
+    output_dir : str
+        출력 디렉토리 (기본값: ./out)
+    use_cache : bool
+        원장 캐시(Parquet 스냅샷) 사용 여부
+    ledgers : dict, optional
+        {파일 경로: 로드된 원장 DataFrame}
+    parts_dir : str, optional
+        부분 집계 디렉토리 (기본값: {output_dir}/pivot_parts)
+
+    Returns:
+    --------
+    dict : {'gl': 통합 계정별 피벗, 'cctr': 통합 계정+코스트센터별 피벗, 'refreshed': {파일 경로: 갱신 결과}}
+    """
+    ledgers = ledgers or {}
+    parts_dir = parts_dir or os.path.join(output_dir, DEFAULT_PARTS_DIRNAME)
+    Path(parts_dir).mkdir(parents=True, exist_ok=True)
+
+    print(f"\n{'='*80}")
+    print("피벗 증분 갱신 (변경된 연월만 재집계)")
+    print(f"{'='*80}\n")
+
+    start = time.perf_counter()
+    manifest = load_manifest(parts_dir)
+    files = []
+    refreshed = {}
+
+    print("1. 연월 파티션 변경 확인 중...")
+    for file_path in file_list:
+        if file_path not in ledgers and not os.path.exists(file_path):
+            print(f"⚠ 파일을 찾을 수 없습니다: {file_path}")
+            continue
+        refreshed[file_path] = refresh_file_parts(
+            file_path, manifest, parts_dir, use_cache=use_cache, df=ledgers.get(file_path)
+        )
+        files.append(file_path)
+    save_manifest(parts_dir, manifest)
+
+    if not files:
+        return None
+
+    print("\n2. 부분 집계 병합 중...")
+    pivots = [load_file_pivots(file_path, manifest, parts_dir) for file_path in files]
+
+    # 원장별 피벗 (전체 재계산 시 마지막 파일 기준으로 남는 것과 동일)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    pivots[-1]['gl'].to_csv(os.path.join(output_dir, 'pivot_by_gl_yyyymm.csv'), encoding='utf-8-sig')
+    pivots[-1]['cctr'].to_csv(os.path.join(output_dir, 'pivot_by_gl_cctr_yyyymm.csv'), encoding='utf-8-sig')
+
+    # 전체 재계산과 동일하게 계정별 피벗에 원장별 총합 컬럼 추가 후 통합
+    for pivot in pivots:
+        pivot['gl']['총합'] = pivot['gl'].sum(axis=1)
+
+    if len(pivots) == 1:
+        result = pivots[0]
+    else:
+        result = {
+            'gl': combine_pivots([p['gl'] for p in pivots]),
+            'cctr': combine_pivots([p['cctr'] for p in pivots]),
+        }
+        output_file_gl = os.path.join(output_dir, 'pivot_by_gl_yyyymm_combined.csv')
+        output_file_cctr = os.path.join(output_dir, 'pivot_by_gl_cctr_yyyymm_combined.csv')
+        result['gl'].to_csv(output_file_gl, encoding='utf-8-sig')
+        result['cctr'].to_csv(output_file_cctr, encoding='utf-8-sig')
+        print(f"   ✓ 계정별 통합 파일 저장: {output_file_gl} ({len(result['gl'])}개 계정)")
+        print(f"   ✓ 계정+코스트센터별 통합 파일 저장: {output_file_cctr} ({len(result['cctr'])}개 조합)")
+
+    recomputed = sum(len(r['recomputed']) for r in refreshed.values())
+    reused = sum(len(r['reused']) for r in refreshed.values())
+    print(f"\n   재집계 {recomputed}개월 / 재사용 {reused}개월 ({time.perf_counter() - start:.2f}초)")
+
+    result['refreshed'] = refreshed
+    return result
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+단계별 소요 시간 계측 모듈
+목적: 스크립트마다 "1. 엑셀 파일 읽는 중..." 같은 진행 메시지만 있고 시간이 없어
+      read_excel / pivot_table / to_csv / 계정별 파일 루프 중 어디가 오래 걸리는지 알 수 없음.
+      with span('이름'): 블록마다 경과 시간 / CPU 시간 / 처리 행 수 / 프로세스 최대 메모리(RSS)를 기록하고,
+      --trace 로 JSON 트레이스(chrome://tracing, Perfetto 에서 열 수 있는 trace event 형식)와 요약표,
+      --profile 로 cProfile 통계를 저장.
+
+  - span 기록은 항상 켜져 있고 (블록당 수 마이크로초), 출력/저장은 --trace / --profile 을 줄 때만 함
+  - 스레드마다 따로 중첩 관계를 기록 (AI 분석 동시 요청), CPU 시간도 해당 스레드 기준
+  - 병렬 처리 워커 프로세스(excel.py --workers)의 span 은 메인 프로세스에 모이지 않음
+
+사용 예시:
+  from profiling import span, traced
+
+  with span('excel.load') as s:
+      df = load_ledger(input_file)
+      s.rows = len(df)
+
+  @traced('excel.process_excel_to_pivot')
+  def process_excel_to_pivot(...): ...
+
+  # CLI (add_profiling_arguments / profiling_session 을 쓰는 스크립트)
+  python excel.py --input 25공통비.XLSX --trace out/trace.json
+  python run_monthly_update.py --month 202601 --profile out/profile.prof
+"""
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 최대 메모리(RSS): Linux/macOS 는 resource, Windows 는 psutil 이 있으면 사용
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_PROFILE_PATH = './out/profile.prof'
+PROFILE_TOP = 25
+
+_spans = []
+_lock = threading.Lock()
+_local = threading.local()
+_origin = time.perf_counter()
+
+
+def peak_rss_mb():
+    """프로세스 시작 이후 최대 메모리(RSS, MB) - 측정할 수 없으면 None"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 는 KB, macOS 는 bytes
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024 / 1024
+    return None
+
+
+class Span:
+    """계측 구간 1개 (with span(...) as s: 블록 안에서 s.rows 지정 가능)"""
+
+    __slots__ = ('name', 'parent', 'depth', 'thread', 'start', 'wall', 'cpu', 'rows', 'peak_rss_mb', 'attrs')
+
+    def __init__(self, name, parent, depth, rows=None, attrs=None):
+        self.name = name
+        self.parent = parent
+        self.depth = depth
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.wall = None
+        self.cpu = None
+        self.rows = rows
+        self.peak_rss_mb = None
+        self.attrs = attrs or {}
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'parent': self.parent,
+            'depth': self.depth,
+            'thread': self.thread,
+            'start': self.start - _origin,
+            'wall': self.wall,
+            'cpu': self.cpu,
+            'rows': self.rows,
+            'peak_rss_mb': self.peak_rss_mb,
+            **({'attrs': self.attrs} if self.attrs else {}),
+        }
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+@contextlib.contextmanager
+def span(name, rows=None, **attrs):
+    """
+    계측 구간
+
+    Parameters:
+    -----------
+    name : str
+        구간 이름 (예: 'excel.pivot_gl')
+    rows : int, optional
+        처리 행 수 (블록 안에서 s.rows = ... 로 지정해도 됨)
+    attrs :
+        트레이스에 함께 남길 값 (예: file='25공통비.XLSX')
+    """
+    stack = _stack()
+    current = Span(name, stack[-1].name if stack else None, len(stack), rows, attrs)
+    stack.append(current)
+    cpu_start = time.thread_time()
+    try:
+        yield current
+    finally:
+        current.cpu = time.thread_time() - cpu_start
+        current.wall = time.perf_counter() - current.start
+        current.peak_rss_mb = peak_rss_mb()
+        stack.pop()
+        with _lock:
+            _spans.append(current)
+
+
+def traced(name):
+    """함수 전체를 span 으로 감싸는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def spans():
+    """기록된 구간 목록 (끝난 순서)"""
+    with _lock:
+        return [s.to_dict() for s in _spans]
+
+
+def reset():
+    """기록된 구간 삭제"""
+    with _lock:
+        _spans.clear()
+
+
+def summary_rows():
+    """
+    구간 이름별 집계 (처음 시작한 순서)
+
+    Returns:
+    --------
+    list : [{'name', 'depth', 'count', 'wall', 'cpu', 'rows', 'rows_per_sec', 'peak_rss_mb'}, ...]
+    """
+    grouped = {}
+    for s in sorted(spans(), key=lambda s: s['start']):
+        row = grouped.setdefault(s['name'], {'name': s['name'], 'depth': s['depth'], 'count': 0, 'wall': 0.0,
+                                             'cpu': 0.0, 'rows': None, 'peak_rss_mb': None})
+        row['count'] += 1
+        row['wall'] += s['wall']
+        row['cpu'] += s['cpu']
+        if s['rows'] is not None:
+            row['rows'] = (row['rows'] or 0) + s['rows']
+        if s['peak_rss_mb'] is not None:
+            row['peak_rss_mb'] = max(row['peak_rss_mb'] or 0, s['peak_rss_mb'])
+    for row in grouped.values():
+        row['rows_per_sec'] = row['rows'] / row['wall'] if row['rows'] and row['wall'] > 0 else None
+    return list(grouped.values())
+
+
+def print_summary():
+    """구간별 소요 시간 요약표 출력"""
+    rows = summary_rows()
+    if not rows:
+        return
+    print(f"\n{'='*80}")
+    print("구간별 소요 시간")
+    print(f"{'='*80}")
+    print(f"  {'구간':<40}{'횟수':>5}{'경과':>10}{'CPU':>10}{'행/초':>12}{'최대 RSS':>11}")
+    for row in rows:
+        name = f"{'  ' * row['depth']}{row['name']}"
+        speed = f"{row['rows_per_sec']:,.0f}" if row['rows_per_sec'] else '-'
+        rss = f"{row['peak_rss_mb']:,.0f}MB" if row['peak_rss_mb'] is not None else '-'
+        print(f"  {name:<40}{row['count']:>5}{row['wall']:>9.2f}초{row['cpu']:>9.2f}초{speed:>12}{rss:>11}")
+
+
+def write_trace(path):
+    """
+    JSON 트레이스 저장 (trace event 형식 - chrome://tracing / https://ui.perfetto.dev 에서 열기)
+
+    traceEvents 외에 spans(구간 원본 기록), summary(구간 이름별 집계)도 함께 저장
+    """
+    records = spans()
+    threads = {name: i for i, name in enumerate(dict.fromkeys(s['thread'] for s in records))}
+    events = [{
+        'name': s['name'],
+        'ph': 'X',
+        'ts': round(s['start'] * 1e6),
+        'dur': round(s['wall'] * 1e6),
+        'pid': os.getpid(),
+        'tid': threads[s['thread']],
+        'args': {k: s[k] for k in ('cpu', 'rows', 'peak_rss_mb') if s[k] is not None} | s.get('attrs', {}),
+    } for s in records]
+    events += [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+               for name, tid in threads.items()]
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'spans': records, 'summary': summary_rows()}, f,
+                  ensure_ascii=False, indent=1, default=str)
+    return path
+
+
+def add_profiling_arguments(parser):
+    """argparse 에 --trace / --profile 옵션 추가"""
+    parser.add_argument('--trace', metavar='PATH',
+                        help='구간별 소요 시간 JSON 트레이스 저장 + 요약표 출력 (예: out/trace.json)')
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_PROFILE_PATH, metavar='PATH',
+                        help=f'cProfile 통계 저장 + 상위 함수 출력 (기본 경로: {DEFAULT_PROFILE_PATH})')
+
+
+@contextlib.contextmanager
+def profiling_session(args):
+    """
+    --trace / --profile 옵션 처리 (main 전체를 감쌈, 옵션이 없으면 아무것도 하지 않음)
+
+    예외나 sys.exit 로 끝나도 그때까지의 기록은 저장
+    """
+    trace_path = getattr(args, 'trace', None)
+    profile_path = getattr(args, 'profile', None)
+    profiler = cProfile.Profile() if profile_path else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            Path(profile_path).parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(profile_path)
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(PROFILE_TOP)
+            print(f"\n{'='*80}")
+            print(f"cProfile 상위 {PROFILE_TOP}개 (누적 시간 기준) - 전체 통계: {profile_path}")
+            print(f"{'='*80}")
+            print(text.getvalue())
+            print(f"   (python -m pstats {profile_path} 또는 snakeviz 로 자세히 보기)")
+        if trace_path or profile_path:
+            print_summary()
+        if trace_path:
+            write_trace(trace_path)
+            print(f"\n✓ 트레이스 저장: {trace_path} (chrome://tracing 또는 https://ui.perfetto.dev 에서 열기)")
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
-import pandas as pd
 import sys
 import io
 from excel import process_excel_to_pivot
+from ledger_cache import load_ledger
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -11,7 +11,7 @@ print("📊 25공통비.XLSX 재처리")
 print("=" * 80)
 
 # 먼저 원본 데이터 확인
-df = pd.read_excel('25공통비.XLSX')
+df = load_ledger('25공통비.XLSX')
 print(f"\n원본 데이터 행 수: {len(df):,}")
 
 # 연도/월 컬럼 확인
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+대시보드 계층별 롤업(사전 집계) 모듈
+목적: Next.js API(kpi, hierarchy, drilldown, costcenter-analysis, filter-options)와 test_drilldown_logic.py 는
+      요청마다 pivot_by_gl_cctr_yyyymm_combined.csv 전체를 읽어 대분류 → 중분류 → G/L 계정 groupby 와
+      1~N월 누계 / 전년 동월 비교를 다시 계산함.
+      excel.py 통합 피벗 생성 시 계층별 롤업을 월별 / 누계(YTD) / 전년 대비(YoY) 컬럼까지 미리 계산해
+      out/rollups/rollup_{레벨}.csv 로 저장 → 드릴다운은 행 조회만 하면 됨.
+
+레벨 (인덱스):
+  major  : 계정대분류
+  middle : 계정대분류, 계정중분류
+  gl     : 계정대분류, 계정중분류, G/L 계정, G/L 계정 설명
+  cctr   : 코스트 센터, 코스트센터명, 계정대분류  (코스트센터별 비용 구성 / 코스트센터 필터 KPI)
+
+컬럼 (YYYYMM 마다):
+  {YYYYMM}          월 금액
+  YTD_{YYYYMM}      해당 연도 1월 ~ 해당 월 누계
+  YoY_{YYYYMM}      전년 동월 대비 증감 (월 금액 - 전년 동월 금액)
+  YTD_YoY_{YYYYMM}  전년 동기 누계 대비 증감
+  (전년 데이터가 아예 없는 연도의 YoY 는 빈 값)
+
+사용 예시:
+  from rollups import build_rollups, save_rollups
+  save_rollups(build_rollups(combined_cctr), './out')
+
+  # 1~11월 누계 (YTD_ 컬럼 조회)
+  ytd_column(rollup, '202511')
+
+  # 통합 피벗 CSV에서 롤업만 다시 생성
+  python rollups.py
+  python rollups.py --input out/pivot_by_gl_cctr_yyyymm_combined.csv --outdir ./out
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_ROLLUP_DIRNAME = 'rollups'
+
+ROLLUP_LEVELS = {
+    'major': ['계정대분류'],
+    'middle': ['계정대분류', '계정중분류'],
+    'gl': ['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명'],
+    'cctr': ['코스트 센터', '코스트센터명', '계정대분류'],
+}
+
+CCTR_INDEX = ['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명', '코스트 센터', '코스트센터명']
+
+
+def month_columns(pivot):
+    """피벗 컬럼 중 연월(YYYYMM) 컬럼만 ('총합' 등 제외)"""
+    return [c for c in pivot.columns if len(str(c)) == 6 and str(c).isdigit()]
+
+
+def _full_months(columns):
+    """연월 컬럼 → 첫 연도 1월 ~ 마지막 연도 12월 전체 연월 목록과 데이터가 있는 연도"""
+    years = sorted({int(str(c)[:4]) for c in columns})
+    full = [f"{year}{month:02d}" for year in range(years[0], years[-1] + 1) for month in range(1, 13)]
+    return full, set(years)
+
+
+def ytd_matrix(pivot, columns=None):
+    """
+    월 금액 → 연도별 누계 (YTD) 행렬 (같은 인덱스 / 연월 컬럼)
+
+    중간에 빠진 연월은 0으로 보고 누계 (연도 × 12개월 행렬로 펼친 뒤 cumsum 한 번)
+
+    Parameters:
+    -----------
+    pivot : pd.DataFrame
+        연월(YYYYMM) 컬럼 피벗
+    columns : list, optional
+        결과 연월 컬럼 (기본값: pivot 의 연월 컬럼, 데이터가 없는 연도의 연월은 NaN)
+    """
+    source = month_columns(pivot)
+    columns = source if columns is None else list(columns)
+    if not source:
+        return pd.DataFrame(np.nan, index=pivot.index, columns=columns)
+    full, _ = _full_months(source)
+    values = pivot[source].reindex(columns=full, fill_value=0).to_numpy(dtype=float)
+    cumulative = values.reshape(len(pivot), -1, 12).cumsum(axis=2).reshape(len(pivot), -1)
+    return pd.DataFrame(cumulative, index=pivot.index, columns=full).reindex(columns=columns)
+
+
+def ytd_column(rollup, yyyymm):
+    """
+    롤업/피벗에서 1월 ~ yyyymm 누계 컬럼 (YTD_ 컬럼이 있으면 그대로 읽고, 없으면 월 컬럼으로 계산, 결측은 0)
+    """
+    column = f"YTD_{yyyymm}"
+    if column in rollup.columns:
+        return rollup[column].fillna(0)
+    return ytd_matrix(rollup, columns=[yyyymm])[yyyymm].fillna(0)
+
+
+def yoy_delta(matrix, columns=None):
+    """
+    연월 행렬 → 전년 동월 대비 증감 (같은 인덱스 / 연월 컬럼)
+
+    전년 동월 컬럼이 없으면 0으로 보고, 전년 데이터가 아예 없는 연도는 NaN
+
+    Parameters:
+    -----------
+    matrix : pd.DataFrame
+        연월(YYYYMM) 컬럼 행렬 (월 금액 또는 ytd_matrix 결과)
+    columns : list, optional
+        결과 연월 컬럼 (기본값: matrix 의 연월 컬럼)
+    """
+    source = month_columns(matrix)
+    columns = source if columns is None else list(columns)
+    if not source:
+        return pd.DataFrame(np.nan, index=matrix.index, columns=columns)
+    full, years = _full_months(source)
+    values = matrix[source].reindex(columns=full, fill_value=0).to_numpy(dtype=float)
+    previous = np.full_like(values, np.nan)
+    previous[:, 12:] = values[:, :-12]
+    for i, yyyymm in enumerate(full):
+        if int(yyyymm[:4]) - 1 not in years:
+            previous[:, i] = np.nan
+    return pd.DataFrame(values - previous, index=matrix.index, columns=full).reindex(columns=columns)
+
+
+def with_period_columns(pivot):
+    """월 금액 피벗 → 월 / YTD_ / YoY_ / YTD_YoY_ 컬럼 추가"""
+    monthly = pivot[month_columns(pivot)].astype(float)
+    ytd = ytd_matrix(monthly)
+    return pd.concat([
+        monthly,
+        ytd.add_prefix('YTD_'),
+        yoy_delta(monthly).add_prefix('YoY_'),
+        yoy_delta(ytd).add_prefix('YTD_YoY_'),
+    ], axis=1)
+
+
+def build_rollups(pivot_cctr, levels=None):
+    """
+    계정+코스트센터별 피벗 → 레벨별 롤업
+
+    Parameters:
+    -----------
+    pivot_cctr : pd.DataFrame
+        인덱스 (계정대분류, 계정중분류, G/L 계정, G/L 계정 설명, 코스트 센터, 코스트센터명), 컬럼 YYYYMM
+        (excel.process_multiple_files 의 통합 피벗 또는 CSV 를 읽은 DataFrame)
+    levels : list, optional
+        생성할 레벨 (기본값: ROLLUP_LEVELS 전체)
+
+    Returns:
+    --------
+    dict : {레벨: 롤업 DataFrame}
+    """
+    if list(pivot_cctr.index.names) != CCTR_INDEX:
+        pivot_cctr = pivot_cctr.set_index(CCTR_INDEX)
+    monthly = pivot_cctr[month_columns(pivot_cctr)]
+
+    rollups = {}
+    for level in levels or ROLLUP_LEVELS:
+        grouped = monthly.groupby(level=ROLLUP_LEVELS[level], sort=True).sum()
+        rollups[level] = with_period_columns(grouped)
+    return rollups
+
+
+def save_rollups(rollups, output_dir='./out'):
+    """롤업 CSV 저장 → {output_dir}/rollups/rollup_{레벨}.csv"""
+    rollup_dir = Path(output_dir) / DEFAULT_ROLLUP_DIRNAME
+    rollup_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for level, rollup in rollups.items():
+        paths[level] = rollup_dir / f"rollup_{level}.csv"
+        rollup.to_csv(paths[level], encoding='utf-8-sig')
+    return paths
+
+
+def write_rollups(pivot_cctr, output_dir='./out'):
+    """통합 피벗 → 롤업 생성 + 저장 + 요약 출력"""
+    paths = save_rollups(build_rollups(pivot_cctr), output_dir)
+    print(f"   ✓ 계층별 롤업 저장: {os.path.join(output_dir, DEFAULT_ROLLUP_DIRNAME)} "
+          f"({', '.join(paths)} - 월/YTD/YoY)")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='통합 피벗 CSV → 계층별 롤업 CSV (월/YTD/YoY)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python rollups.py
+  python rollups.py --input out/pivot_by_gl_cctr_yyyymm_combined.csv --outdir ./out
+        """
+    )
+    parser.add_argument('--input', '-i', default='./out/pivot_by_gl_cctr_yyyymm_combined.csv',
+                        help='계정+코스트센터별 통합 피벗 CSV (기본값: ./out/pivot_by_gl_cctr_yyyymm_combined.csv)')
+    parser.add_argument('--outdir', '-o', default='./out', help='출력 디렉토리 (기본값: ./out)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ 파일을 찾을 수 없습니다: {args.input}")
+        sys.exit(1)
+
+    pivot_cctr = pd.read_csv(args.input, encoding='utf-8-sig', dtype={c: str for c in CCTR_INDEX})
+    pivot_cctr.columns = [str(c) for c in pivot_cctr.columns]
+    write_rollups(pivot_cctr, args.outdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+월마감 데이터 일괄 갱신 파이프라인
+목적: 공통비 원장(XLSX)을 파일당 한 번만 로드하고, 같은 DataFrame을
+      피벗 / 상세 / IT사용료·IT유지보수비·지급수수료 / AI 분석 단계에 넘겨 의존관계(DAG) 순서로 실행.
+      단계별 소요 시간을 마지막에 출력.
+
+기존 방식 (스크립트마다 원장을 다시 읽음):
+  run_excel_process.py → create_detail_2025xx.py → extract_it_usage_v2.py → extract_it_maintenance.py
+  → extract_commission.py → extract_2026_it_data.py → create_account_analysis_with_ai.py
+"""
+import argparse
+import os
+import sys
+import time
+import traceback
+
+import pandas as pd
+
+from ledger_cache import load_ledger
+from excel import process_multiple_files
+from create_detail import create_details
+from extract_categories import extract_categories
+from extract_2026_it_data import extract_2026_it_data
+from profiling import add_profiling_arguments, profiling_session, span
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_FILES = ['24공통비.XLSX', '25공통비.XLSX', '26공통비.XLSX']
+
+
+def previous_year_month(yyyymm):
+    """전년 동월 (예: '202512' → '202412')"""
+    return f"{int(yyyymm[:4]) - 1}{yyyymm[4:]}"
+
+
+def build_stages(files, month, detail_months, output_dir='./out', use_cache=True, incremental=False,
+                 ai_concurrency=None, columnar=False, ai_batch_size=None):
+    """
+    파이프라인 단계 정의
+
+    Returns:
+    --------
+    dict : {단계명: {'deps': [선행 단계명, ...], 'func': func(ctx)}}
+        ctx['ledgers'] = {파일 경로: 원장 DataFrame}, ctx['details'] = {YYYYMM: 상세 DataFrame}
+    ai_concurrency : int, optional
+        AI 분석 동시 요청 수 (없으면 create_account_analysis_with_ai 기본값)
+    ai_batch_size : int, optional
+        AI 분석 요청 1건에 묶을 계정 수 (없으면 계정별 요청)
+    columnar : bool
+        True면 IT사용료/IT유지보수비/지급수수료 컬럼형 JSON(*.columnar.json)도 저장
+    """
+    stages = {}
+    load_stages = []
+
+    def make_loader(file_path):
+        def load(ctx):
+            ctx['ledgers'][file_path] = load_ledger(file_path, use_cache=use_cache)
+            return len(ctx['ledgers'][file_path])
+        return load
+
+    for file_path in files:
+        name = f"load:{os.path.basename(file_path)}"
+        stages[name] = {'deps': [], 'func': make_loader(file_path)}
+        load_stages.append(name)
+
+    def by_basename(ledgers):
+        # 추출 스크립트는 '24공통비.XLSX' 같은 파일명 기준으로 원장을 찾음
+        return {os.path.basename(path): df for path, df in ledgers.items()}
+
+    def pivot(ctx):
+        loaded = [f for f in files if f in ctx['ledgers']]
+        process_multiple_files(loaded, output_dir=output_dir, use_cache=use_cache, ledgers=ctx['ledgers'],
+                               incremental=incremental)
+
+    def detail(ctx):
+        ctx['details'].update(create_details(
+            detail_months, files=list(ctx['ledgers']),
+            output_dir=os.path.join(output_dir, 'details'),
+            ledgers=ctx['ledgers']
+        ))
+
+    def categories(ctx):
+        # IT사용료 / IT유지보수비 / 지급수수료를 원장 1회 스캔으로 함께 추출
+        extract_categories(ledgers=by_basename(ctx['ledgers']), columnar=columnar)
+
+    def it_2026(ctx):
+        frames = [df for m, df in sorted(ctx['details'].items()) if m.startswith('2026') and df is not None]
+        extract_2026_it_data(detail_df=pd.concat(frames, ignore_index=True) if frames else None, columnar=columnar)
+
+    def ai_analysis(ctx):
+        # OpenAI 키 로드/클라이언트 생성이 import 시점에 일어나므로 이 단계에서만 import
+        import create_account_analysis_with_ai
+        previous_month = previous_year_month(month)
+        options = {'concurrency': ai_concurrency} if ai_concurrency else {}
+        if ai_batch_size:
+            options['batch_size'] = ai_batch_size
+        create_account_analysis_with_ai.analyze_account_details(
+            month, previous_month,
+            current_df=ctx['details'].get(month),
+            previous_df=ctx['details'].get(previous_month),
+            **options
+        )
+
+    stages['pivot'] = {'deps': load_stages, 'func': pivot}
+    stages['detail'] = {'deps': load_stages, 'func': detail}
+    stages['categories'] = {'deps': load_stages, 'func': categories}
+    stages['it-2026'] = {'deps': ['detail', 'categories'], 'func': it_2026}
+    stages['ai-analysis'] = {'deps': ['detail'], 'func': ai_analysis}
+    return stages
+
+
+def topological_order(stages):
+    """단계 실행 순서 (정의 순서를 유지하는 위상 정렬)"""
+    order = []
+    done = set()
+    pending = list(stages)
+    while pending:
+        ready = [name for name in pending if all(dep in done or dep not in stages for dep in stages[name]['deps'])]
+        if not ready:
+            raise ValueError(f"단계 의존관계에 순환이 있습니다: {pending}")
+        for name in ready:
+            order.append(name)
+            done.add(name)
+            pending.remove(name)
+    return order
+
+
+def run_pipeline(stages, skip=()):
+    """
+    DAG 순서로 단계 실행. 실패한 단계에 의존하는 단계는 건너뜀.
+
+    Returns:
+    --------
+    list : [{'stage', 'status', 'seconds', 'result'}, ...]
+    """
+    ctx = {'ledgers': {}, 'details': {}}
+    status = {}
+    report = []
+
+    for name in topological_order(stages):
+        blocked = [dep for dep in stages[name]['deps'] if status.get(dep) not in ('ok', None)]
+        if name in skip or blocked:
+            status[name] = 'skipped'
+            report.append({'stage': name, 'status': 'skipped', 'seconds': 0.0, 'result': None})
+            continue
+
+        print(f"\n{'#'*80}")
+        print(f"▶ 단계 실행: {name}")
+        print(f"{'#'*80}")
+
+        start = time.perf_counter()
+        try:
+            with span(f"stage.{name}"):
+                result = stages[name]['func'](ctx)
+            status[name] = 'ok'
+        except (Exception, SystemExit) as e:
+            result = None
+            status[name] = 'failed'
+            print(f"\n❌ {name} 단계 실패: {e}")
+            traceback.print_exc()
+        report.append({
+            'stage': name,
+            'status': status[name],
+            'seconds': time.perf_counter() - start,
+            'result': result,
+        })
+
+    return report
+
+
+def print_report(report):
+    """단계별 소요 시간 출력"""
+    total = sum(r['seconds'] for r in report)
+    print(f"\n{'='*80}")
+    print("단계별 소요 시간")
+    print(f"{'='*80}")
+    for r in report:
+        mark = {'ok': '✓', 'failed': '✗', 'skipped': '-'}[r['status']]
+        extra = f" ({r['result']:,}행)" if isinstance(r['result'], int) else ''
+        print(f"  {mark} {r['stage']:<28} {r['seconds']:8.2f}초  {r['status']}{extra}")
+    print(f"  {'합계':<30} {total:8.2f}초")
+
+
+def main():
+    """
+    메인 함수: CLI 인터페이스
+    """
+    parser = argparse.ArgumentParser(
+        description='월마감 데이터 일괄 갱신 (원장 1회 로드 → 피벗/상세/추출/AI 분석)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  # 2025년 12월 마감 (상세: 202512, 202412 / AI 분석: 202512 vs 202412)
+  python run_monthly_update.py --month 202512
+
+  # AI 분석 제외
+  python run_monthly_update.py --month 202512 --skip ai-analysis
+
+  # 피벗은 변경된 연월만 다시 집계
+  python run_monthly_update.py --month 202601 --incremental
+
+  # AI 분석 동시 요청 8개
+  python run_monthly_update.py --month 202512 --ai-concurrency 8
+
+  # AI 분석 요청 1건에 계정 10개씩 (요청 수 약 1/10), 키 없이 스텁 응답: LLM_BACKEND=stub
+  python run_monthly_update.py --month 202512 --ai-batch-size 10
+
+  # 대시보드용 컬럼형 JSON(*.columnar.json)도 저장
+  python run_monthly_update.py --month 202512 --columnar
+
+  # 상세 데이터 월 직접 지정
+  python run_monthly_update.py --month 202601 --detail-months 202601 202501
+
+  # 구간별 소요 시간 트레이스(JSON) + cProfile 통계 (out/profile.prof)
+  python run_monthly_update.py --month 202601 --trace out/trace.json --profile
+        """
+    )
+    parser.add_argument('--month', '-m', required=True, help='마감 월 (YYYYMM)')
+    parser.add_argument('--files', '-i', nargs='+', default=DEFAULT_FILES, help='원장 엑셀 파일 목록')
+    parser.add_argument('--detail-months', nargs='+', help='상세 데이터 생성 월 (기본값: 마감 월, 전년 동월)')
+    parser.add_argument('--outdir', '-o', default='./out', help='피벗/상세 출력 디렉토리 (기본값: ./out)')
+    parser.add_argument('--skip', nargs='+', default=[], help='건너뛸 단계 (예: ai-analysis it-2026)')
+    parser.add_argument('--no-cache', action='store_true', help='원장 캐시를 사용하지 않고 엑셀을 직접 파싱')
+    parser.add_argument('--incremental', action='store_true', help='피벗 증분 갱신 (변경된 연월만 다시 집계)')
+    parser.add_argument('--ai-concurrency', type=int, help='AI 분석 동시 OpenAI 요청 수 (기본값: 4)')
+    parser.add_argument('--ai-batch-size', type=int, help='AI 분석 요청 1건에 묶을 계정 수 (기본값: 1 = 계정별 요청)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='IT사용료/IT유지보수비/지급수수료 컬럼형 JSON도 저장 (대시보드 API 로드용)')
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    files = [f for f in args.files if os.path.exists(f)]
+    for missing in sorted(set(args.files) - set(files)):
+        print(f"⚠ 파일을 찾을 수 없습니다: {missing}")
+    if not files:
+        print("❌ 처리할 원장 파일이 없습니다.")
+        sys.exit(1)
+
+    detail_months = args.detail_months or [args.month, previous_year_month(args.month)]
+    stages = build_stages(files, args.month, detail_months, output_dir=args.outdir,
+                          use_cache=not args.no_cache, incremental=args.incremental,
+                          ai_concurrency=args.ai_concurrency, columnar=args.columnar,
+                          ai_batch_size=args.ai_batch_size)
+
+    unknown = [s for s in args.skip if s not in stages]
+    if unknown:
+        print(f"❌ 알 수 없는 단계: {unknown} (사용 가능: {', '.join(stages)})")
+        sys.exit(1)
+
+    print("월마감 데이터 갱신을 시작합니다...")
+    print(f"마감 월: {args.month}, 상세 데이터 월: {', '.join(detail_months)}")
+    print(f"원장 파일: {', '.join(files)}")
+
+    with profiling_session(args):
+        report = run_pipeline(stages, skip=set(args.skip))
+        print_report(report)
+
+    if any(r['status'] == 'failed' for r in report):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
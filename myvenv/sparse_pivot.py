@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+계정+코스트센터 피벗 희소(COO) 저장 모듈
+목적: pivot_table(..., fill_value=0) 로 만든 계정 × 코스트센터 × 연월 피벗(pivot_by_gl_cctr_yyyymm_combined.csv)은
+      대부분의 칸이 0이고, 행마다 계정대분류/계정중분류/G/L 계정 설명/코스트센터명 한글 문자열이 반복됨.
+      계정과 코스트센터를 차원 표(정수 ID)로 분리하고 0이 아닌 칸만 (계정 ID, 코스트센터 ID, 연월, 금액)
+      행으로 저장. 필요할 때 densify() 로 원래 피벗(행/컬럼 순서 포함)을 복원.
+
+저장 구조 (out/pivot_sparse/, pyarrow 가 있으면 Parquet(zstd), 없으면 CSV):
+  accounts      account_id, 계정대분류, 계정중분류, G/L 계정, G/L 계정 설명
+  costcenters   cctr_id, 코스트 센터, 코스트센터명
+  rows          account_id, cctr_id           (원본 피벗 행 순서, 합계 0인 행 포함)
+  cells         account_id, cctr_id, yyyymm, amount   (0이 아닌 칸만)
+  meta.json     형식 버전, 저장 형식, 연월 컬럼 목록
+
+CSV 는 칸마다 키 3개를 반복하므로 0이 아닌 칸 비율이 높으면 조밀한 CSV 보다 커질 수 있음 (Parquet 권장).
+
+사용 예시:
+  from sparse_pivot import to_sparse, save_sparse, load_sparse, densify
+  save_sparse(to_sparse(combined_cctr), './out')
+  pivot_cctr = densify(load_sparse('./out'))
+
+  # 통합 피벗 CSV 변환 + 크기/로드 시간 비교 + 복원 검증
+  python sparse_pivot.py
+  python sparse_pivot.py --input out/pivot_by_gl_cctr_yyyymm_combined.csv --outdir ./out
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ledger_cache import HAS_PYARROW
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+SPARSE_VERSION = 1
+DEFAULT_SPARSE_DIRNAME = 'pivot_sparse'
+TABLES = ('accounts', 'costcenters', 'rows', 'cells')
+
+ACCOUNT_INDEX = ['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명']
+COSTCENTER_INDEX = ['코스트 센터', '코스트센터명']
+CCTR_INDEX = ACCOUNT_INDEX + COSTCENTER_INDEX
+
+
+def _dimension(index, levels, id_name):
+    """MultiIndex 일부 레벨 → (행별 ID, 차원 표) - ID는 처음 등장한 순서"""
+    keys = index.droplevel([name for name in index.names if name not in levels])
+    codes, uniques = pd.factorize(keys, sort=False)
+    table = pd.DataFrame(list(uniques), columns=levels)
+    table.insert(0, id_name, np.arange(len(table), dtype=np.int32))
+    return codes.astype(np.int32), table
+
+
+def to_sparse(pivot_cctr):
+    """
+    계정+코스트센터별 피벗 → 희소 표현
+
+    Parameters:
+    -----------
+    pivot_cctr : pd.DataFrame
+        인덱스 (계정대분류, 계정중분류, G/L 계정, G/L 계정 설명, 코스트 센터, 코스트센터명), 컬럼 YYYYMM
+
+    Returns:
+    --------
+    dict : {'accounts', 'costcenters', 'rows', 'cells': DataFrame, 'periods': [YYYYMM, ...]}
+    """
+    if list(pivot_cctr.index.names) != CCTR_INDEX:
+        pivot_cctr = pivot_cctr.set_index(CCTR_INDEX)
+    periods = [str(c) for c in pivot_cctr.columns]
+
+    account_ids, accounts = _dimension(pivot_cctr.index, ACCOUNT_INDEX, 'account_id')
+    cctr_ids, costcenters = _dimension(pivot_cctr.index, COSTCENTER_INDEX, 'cctr_id')
+
+    values = pivot_cctr.to_numpy()
+    row_pos, col_pos = np.nonzero(values)
+    cells = pd.DataFrame({
+        'account_id': account_ids[row_pos],
+        'cctr_id': cctr_ids[row_pos],
+        'yyyymm': np.asarray(periods, dtype=np.int32)[col_pos],
+        'amount': values[row_pos, col_pos],
+    })
+
+    return {
+        'accounts': accounts,
+        'costcenters': costcenters,
+        'rows': pd.DataFrame({'account_id': account_ids, 'cctr_id': cctr_ids}),
+        'cells': cells,
+        'periods': periods,
+    }
+
+
+def densify(sparse):
+    """
+    희소 표현 → 계정+코스트센터별 피벗 (to_sparse 의 역변환, 행/컬럼 순서 동일, 빈 칸은 0)
+    """
+    rows = sparse['rows']
+    periods = sparse['periods']
+    cells = sparse['cells']
+
+    row_lookup = pd.Series(np.arange(len(rows)),
+                           index=pd.MultiIndex.from_frame(rows[['account_id', 'cctr_id']]))
+    col_lookup = pd.Series(np.arange(len(periods)), index=np.asarray(periods, dtype=np.int64))
+
+    row_pos = row_lookup.reindex(pd.MultiIndex.from_frame(cells[['account_id', 'cctr_id']])).to_numpy()
+    col_pos = col_lookup.reindex(cells['yyyymm'].to_numpy()).to_numpy()
+
+    amounts = cells['amount'].to_numpy()
+    values = np.zeros((len(rows), len(periods)), dtype=amounts.dtype if len(amounts) else float)
+    values[row_pos, col_pos] = amounts
+
+    accounts = sparse['accounts'].set_index('account_id')[ACCOUNT_INDEX]
+    costcenters = sparse['costcenters'].set_index('cctr_id')[COSTCENTER_INDEX]
+    index_frame = pd.concat([
+        accounts.reindex(rows['account_id']).reset_index(drop=True),
+        costcenters.reindex(rows['cctr_id']).reset_index(drop=True),
+    ], axis=1)
+
+    pivot = pd.DataFrame(values, index=pd.MultiIndex.from_frame(index_frame), columns=periods)
+    pivot.columns.name = 'YYYYMM'
+    return pivot
+
+
+def save_sparse(sparse, output_dir='./out', fmt=None):
+    """
+    희소 표현 저장 → {output_dir}/pivot_sparse/
+
+    fmt : str, optional
+        'parquet' 또는 'csv' (기본값: pyarrow 가 있으면 parquet)
+    """
+    fmt = fmt or ('parquet' if HAS_PYARROW else 'csv')
+    sparse_dir = Path(output_dir) / DEFAULT_SPARSE_DIRNAME
+    sparse_dir.mkdir(parents=True, exist_ok=True)
+    for old in sparse_dir.glob('*.*'):
+        old.unlink()
+    for name in TABLES:
+        if fmt == 'parquet':
+            sparse[name].to_parquet(sparse_dir / f"{name}.parquet", index=False, compression='zstd')
+        else:
+            sparse[name].to_csv(sparse_dir / f"{name}.csv", index=False, encoding='utf-8-sig')
+    with open(sparse_dir / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump({'version': SPARSE_VERSION, 'format': fmt, 'periods': sparse['periods']}, f, ensure_ascii=False)
+    return sparse_dir
+
+
+def load_sparse(output_dir='./out'):
+    """저장된 희소 표현 로드 (save_sparse 의 역)"""
+    sparse_dir = Path(output_dir) / DEFAULT_SPARSE_DIRNAME
+    with open(sparse_dir / 'meta.json', 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != SPARSE_VERSION:
+        raise ValueError(f"지원하지 않는 희소 피벗 버전: {meta.get('version')}")
+
+    sparse = {'periods': meta['periods']}
+    for name in TABLES:
+        if meta['format'] == 'parquet':
+            sparse[name] = pd.read_parquet(sparse_dir / f"{name}.parquet")
+        else:
+            sparse[name] = pd.read_csv(sparse_dir / f"{name}.csv", encoding='utf-8-sig',
+                                       dtype={label: str for label in CCTR_INDEX})
+    return sparse
+
+
+def write_sparse(pivot_cctr, output_dir='./out', fmt=None):
+    """통합 피벗 → 희소 표현 저장 + 요약 출력"""
+    sparse = to_sparse(pivot_cctr)
+    sparse_dir = save_sparse(sparse, output_dir, fmt=fmt)
+    total = len(sparse['rows']) * len(sparse['periods'])
+    print(f"   ✓ 희소 피벗 저장: {sparse_dir} (계정 {len(sparse['accounts'])}개, 코스트센터 {len(sparse['costcenters'])}개, "
+          f"0이 아닌 칸 {len(sparse['cells']):,}/{total:,}개)")
+    return sparse_dir
+
+
+def _dir_size(path):
+    return sum(p.stat().st_size for p in Path(path).iterdir() if p.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='계정+코스트센터 통합 피벗 CSV → 희소(COO) 저장 (크기/로드 시간 비교, 복원 검증)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python sparse_pivot.py
+  python sparse_pivot.py --input out/pivot_by_gl_cctr_yyyymm_combined.csv --outdir ./out
+  python sparse_pivot.py --format csv
+        """
+    )
+    parser.add_argument('--input', '-i', default='./out/pivot_by_gl_cctr_yyyymm_combined.csv',
+                        help='계정+코스트센터별 통합 피벗 CSV (기본값: ./out/pivot_by_gl_cctr_yyyymm_combined.csv)')
+    parser.add_argument('--outdir', '-o', default='./out', help='출력 디렉토리 (기본값: ./out)')
+    parser.add_argument('--format', choices=['parquet', 'csv'],
+                        help='저장 형식 (기본값: pyarrow 가 있으면 parquet, 없으면 csv)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ 파일을 찾을 수 없습니다: {args.input}")
+        sys.exit(1)
+
+    def load_dense():
+        return pd.read_csv(args.input, encoding='utf-8-sig', index_col=list(range(len(CCTR_INDEX))),
+                           dtype={name: str for name in CCTR_INDEX})
+
+    start = time.perf_counter()
+    dense = load_dense()
+    dense_seconds = time.perf_counter() - start
+
+    sparse_dir = write_sparse(dense, args.outdir, fmt=args.format)
+
+    start = time.perf_counter()
+    restored = densify(load_sparse(args.outdir))
+    sparse_seconds = time.perf_counter() - start
+
+    same = restored.equals(dense.rename_axis(columns='YYYYMM'))
+    dense_size, sparse_size = os.path.getsize(args.input), _dir_size(sparse_dir)
+    print(f"   크기 {dense_size / 1024:,.0f}KB → {sparse_size / 1024:,.0f}KB ({dense_size / sparse_size:.1f}배), "
+          f"로드 {dense_seconds * 1000:.1f}ms → 로드+복원 {sparse_seconds * 1000:.1f}ms, "
+          f"복원 {'✓ 동일' if same else '❌ 불일치'}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
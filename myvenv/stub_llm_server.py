@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+로컬 OpenAI 호환 스텁 서버 (chat.completions)
+목적: OpenAI 키/네트워크 없이 AI 분석 스크립트(동시 요청, 재시도, 진행 상황 출력)를 테스트.
+      POST /v1/chat/completions 에 프롬프트 내용 기준의 고정 응답을 돌려주고,
+      지연 시간과 주기적인 429(Retry-After) 응답으로 실제 API 동작을 흉내냄.
+      여러 계정을 묶은 배치 프롬프트(JSON 응답 요청)에는 {계정명: 설명} JSON 으로 응답.
+      usage 토큰 수는 글자 수 기준 추정값.
+      서버 없이 같은 응답을 쓰려면 llm_backend.StubBackend (--backend stub).
+
+사용 예시:
+  python stub_llm_server.py --port 8765 --latency 0.5 --rate-limit-every 7
+  python stub_llm_server.py --port 8765 --latency 0.3 --per-account-latency 0.1
+  OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8765/v1 \\
+      python create_account_analysis_with_ai.py --concurrency 8 --batch-size 5
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_counter = itertools.count(1)
+_counter_lock = threading.Lock()
+
+
+ACCOUNT_PATTERN = re.compile(r'\*\*계정명\*\*:\s*(.+)')
+
+
+def _prompt(messages):
+    return messages[-1].get('content', '') if messages else ''
+
+
+def count_accounts(messages):
+    """프롬프트에 든 계정 수 (최소 1)"""
+    return max(1, len(ACCOUNT_PATTERN.findall(_prompt(messages))))
+
+
+def estimate_tokens(content):
+    """토큰 수 추정 (한글 기준 약 2글자당 1토큰, 메시지 목록이면 전체 content 합)"""
+    if isinstance(content, list):
+        content = ''.join(str(m.get('content', '')) for m in content)
+    return max(1, len(content) // 2)
+
+
+def _sentence(account, text):
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]
+    return f"{account} 변동은 주요 적요 금액 변화에 따른 것으로 보입니다. (stub {digest})"
+
+
+def fake_completion(messages):
+    """
+    프롬프트 기반의 결정적(같은 입력 → 같은 출력) 응답 문장
+
+    JSON 응답을 요청하는 배치 프롬프트면 계정별 문장을 {계정명: 설명} JSON 으로 (문장은 계정 구간 기준)
+    """
+    prompt = _prompt(messages)
+    matches = list(ACCOUNT_PATTERN.finditer(prompt))
+    if 'JSON' in prompt and matches:
+        answers = {}
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(prompt)
+            answers[match.group(1).strip()] = _sentence(match.group(1).strip(), prompt[match.start():end])
+        return json.dumps(answers, ensure_ascii=False)
+    account = matches[0].group(1).strip() if matches else '해당 계정'
+    return _sentence(account, prompt)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    per_account_latency = 0.0
+    rate_limit_every = 0
+    retry_after = 1
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': f'unknown path: {self.path}'}})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+
+        with _counter_lock:
+            seq = next(_counter)
+        if self.rate_limit_every and seq % self.rate_limit_every == 0:
+            self._send_json(429, {'error': {'message': 'Rate limit reached (stub)', 'type': 'rate_limit_error'}},
+                            headers={'Retry-After': str(self.retry_after)})
+            return
+
+        messages = request.get('messages', [])
+        time.sleep(self.latency + self.per_account_latency * count_accounts(messages))
+        content = fake_completion(messages)
+        prompt_tokens, completion_tokens = estimate_tokens(messages), estimate_tokens(content)
+        self._send_json(200, {
+            'id': f'chatcmpl-stub-{seq}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens},
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description='로컬 OpenAI chat.completions 스텁 서버')
+    parser.add_argument('--port', type=int, default=8765, help='포트 (기본값: 8765)')
+    parser.add_argument('--latency', type=float, default=0.5, help='응답 지연 초 (기본값: 0.5)')
+    parser.add_argument('--per-account-latency', type=float, default=0.0,
+                        help='프롬프트 계정 1개당 추가 지연 초 - 배치 요청 흉내 (기본값: 0)')
+    parser.add_argument('--rate-limit-every', type=int, default=0,
+                        help='N번째 요청마다 429 응답 (기본값: 0 = 사용 안 함)')
+    parser.add_argument('--retry-after', type=int, default=1, help='429 응답의 Retry-After 초 (기본값: 1)')
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    StubHandler.per_account_latency = args.per_account_latency
+    StubHandler.rate_limit_every = args.rate_limit_every
+    StubHandler.retry_after = args.retry_after
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), StubHandler)
+    print(f"✓ 스텁 서버 실행 중: http://127.0.0.1:{args.port}/v1 (지연 {args.latency}초)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+합성 공통비 원장 생성 모듈
+목적: excel.py / create_detail.py / extract_categories.py 등의 성능을 실제(대외비) 원장 없이 측정하기 위해
+      공통비 원장과 같은 컬럼 구성(40개, 같은 순서)의 합성 원장을 원하는 행 수(1만 ~ 500만 행)로 생성.
+
+실제 원장과 같게 맞춘 특성:
+  - 컬럼 순서 (추출 스크립트가 위치로 읽는 1: 연도/월, 16: 금액(문서 통화), 34: 참조 키 3 포함)
+  - 계정대분류 / 계정중분류 / G/L 계정 / G/L 계정 설명 조합 (IT사용료, IT유지보수비, 지급수수료, 기타 비용)
+  - 금액(현지 통화) 일부가 '1,234,000' 형식 문자열, 0원 / 음수(취소) 전표 포함
+  - 텍스트에 연월 접두어('25.01월_', '2025.02_') 와 결제 차수('(1차)') 가 섞인 서비스명
+  - 거래처명 결측 / 빈 문자열 (참조 키 3 으로 대체되는 경우), '[CLSD]' / '공통_' 접두어 코스트센터명
+  - 값이 없는 컬럼은 엑셀 로드 결과처럼 NaN
+
+사용 예시:
+  from synthetic_ledger import synthetic_ledger
+  df = synthetic_ledger(100_000, year=2025)
+
+  # 합성 원장 XLSX 저장 (엑셀 시트 한도 1,048,575행)
+  python synthetic_ledger.py --rows 30000 --outdir ./synthetic
+  → ./synthetic/24공통비.XLSX, 25공통비.XLSX, 26공통비.XLSX
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 인코딩 설정
+sys.stdout.reconfigure(encoding='utf-8')
+
+LEDGER_COLUMNS = [
+    '회사 코드', '연도/월', '계정대분류', 'G/L 계정', 'G/L 계정 설명', '계정중분류', '전표 번호', '전표 유형', '전기일', '증빙일',
+    '입력일', '항목', '차변/대변지시자', '통화', '금액(현지 통화)', '현지 통화', '금액(문서 통화)', '문서 통화', '세금 코드', '사업 영역',
+    '손익 센터', '텍스트', '공급업체', '고객', '거래처명', '전표 헤더 텍스트', '참조', '오브젝트 유형', '코스트 센터', '코스트센터명',
+    '지정', '참조 키 1', '참조 키 2', '사용자 이름', '참조 키 3', 'WBS 요소', '오더', '자산', '수량', '단위',
+]
+
+EXCEL_MAX_ROWS = 1_048_575
+
+# (계정대분류, 계정중분류, G/L 계정, G/L 계정 설명, 비중)
+ACCOUNTS = [
+    ('IT수수료', 'IT수수료', 55210115, '지급수수료_IT사용료', 0.12),
+    ('IT수수료', 'IT수수료', 55210113, '지급수수료_IT유지보수비', 0.06),
+    ('지급수수료', '지급수수료', 55210101, '지급수수료_회계감사', 0.02),
+    ('지급수수료', '지급수수료', 55210105, '지급수수료_법률자문', 0.02),
+    ('지급수수료', '지급수수료', 55210109, '지급수수료_컨설팅', 0.04),
+    ('지급수수료', '지급수수료', 55210199, '지급수수료_기타', 0.06),
+    ('직원경비', '복리후생비', 55130111, '복리후생비_식대', 0.18),
+    ('직원경비', '복리후생비', 55130115, '복리후생비_경조사비', 0.03),
+    ('직원경비', '여비교통비', 55140101, '여비교통비_국내출장', 0.08),
+    ('직원경비', '여비교통비', 55140103, '여비교통비_해외출장', 0.03),
+    ('일반관리비', '통신비', 55310101, '통신비_전화', 0.04),
+    ('일반관리비', '소모품비', 55320101, '소모품비_사무용품', 0.08),
+    ('일반관리비', '지급임차료', 55330101, '지급임차료_사무실', 0.02),
+    ('일반관리비', '도서인쇄비', 55340101, '도서인쇄비', 0.02),
+    ('인건비', '인건비', 55010101, '급여_정규직', 0.10),
+    ('인건비', '인건비', 55010103, '상여금', 0.05),
+    ('교육훈련비', '교육훈련비', 55150101, '교육훈련비_외부교육', 0.05),
+]
+
+IT_SERVICES = [
+    ('AWS 인프라 사용료', '아마존웹서비스'), ('Github SW 연간 구독 서비스료', '깃허브'), ('Slack 구독', '슬랙'),
+    ('MS365 라이선스', '한국마이크로소프트'), ('ChatGPT Team 구독', 'OpenAI'), ('Claude 결제', 'Anthropic'),
+    ('노션 구독', '노션랩스'), ('Figma 결제', '피그마'), ('Atlassian Jira/Confluence', '아틀라시안'),
+    ('Zoom 회의 라이선스', '줌비디오'), ('Google Workspace', '구글코리아'), ('Adobe CC', '어도비'),
+]
+MAINTENANCE_SERVICES = [
+    ('PLM 유지보수', '다쏘시스템'), ('ERP 유지보수', '에스에이피코리아'), ('그룹웨어 유지보수', '다우기술'),
+    ('보안솔루션 유지보수', '안랩'), ('서버 유지보수', '한국HPE'),
+]
+OTHER_TEXTS = [
+    ('회계감사 수수료', '삼일회계법인'), ('법률 자문료', '김앤장'), ('경영 컨설팅', '맥킨지'), ('직원 식대', '식권대장'),
+    ('경조사 화환', '꽃배달'), ('출장 교통비', '코레일'), ('해외 출장 항공권', '대한항공'), ('사무용품 구매', '오피스디포'),
+    ('사무실 임차료', '빌딩관리'), ('도서 구입', '교보문고'), ('외부 교육비', '멀티캠퍼스'), ('통신 요금', 'KT'),
+    ('급여', None), ('상여', None), ('', None), (None, None),
+]
+
+TEXT_PREFIXES = ['', '', '', '{yy}.{mm}월_', '{yy}.{mm}월_공통 IT팀 ', '{yyyy}.{mm}_', '{yy}년 {m}월 ']
+TEXT_SUFFIXES = ['', '', '', ' (1차)', ' (2차)', ' 추가분']
+
+COST_CENTER_COUNT = 60
+
+
+def _cost_centers(count=COST_CENTER_COUNT):
+    """(코스트 센터, 코스트센터명) 목록 - 일부 '공통_' / '[CLSD]' 접두어"""
+    teams = ['IT팀', 'HR팀', '재무팀', '공간기획팀', '경영지원팀', '개발팀', '마케팅팀', '영업팀', '법무팀', '구매팀']
+    centers = []
+    for i in range(count):
+        name = f"{teams[i % len(teams)]}{i // len(teams) + 1 if i >= len(teams) else ''}"
+        if i % 3 == 0:
+            name = f"공통_{name}"
+        if i % 7 == 0:
+            name = f"[CLSD]{name}"
+        centers.append((f"F{500 + i * 10:05d}", name))
+    return centers
+
+
+def _texts(year):
+    """
+    연도별 (G/L 계정 인덱스, 텍스트, 거래처명) 후보 목록
+
+    IT사용료 / IT유지보수비 계정은 서비스명에 연월 접두어 / 차수 접미어를 붙여 변형을 많이 만듦
+    (정규화 메모 / 서비스 분류 비용이 실제처럼 커지도록)
+    """
+    candidates = []
+    for gl_index, account in enumerate(ACCOUNTS):
+        description = account[3]
+        if 'IT사용료' in description:
+            services = IT_SERVICES
+        elif 'IT유지보수비' in description:
+            services = MAINTENANCE_SERVICES
+        else:
+            candidates += [(gl_index, text, vendor) for text, vendor in OTHER_TEXTS]
+            continue
+        for month in range(1, 13):
+            values = {'yyyy': year, 'yy': year % 100, 'mm': f"{month:02d}", 'm': month}
+            for prefix in TEXT_PREFIXES:
+                for suffix in TEXT_SUFFIXES:
+                    for text, vendor in services:
+                        candidates.append((gl_index, f"{prefix.format(**values)}{text}{suffix}", vendor))
+    return candidates
+
+
+def synthetic_ledger(rows, year=2025, months=None, seed=None):
+    """
+    합성 공통비 원장 DataFrame
+
+    Parameters:
+    -----------
+    rows : int
+        행 수
+    year : int
+        연도 (연도/월, 전기일, 텍스트 연월 접두어에 사용)
+    months : int, optional
+        1월 ~ months월 데이터 (기본값: 12, 2026년은 3 - 진행 중인 연도)
+    seed : int, optional
+        난수 시드 (기본값: 연도 - 같은 인자면 같은 원장)
+
+    Returns:
+    --------
+    pd.DataFrame : LEDGER_COLUMNS 순서의 원장
+    """
+    rng = np.random.default_rng(year if seed is None else seed)
+    months = months or (3 if year >= 2026 else 12)
+
+    weights = np.array([a[4] for a in ACCOUNTS])
+    gl_index = rng.choice(len(ACCOUNTS), size=rows, p=weights / weights.sum())
+    month = rng.integers(1, months + 1, rows)
+
+    # 계정별 텍스트 후보에서 추출
+    candidates = _texts(year)
+    by_gl = [np.array([i for i, c in enumerate(candidates) if c[0] == g]) for g in range(len(ACCOUNTS))]
+    text_pick = np.empty(rows, dtype=np.int64)
+    for g, pool in enumerate(by_gl):
+        mask = gl_index == g
+        text_pick[mask] = pool[rng.integers(0, len(pool), mask.sum())]
+    texts = np.array([c[1] for c in candidates], dtype=object)[text_pick]
+    vendors = np.array([c[2] for c in candidates], dtype=object)[text_pick]
+
+    # 거래처명 결측 / 빈 값 → 참조 키 3 으로 대체되는 경우
+    ref3 = vendors.copy()
+    vendor_state = rng.random(rows)
+    vendors[vendor_state < 0.15] = None
+    vendors[(vendor_state >= 0.15) & (vendor_state < 0.20)] = ''
+    ref3[rng.random(rows) < 0.3] = None
+
+    centers = _cost_centers()
+    cctr_pick = rng.integers(0, len(centers), rows)
+    cctr_codes = np.array([c[0] for c in centers], dtype=object)[cctr_pick]
+    cctr_names = np.array([c[1] for c in centers], dtype=object)[cctr_pick]
+    cctr_missing = rng.random(rows) < 0.01
+    cctr_codes[cctr_missing] = None
+    cctr_names[cctr_missing] = None
+
+    # 금액: 로그 정규 분포 (원 단위), 일부 0원 / 음수(취소) / 천 단위 쉼표 문자열
+    amount = np.round(rng.lognormal(12.5, 1.6, rows), -1)
+    amount_state = rng.random(rows)
+    amount[amount_state < 0.02] = 0
+    amount[(amount_state >= 0.02) & (amount_state < 0.06)] *= -1
+    local_amount = amount.astype(object)
+    as_text = rng.random(rows) < 0.03
+    local_amount[as_text] = [f"{value:,.0f}" for value in amount[as_text]]
+
+    accounts = pd.DataFrame(ACCOUNTS, columns=['계정대분류', '계정중분류', 'G/L 계정', 'G/L 계정 설명', '비중'])
+    month_labels = np.array([f"{year}/{m:02d}" for m in range(1, 13)], dtype=object)
+    posting = pd.to_datetime(
+        pd.DataFrame({'year': year, 'month': month, 'day': rng.integers(1, 29, rows)})
+    )
+    designations = np.array(['4265123', '6243000', f"{year}.01.02", None], dtype=object)
+    users = np.array([f"USER{i:03d}" for i in range(40)], dtype=object)
+
+    columns = {
+        '회사 코드': np.full(rows, '1000', dtype=object),
+        '연도/월': month_labels[month - 1],
+        '계정대분류': accounts['계정대분류'].to_numpy(dtype=object)[gl_index],
+        'G/L 계정': accounts['G/L 계정'].to_numpy()[gl_index],
+        'G/L 계정 설명': accounts['G/L 계정 설명'].to_numpy(dtype=object)[gl_index],
+        '계정중분류': accounts['계정중분류'].to_numpy(dtype=object)[gl_index],
+        '전표 번호': np.arange(100_000_000, 100_000_000 + rows),
+        '전표 유형': np.where(rng.random(rows) < 0.8, 'SA', 'KR').astype(object),
+        '전기일': posting,
+        '증빙일': posting,
+        '입력일': posting,
+        '항목': rng.integers(1, 20, rows),
+        '차변/대변지시자': np.where(amount < 0, 'H', 'S').astype(object),
+        '통화': np.full(rows, 'KRW', dtype=object),
+        '금액(현지 통화)': local_amount,
+        '현지 통화': np.full(rows, 'KRW', dtype=object),
+        '금액(문서 통화)': amount,
+        '문서 통화': np.full(rows, 'KRW', dtype=object),
+        '텍스트': texts,
+        '공급업체': np.where(rng.random(rows) < 0.7, 'V1000', None).astype(object),
+        '거래처명': vendors,
+        '코스트 센터': cctr_codes,
+        '코스트센터명': cctr_names,
+        '지정': designations[rng.integers(0, len(designations), rows)],
+        '사용자 이름': users[rng.integers(0, len(users), rows)],
+        '참조 키 3': ref3,
+    }
+    empty = np.full(rows, np.nan)
+    return pd.DataFrame({name: columns.get(name, empty) for name in LEDGER_COLUMNS})
+
+
+def ledger_filename(year):
+    """연도 → 원장 파일명 (2025 → '25공통비.XLSX')"""
+    return f"{year % 100:02d}공통비.XLSX"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='합성 공통비 원장 XLSX 생성 (실제 원장과 같은 컬럼 구성)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python synthetic_ledger.py --rows 30000 --outdir ./synthetic
+  python synthetic_ledger.py --rows 200000 --years 2025 2026 --outdir ./synthetic
+        """
+    )
+    parser.add_argument('--rows', '-n', type=int, default=30_000, help='연도별 원장 행 수 (기본값: 30,000)')
+    parser.add_argument('--years', nargs='+', type=int, default=[2024, 2025, 2026],
+                        help='생성할 연도 (기본값: 2024 2025 2026)')
+    parser.add_argument('--outdir', '-o', default='./synthetic', help='출력 디렉토리 (기본값: ./synthetic)')
+    args = parser.parse_args()
+
+    if args.rows > EXCEL_MAX_ROWS:
+        print(f"❌ 엑셀 시트 한도({EXCEL_MAX_ROWS:,}행)를 넘습니다. 더 큰 원장은 synthetic_ledger() DataFrame을 직접 사용하세요.")
+        sys.exit(1)
+
+    os.makedirs(args.outdir, exist_ok=True)
+    for year in args.years:
+        path = os.path.join(args.outdir, ledger_filename(year))
+        # pandas 는 확장자 대문자(.XLSX)를 엑셀 형식으로 인식하지 못하므로 임시 .xlsx 로 저장 후 이름 변경
+        temp_path = f"{path}.tmp.xlsx"
+        synthetic_ledger(args.rows, year=year).to_excel(temp_path, index=False)
+        os.replace(temp_path, path)
+        print(f"✓ {path} ({args.rows:,}행)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+기간 비교(account_variance.py) 적요별 결과 테스트
+목적: 상세 저장소의 빈 적요('')가 결측으로 읽혀 적요별 차이(description_variance.csv)에서 빠지는지 확인.
+      기존 계정별 CSV 를 pd.read_csv 로 읽던 create_account_analysis 의 적요별 집계와 같은 행이어야 함
+
+- 적요가 '' / 결측인 행은 적요별 표에서 제외, GL 계정별 합계에는 포함
+- compare_periods 의 적요별 표는 같은 쌍의 description_changes 결과와 같은 값
+
+사용 예시:
+  python test_account_variance.py
+"""
+import contextlib
+import io
+import sys
+import tempfile
+
+import pandas as pd
+
+from account_variance import compare_periods, description_changes, load_details
+from detail_store import write_month
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+COLUMNS = ['G/L 계정', 'G/L 계정 설명', '텍스트', '금액_정제']
+
+# 상세 데이터 생성 시 결측 적요는 ''로 채워 저장됨
+DETAILS = {
+    '202501': [
+        (51110010, 'IT사용료', 'AWS 클라우드', 1_000_000), (51110010, 'IT사용료', '', 300_000),
+        (51110020, '지급수수료', '법률 자문', 2_000_000), (51110020, '지급수수료', '', 500_000),
+    ],
+    '202601': [
+        (51110010, 'IT사용료', 'AWS 클라우드', 1_500_000), (51110010, 'IT사용료', '', 700_000),
+        (51110020, '지급수수료', '', 900_000), (51110030, '여비교통비', '', 100_000),
+    ],
+}
+
+
+def blank_descriptions(desc_table):
+    """적요가 '' 또는 결측인 행 수"""
+    text = desc_table['적요']
+    return int((text.isna() | (text.astype(str).str.strip() == '')).sum())
+
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory() as store_dir:
+        for month, rows in DETAILS.items():
+            write_month(pd.DataFrame(rows, columns=COLUMNS), month, store_dir=store_dir)
+
+        details = load_details(list(DETAILS), store_dir=store_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            gl_table, desc_table = compare_periods([('YoY', ['202601'], ['202501'])], store_dir=store_dir)
+
+    if any(df['텍스트'].eq('').any() for df in details.values()):
+        failures.append("저장소에서 읽은 적요에 빈 문자열이 남아 있음")
+
+    blank = blank_descriptions(desc_table)
+    if blank:
+        failures.append(f"적요별 표에 빈 적요 행 {blank}건")
+
+    expected = description_changes(details['202601'], details['202501']).reset_index()
+    actual = desc_table.rename(columns={'GL계정': 'G/L 계정 설명', '적요': '텍스트'})[expected.columns]
+    try:
+        pd.testing.assert_frame_equal(expected, actual, check_dtype=False)
+    except AssertionError:
+        failures.append("적요별 표가 description_changes 결과와 다름")
+
+    totals = gl_table.set_index('GL계정')['당년금액'].to_dict()
+    if totals != {'IT사용료': 2_200_000, '지급수수료': 900_000, '여비교통비': 100_000}:
+        failures.append(f"GL 계정별 당년 합계에 빈 적요 행 금액이 빠짐: {totals}")
+
+    print(f"{'✓' if not failures else '❌'} 적요별 {len(desc_table)}행 / GL 계정별 {len(gl_table)}행")
+    for failure in failures:
+        print(f"   - 불일치: {failure}")
+
+    if failures:
+        print(f"\n❌ 빈 적요 처리 오류 {len(failures)}건")
+        sys.exit(1)
+    print("\n✅ 빈 적요 행이 적요별 차이에서 제외되고 GL 계정별 합계에는 포함됩니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+스트리밍 읽기(ledger_stream.py) 결과 동일성 테스트
+목적: 청크 경계에 따라 컬럼 타입 추론이 달라지지 않는지 확인.
+      텍스트/숫자가 섞인 금액·계정·연월 컬럼을 작은 청크 크기로 읽어 pd.read_excel(시트 전체) 결과와 비교
+
+- 금액: 텍스트 셀 '-500' 은 컬럼 전체가 숫자로 변환될 때만 -500, 변환 안 되는 값('1,000')이 있으면 500
+- 계정: 텍스트 '51110010' 과 숫자 51110010 은 컬럼 전체가 숫자일 때만 같은 계정
+- 피벗(stream_ledger_pivots)과 월별 행 추출(stream_month_rows) 모두 비교
+
+사용 예시:
+  python test_ledger_stream.py
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import openpyxl
+import pandas as pd
+
+from excel import process_excel_to_pivot
+from ledger_stream import stream_month_rows
+from normalize import normalize_yyyymm_series
+from pivot_parts import REQUIRED_COLS
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+HEADER = REQUIRED_COLS + ['텍스트']
+
+# (연도/월, G/L 계정, 금액, 코스트 센터) - 나머지 컬럼은 계정/코스트센터에서 만듦
+CASES = {
+    # 첫 청크(3행)는 전부 숫자로 변환되지만 두 번째 청크에 '1,000' → 시트 전체는 object
+    '금액 텍스트/숫자 혼합 (전체 object)': [
+        (202501, 51110010, 1000, 'C1'), (202501, 51110010, '-500', 'C1'), (202501, 51110020, 200, 'C2'),
+        (202502, 51110010, '1,000', 'C1'), (202502, 51110020, 300, None), ('2025/02', 51110020, 'abc', 'C2'),
+    ],
+    # 모든 금액이 숫자로 변환됨 → '-500' 은 -500
+    '금액 텍스트 숫자 (전체 숫자)': [
+        (202501, 51110010, 1000, 'C1'), (202501, 51110010, 250.5, 'C1'), (202501, 51110020, 200, 'C2'),
+        (202502, 51110010, '-500', 'C1'), (202502, 51110020, '700', None), (202502, 51110020, 5, 'C2'),
+    ],
+    # 계정/연월 텍스트 셀과 빈 셀이 청크마다 다르게 섞임
+    '계정/연월 텍스트 혼합': [
+        (202501, 51110010, 1000, 'C1'), ('202501', '51110010', 400, 'C1'), (202501, None, 200, 'C2'),
+        (202502, 'A100', 100, 'C1'), (None, 51110020, 300, None), ('2025-02', 51110020, 50, 'C2'),
+        (202502, '51110010', 60, 1001), (202502, 51110010, 70, '1001'),
+    ],
+}
+
+
+def write_ledger(path, rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    for yyyymm, gl, amount, cctr in rows:
+        values = {
+            '연도/월': yyyymm, 'G/L 계정': gl, 'G/L 계정 설명': f"계정{gl}", '금액(현지 통화)': amount,
+            '계정대분류': '판관비', '계정중분류': '일반관리비', '코스트 센터': cctr,
+            '코스트센터명': f"센터{cctr}" if cctr is not None else None, '텍스트': f"적요 {amount}",
+        }
+        sheet.append([values[col] for col in HEADER])
+    workbook.save(path)
+
+
+def check(label, path, chunk_sizes=(1, 2, 3, 4, 100)):
+    """시트 전체 읽기와 청크 크기별 스트리밍 결과 비교. Returns: 불일치 건수"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        full = process_excel_to_pivot(path, use_cache=False, save=False)
+    sheet = pd.read_excel(path)
+    months = sorted(m for m in normalize_yyyymm_series(sheet['연도/월']).dropna().unique())
+
+    failures = []
+    for chunk_size in chunk_sizes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            stream = process_excel_to_pivot(path, save=False, streaming=True, chunk_size=chunk_size)
+        for key in ('gl', 'cctr'):
+            if not full[key].equals(stream[key]):
+                failures.append(f"청크 {chunk_size}행 피벗({key})")
+        for month in months:
+            expected = sheet[normalize_yyyymm_series(sheet['연도/월']) == month][HEADER]
+            rows = stream_month_rows(path, month, HEADER[1:], chunk_size=chunk_size)[HEADER]
+            if not expected.equals(rows):
+                failures.append(f"청크 {chunk_size}행 {month}월 행")
+
+    print(f"{'✓' if not failures else '❌'} {label}: 청크 {len(chunk_sizes)}종 × (피벗 + {len(months)}개월 행)")
+    for failure in failures:
+        print(f"   - 불일치: {failure}")
+    return len(failures)
+
+
+def main():
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (label, rows) in enumerate(CASES.items()):
+            path = os.path.join(tmp, f"ledger_{i}.xlsx")
+            write_ledger(path, rows)
+            failures += check(label, path)
+
+    if failures:
+        print(f"\n❌ 스트리밍 결과가 시트 전체 읽기와 다른 경우 {failures}건")
+        sys.exit(1)
+    print("\n✅ 청크 크기와 관계없이 스트리밍 결과가 시트 전체 읽기와 동일합니다.")
+
+
+if __name__ == '__main__':
+    main()
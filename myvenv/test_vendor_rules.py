@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+IT사용료 서비스명 규칙 골든 테스트
+목적: out/it_usage_details.json 의 기존 분류 결과(text)를 원본 적요(original_text) + 거래처명(vendor)으로
+      vendor_rules 규칙 엔진(단일 문자열 / 컬럼 단위)으로 다시 분류했을 때 모든 행이 동일한지 확인
+
+- 2024/2025: extract_it_usage_v2 규칙 (지정 4265/6243 → 임직원 AI사용료 행은 제외)
+- 2026: extract_2026_it_data 규칙 (is_ai_usage → 임직원 AI사용료 행은 제외)
+
+사용 예시:
+  python test_vendor_rules.py
+"""
+import json
+import sys
+
+import pandas as pd
+
+from extract_2026_it_data import is_ai_usage
+from vendor_rules import (
+    normalize_it_usage_text, normalize_it_usage_series,
+    normalize_usage_2026_text, normalize_usage_2026_series,
+)
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+
+def check(label, records, scalar_func, series_func):
+    """기존 분류 결과와 비교. Returns: 불일치 건수"""
+    df = pd.DataFrame(records, columns=['original_text', 'vendor', 'text'])
+    series_result = series_func(df['original_text'], df['vendor'])
+    scalar_result = [scalar_func(t, v) for t, v in zip(df['original_text'], df['vendor'])]
+
+    mismatches = df[(series_result != df['text']) | (pd.Series(scalar_result) != df['text'])]
+    status = '✓' if mismatches.empty else '❌'
+    print(f"{status} {label}: {len(df):,}건 중 불일치 {len(mismatches)}건")
+    for _, row in mismatches.head(10).iterrows():
+        i = row.name
+        print(f"   - '{row['original_text'][:40]}' 기존='{row['text']}' "
+              f"컬럼='{series_result[i]}' 단일='{scalar_result[i]}'")
+    return len(mismatches)
+
+
+def main():
+    with open('out/it_usage_details.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    failures = 0
+    for year in ('2024', '2025'):
+        records = [r for r in data.get(year, [])
+                   if not str(r.get('assign', '')).startswith(('4265', '6243'))]
+        failures += check(f"{year} (extract_it_usage_v2)", records,
+                          normalize_it_usage_text, normalize_it_usage_series)
+
+    records = [r for r in data.get('2026', []) if not is_ai_usage(r['original_text'])]
+    failures += check("2026 (extract_2026_it_data)", records,
+                      normalize_usage_2026_text, normalize_usage_2026_series)
+
+    if failures:
+        print(f"\n❌ 기존 분류와 다른 행 {failures}건")
+        sys.exit(1)
+    print("\n✅ 모든 행이 기존 분류와 동일합니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+"""
+IT사용료 적요 → 표준 서비스명 규칙 모듈
+목적: extract_it_usage_v2.normalize_text / extract_2026_it_data.normalize_usage_text 에 하드코딩되어 있던
+      날짜 제거 re.sub 체인과 'x' in lower if-문 60여 개를 선언형 규칙 표(위에서부터 우선)로 옮기고,
+      규칙 표 전체를 오토마톤 하나로 컴파일하여 컬럼 단위로 적용.
+
+규칙 표 형식: [(표준명, [패턴, ...]), ...]
+  - 패턴은 소문자로 바꾼 적요에 포함되는 문자열 (한글은 대소문자 구분 없음)
+  - '^ms' 는 적요가 'ms' 로 시작할 때만, 'oci&msp' 는 'oci' 와 'msp' 가 모두 있을 때만 해당
+  - 여러 규칙이 걸리면 표에서 위에 있는 규칙이 우선 (기존 if-문 순서와 동일)
+
+규칙 표의 모든 문자열을 Aho–Corasick 오토마톤 하나로 컴파일하여 적요를 한 번만 훑어 포함된 문자열을 모두 찾고,
+조건을 만족하는 패턴 중 가장 위에 있는 규칙을 선택 (if-문 60여 개 × 문자열 검색 → 적요 1회 순회).
+
+사용 예시:
+  from vendor_rules import normalize_it_usage_series
+  df['서비스명'] = normalize_it_usage_series(df['텍스트'], df['거래처명'])
+
+  python test_vendor_rules.py      # out/it_usage_details.json 기존 분류 결과와 동일한지 확인
+  python bench_vendor_rules.py     # 행 단위 vs 컬럼 단위 처리 속도 비교
+"""
+import re
+from collections import deque
+
+import pandas as pd
+
+from normalize import str_column
+
+# ============================================================
+# 날짜/차수 제거 (순서대로 적용, 마지막에 '_' → 공백, 공백 정리)
+# ============================================================
+
+# extract_it_usage_v2 (2024/2025 원장)
+IT_USAGE_CLEANUP = [
+    (r'^\d{2}\.\d{1,2}월?_?\s*', ''),        # 25.01월_, 25.02월_ 등
+    (r'^\d{4}\.\d{1,2}_?\s*', ''),           # 2025.01_, 2024.12_ 등
+    (r'^\d{2}년\s*\d{1,2}월\s*', ''),         # 25년 1월, 24년 12월 등
+    (r'^\d{4}년도?\s*\d{0,2}월?\s*', ''),     # 2025년 1월 등
+    (r'^20\d{2}\s*', ''),                    # 앞에 붙은 숫자 (20, 24, 25 등)
+    (r'^2[0-5]\s+', ''),
+    (r'^20\s+', ''),
+    (r'^\d{1,2}월\s*', ''),                  # 1월, 2월 등 단독 월 표시
+    (r'^\d+_', ''),                          # 앞의 숫자와 언더스코어
+    (r'\d{2}\.\d{1,2}월?\s*', ''),           # 중간에 있는 날짜 패턴
+    (r'\d{4}\.\d{1,2}\s*', ''),
+    (r'\d{2}년\s*\d{1,2}월\s*', ''),
+    (r'\(\d+[차분기]+\)', ''),               # (1차), (2차), (1분기) 등
+    (r'\(\d+월?\)', ''),
+]
+
+# extract_2026_it_data (2026 상세 데이터)
+USAGE_2026_CLEANUP = [
+    (r'^\d{2}\.\d{1,2}월?_?\s*', ''),
+    (r'^\d{4}\.\d{1,2}_?\s*', ''),
+    (r'^\d{2}년\s*\d{1,2}월\s*', ''),
+    (r'^\d{4}년도?\s*\d{0,2}월?\s*', ''),
+    (r'^\d{1,2}월\s*', ''),
+    (r'\d{2}\.\d{1,2}월?\s*', ''),
+    (r'^\d{2}\s+', ''),                      # "26 " 등
+]
+
+_FINAL_CLEANUP = [(r'_', ' '), (r'\s+', ' ')]
+
+# ============================================================
+# 서비스명 규칙 (위에서부터 우선)
+# ============================================================
+
+# extract_it_usage_v2.normalize_text
+IT_USAGE_RULES = [
+    ('AWS 인프라', ['aws']),                                  # FNF AWS인프라 포함
+    ('Alibaba Cloud', ['alibaba']),
+    ('1Password', ['1password', 'password']),
+    ('Atlassian', ['atlassian']),
+    ('Miro', ['miro']),
+    ('Retool', ['retool']),
+    ('MS 365', ['m365', 'ms365', 'office 365', 'office365']),  # Office 365 포함
+    ('MS365 외', ['^ms', 'microsoft']),                       # MS로 시작하는 것들
+    ('Slack', ['slack']),
+    ('PLM', ['plm']),
+    ('GA4', ['ga4']),
+    ('GitHub', ['github']),
+    ('JetBrains', ['jetbrain']),
+    ('카카오워크', ['카카오']),
+    ('Salesforce', ['marketing cloud', '계정 대체', '계정대체']),  # Marketing Cloud / 계정 대체 → Salesforce
+    ('Okta', ['okta']),
+    ('Oracle', ['oracle']),
+    ('SAP', ['sap']),
+    ('Salesforce', ['sfdc', 'salesforce']),
+    ('Tibco', ['tibco']),
+    ('Figma', ['figma']),
+    ('DocuSign', ['docusign']),
+    ('Power BI', ['powerbi', 'power bi']),
+    ('Zoom', ['zoom']),
+    ('Sentry', ['sentry']),
+    ('Adobe', ['adobe']),
+    ('Notion', ['notion', '노션']),
+    ('인플루언서시스템', ['인플루언서']),
+    ('브랜드폴더', ['브랜드폴더', 'brandfolder']),
+    ('스마트시트', ['스마트시트', 'smartsheet']),
+    ('유로모니터', ['유로모니터', 'euromonitor']),
+    ('채용플랫폼', ['채용플랫폼', '잡플래닛', 'jobplanet', '직원 의견', '직원의견']),  # 잡플래닛, 직원 의견 조사 포함
+    ('SAC Public Option', ['sac', 'public option']),          # 경영관리팀 SAC Public Option
+    ('방화벽', ['방화벽', 'firewall']),                         # 정보보안팀 방화벽
+    ('CJ APP', ['cj app', 'cjapp', 'cj앱']),                  # 이비즈 CJ APP
+    ('방문객 QR시스템', ['방문객', 'qr', '총무', '엔로비', 'nlobby']),  # 총무 방문객 QR시스템 (엔로비 포함)
+    ('온라인 정보사이트(WGSN)', ['온라인 정보', '온라인정보', 'wgsn']),  # 소비자전략팀 WGSN
+]
+
+# extract_2026_it_data.normalize_usage_text
+USAGE_2026_RULES = [
+    # --- 클라우드 인프라 ---
+    ('AWS', ['aws']),
+    ('Alibaba Cloud', ['alibaba']),
+    ('Google Cloud', ['google cloud', 'gcp']),
+    ('Naver Cloud', ['naver cloud', '네이버 클라우드']),
+    ('Azure', ['azure']),
+    ('OCI 클라우드', ['oci&클라우드', 'oci&msp']),
+    ('Cloudflare', ['cloudflare']),
+    ('Vercel', ['vercel']),
+    ('Datadog', ['datadog']),
+    ('KINX CloudHub', ['kinx']),
+    ('Salesforce', ['heroku']),
+    # --- 협업/생산성 도구 ---
+    ('MS 365', ['m365', 'ms365', 'office 365', 'sharepoint', 'ms 라이', 'ms라이', 'teams premium']),
+    ('Slack', ['slack']),
+    ('Notion', ['notion', '노션']),
+    ('Atlassian', ['atlassian']),
+    ('Miro', ['miro', '미로']),
+    ('Zoom', ['zoom', '화상회의']),
+    ('카카오워크', ['카카오']),
+    ('Figma', ['figma', '피그마']),
+    ('Google Workspace', ['g.suite', 'gsuite', '구글 드라이브']),
+    ('전자계약(모두싸인)', ['모두싸인']),
+    # --- 개발 도구 ---
+    ('GitHub', ['github']),
+    ('JetBrains', ['jetbrain', '파이참', 'pycharm']),
+    ('Sentry', ['sentry']),
+    ('Sendbird', ['sendbird']),
+    ('Fingerprint', ['fingerprint']),
+    ('APIFY', ['apify']),
+    ('Readme', ['readme']),
+    ('n8n', ['n8n']),
+    ('Obsidian', ['obsidian']),
+    ('JetBrains', ['datagrip']),
+    ('Postman', ['rest 클라이언트', 'postman']),
+    ('Font Awesome', ['font awesome']),
+    ('Apple Developer', ['apple developer']),
+    ('Power Automate', ['파워오토메이트', 'power automate']),
+    # --- 데이터/분석 ---
+    ('Snowflake', ['snowflake', '스노우플레이크']),
+    ('Power BI', ['power bi', 'powerbi']),
+    ('GA4', ['ga4']),
+    ('Retool', ['retool']),
+    ('차트메트릭', ['차트메트릭']),
+    ('썸트렌드', ['썸트렌드']),
+    ('블랙키위', ['블랙키위']),
+    ('Medium', ['미디엄', 'medium']),
+    # --- SaaS/비즈니스 ---
+    ('Salesforce', ['salesforce', 'sfdc', '세일즈포스', 'marketing cloud']),
+    ('SAP', ['sap']),
+    ('Oracle', ['oracle', '오라클']),
+    ('Okta', ['okta']),
+    ('DocuSign', ['docusign']),
+    ('1Password', ['1password']),
+    ('Tibco', ['tibco']),
+    ('Adobe', ['adobe']),
+    ('PLM', ['plm']),
+    ('SAC Public Option', ['sac']),
+    # --- 특수 서비스 ---
+    ('브랜드폴더', ['브랜드폴더', 'brandfolder']),
+    ('스마트시트', ['스마트시트', 'smartsheet']),
+    ('유로모니터', ['유로모니터', 'euromonitor']),
+    ('Nox Influencer', ['nox', 'influencer']),
+    ('인플루언서시스템', ['인플루언서']),
+    ('온라인 정보사이트(WGSN)', ['wgsn', '온라인 정보']),
+    ('Udemy', ['udemy']),
+    ('채용플랫폼', ['채용플랫폼', '잡플래닛', 'jobplanet', '마이다스아이티', '직원 의견', '직원의견']),
+    ('기업정보 서비스', ['한국평가데이터', 'cretop', '크레탑']),
+    ('에프앤가이드', ['에프앤가이드']),
+    ('법률정보 서비스', ['로앤비', 'lawnb']),
+    ('Shopify', ['쇼피파이', 'shopify']),
+    ('기업정보 서비스', ['한국기업데이터']),
+    ('산돌구름 폰트', ['산돌']),
+    ('Canva', ['canva']),
+    ('캡컷', ['캡컷']),
+    ('나노바나나', ['나노바나나']),
+    ('Varco Art', ['varco']),
+    ('원격지원 프로그램', ['이지헬프', '원격 지원']),
+    # --- 보안 ---
+    ('방화벽', ['방화벽']),
+    ('방문객 QR시스템', ['방문객', 'qr', '엔로비']),
+    # --- 크롤링 / CJ APP / EAI / E-LAW ---
+    ('크롤링 프록시', ['크롤링']),
+    ('CJ APP', ['cj app', 'cjapp']),
+    ('EAI', ['eai']),
+    ('E-LAW Chatbot', ['e-law']),
+]
+
+
+def compile_cleanup(cleanup):
+    """날짜 제거 규칙 → 컴파일된 (정규식, 대체 문자열) 목록 ('_' → 공백, 공백 정리 포함)"""
+    return [(re.compile(pattern), repl) for pattern, repl in list(cleanup) + _FINAL_CLEANUP]
+
+
+class RuleMatcher:
+    """
+    규칙 표 → Aho–Corasick 오토마톤 (패턴 문자열 전체를 한 번에 검색)
+
+    Parameters:
+    -----------
+    rules : list
+        [(표준명, [패턴, ...]), ...] (위에서부터 우선)
+    """
+
+    def __init__(self, rules):
+        self.names = [name for name, _ in rules]
+        # 패턴 조각(문자열 또는 '^문자열') → 그 조각이 들어간 (규칙 번호, 패턴 조각 전체) 목록
+        self._patterns = {}
+        literals = set()
+        for rule, (_, patterns) in enumerate(rules):
+            for pattern in patterns:
+                parts = tuple(pattern.split('&'))
+                for part in parts:
+                    self._patterns.setdefault(part, []).append((rule, parts))
+                    literals.add(part.lstrip('^'))
+        self._build(sorted(literals))
+
+    def _build(self, literals):
+        """goto / fail / output 테이블 생성"""
+        goto, fail, output = [{}], [0], [()]
+        for literal in literals:
+            state = 0
+            for ch in literal:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    fail.append(0)
+                    output.append(())
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            output[state] += (literal,)
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if state else 0
+                output[nxt] += output[fail[nxt]]
+
+        self._goto, self._fail, self._output = goto, fail, output
+
+    def find(self, lower):
+        """적요에 포함된 패턴 문자열 집합 (시작 위치에서 찾은 문자열은 '^문자열' 도 포함)"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for i, ch in enumerate(lower):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for literal in output[state]:
+                found.add(literal)
+                if len(literal) == i + 1:
+                    found.add('^' + literal)
+        return found
+
+    def match(self, lower):
+        """소문자 적요에 걸리는 최우선 규칙의 표준명 (없으면 None)"""
+        found = self.find(lower)
+        best = None
+        for part in found:
+            for rule, parts in self._patterns.get(part, ()):
+                if (best is None or rule < best) and all(p in found for p in parts):
+                    best = rule
+        return self.names[best] if best is not None else None
+
+    def match_series(self, lower):
+        """컬럼 단위 규칙 적용 (같은 적요는 한 번만 검사). 걸리지 않은 행은 NaN"""
+        mapping = {value: self.match(value) for value in pd.unique(lower)}
+        return lower.map(mapping)
+
+
+IT_USAGE_CLEANUP_COMPILED = compile_cleanup(IT_USAGE_CLEANUP)
+USAGE_2026_CLEANUP_COMPILED = compile_cleanup(USAGE_2026_CLEANUP)
+IT_USAGE_MATCHER = RuleMatcher(IT_USAGE_RULES)
+USAGE_2026_MATCHER = RuleMatcher(USAGE_2026_RULES)
+
+
+def clean_text(text, cleanup):
+    """날짜/차수 제거 + 공백 정리 (단일 문자열)"""
+    for regex, repl in cleanup:
+        text = regex.sub(repl, text)
+    return text.strip()
+
+
+def clean_series(texts, cleanup):
+    """날짜/차수 제거 + 공백 정리 (컬럼 단위)"""
+    for regex, repl in cleanup:
+        texts = texts.str.replace(regex, repl, regex=True)
+    return texts.str.strip()
+
+
+# ============================================================
+# extract_it_usage_v2 (2024/2025)
+# ============================================================
+
+def normalize_it_usage_text(text, vendor):
+    """IT사용료 적요 정규화 - 날짜 패턴 제거 및 서비스명 통합 (extract_it_usage_v2, 단일 문자열)"""
+    if not text or pd.isna(text):
+        text = ''
+    text = clean_text(str(text), IT_USAGE_CLEANUP_COMPILED)
+
+    matched = IT_USAGE_MATCHER.match(text.lower())
+    if matched is not None:
+        return matched
+
+    # 텍스트가 너무 짧으면 거래처명 사용
+    if len(text) < 3 and vendor and not pd.isna(vendor) and str(vendor).strip():
+        return str(vendor).strip()
+
+    return text if text else (str(vendor).strip() if vendor and not pd.isna(vendor) else 'Unknown')
+
+
+def normalize_it_usage_series(texts, vendors):
+    """
+    IT사용료 적요 정규화 (extract_it_usage_v2, 컬럼 단위)
+
+    Parameters:
+    -----------
+    texts, vendors : pd.Series
+        적요 / 거래처명 (같은 인덱스, 결측은 '' 로 취급)
+
+    Returns:
+    --------
+    pd.Series : normalize_it_usage_text 와 같은 결과
+    """
+    cleaned = clean_series(str_column(texts), IT_USAGE_CLEANUP_COMPILED)
+    matched = IT_USAGE_MATCHER.match_series(cleaned.str.lower())
+
+    vendors = str_column(vendors)
+    vendors.index = cleaned.index
+    vendor_strip = vendors.str.strip()
+    has_vendor = vendors != ''
+
+    result = cleaned.where(cleaned != '', vendor_strip.where(has_vendor, 'Unknown'))
+    short = (cleaned.str.len() < 3) & has_vendor & (vendor_strip != '')
+    result = result.where(~short, vendor_strip)
+    return matched.where(matched.notna(), result)
+
+
+# ============================================================
+# extract_2026_it_data (2026)
+# ============================================================
+
+def normalize_usage_2026_text(text, vendor=''):
+    """IT사용료 적요 정규화 (extract_2026_it_data, 단일 문자열)"""
+    if not text:
+        return vendor if vendor else 'Unknown'
+    text = clean_text(text, USAGE_2026_CLEANUP_COMPILED)
+
+    matched = USAGE_2026_MATCHER.match(text.lower())
+    if matched is not None:
+        return matched
+
+    return text if text else (vendor if vendor else 'Unknown')
+
+
+def normalize_usage_2026_series(texts, vendors):
+    """
+    IT사용료 적요 정규화 (extract_2026_it_data, 컬럼 단위)
+
+    Returns:
+    --------
+    pd.Series : normalize_usage_2026_text 와 같은 결과
+    """
+    cleaned = clean_series(str_column(texts), USAGE_2026_CLEANUP_COMPILED)
+    matched = USAGE_2026_MATCHER.match_series(cleaned.str.lower())
+
+    vendors = str_column(vendors)
+    vendors.index = cleaned.index
+
+    result = cleaned.where(cleaned != '', vendors.where(vendors != '', 'Unknown'))
+    return matched.where(matched.notna(), result)